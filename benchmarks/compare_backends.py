@@ -0,0 +1,162 @@
+"""
+HandSnake - Gesture Backend Comparison
+Runs every gesture backend over the same footage and reports the cost per
+frame and how often each one steers the same way as MediaPipe
+
+Usage:
+    python benchmarks/compare_backends.py --video session.mp4
+    python benchmarks/compare_backends.py --video session.mp4 --frames 300 --output backends.json
+
+Record footage with any camera app, playing the way you would in the game.
+Without --video synthetic frames are used: they time the backends, but
+MediaPipe finds no hand in them, so agreement means nothing.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add src to path (modules import each other by name)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import numpy as np
+import cv2
+
+from config import *
+from engine import NO_DIRECTION
+from gesture_controller import classify_offsets, create_backend
+
+BACKENDS = ("mediapipe", "blob")
+REFERENCE = "mediapipe"
+
+
+def read_frames(video, limit):
+    """Mirrored frames like the game sees them, streamed from a video file"""
+    capture = cv2.VideoCapture(video)
+    if not capture.isOpened():
+        raise OSError(f"Cannot open {video}")
+    try:
+        count = 0
+        while count < limit:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            count += 1
+            yield cv2.flip(frame, 1)
+    finally:
+        capture.release()
+
+
+def synthetic(limit):
+    from run_benchmarks import synthetic_frames
+
+    frames = synthetic_frames(count=30)
+    for i in range(limit):
+        yield frames[i % len(frames)].copy()
+
+
+def steer(hands):
+    """Direction code of a single player (the last hand wins, as in the game)"""
+    if not len(hands.positions):
+        return NO_DIRECTION
+    return int(classify_offsets(hands.positions[-1] - 0.5, GESTURE_THRESHOLD))
+
+
+def compare(frames, names):
+    """Per-frame cost, detections and directions of every backend"""
+    backends = {name: create_backend(name) for name in names}
+    times = {name: [] for name in names}
+    directions = {name: [] for name in names}
+    positions = {name: [] for name in names}
+
+    try:
+        for index, frame in enumerate(frames):
+            if index == 0:
+                for backend in backends.values():
+                    backend.warm_up(frame)
+
+            capture_time = time.perf_counter()
+            for name, backend in backends.items():
+                start = time.perf_counter()
+                hands = backend.detect(frame, capture_time)
+                times[name].append((time.perf_counter() - start) * 1000.0)
+                directions[name].append(steer(hands))
+                positions[name].append(hands.positions[-1] if len(hands.positions) else None)
+    finally:
+        for backend in backends.values():
+            backend.close()
+
+    return summarize(names, times, directions, positions)
+
+
+def summarize(names, times, directions, positions):
+    report = {}
+    reference = np.array(directions.get(REFERENCE, []))
+    reference_found = np.array([p is not None for p in positions.get(REFERENCE, [])], dtype=bool)
+
+    for name in names:
+        ms = np.array(times[name])
+        found = np.array([p is not None for p in positions[name]], dtype=bool)
+        result = {
+            "frames": len(ms),
+            "median_ms": float(np.median(ms)) if len(ms) else None,
+            "p95_ms": float(np.percentile(ms, 95)) if len(ms) else None,
+            "detection_rate": float(found.mean()) if len(ms) else None,
+        }
+
+        if name != REFERENCE and len(reference):
+            same = np.array(directions[name]) == reference
+            result["direction_agreement"] = float(same.mean())
+            if reference_found.any():
+                result["agreement_with_hand"] = float(same[reference_found].mean())
+
+            both = found & reference_found
+            if both.any():
+                offsets = [np.linalg.norm(positions[name][i] - positions[REFERENCE][i])
+                           for i in np.flatnonzero(both)]
+                result["mean_position_offset"] = float(np.mean(offsets))
+        report[name] = result
+    return report
+
+
+def print_report(report):
+    print(f"\n{'backend':<12}{'median ms':>11}{'p95 ms':>9}{'found':>8}{'agree':>8}{'w/ hand':>9}{'offset':>8}")
+    for name, result in report.items():
+        def cell(key, width, fmt):
+            value = result.get(key)
+            return f"{'-' if value is None else format(value, fmt):>{width}}"
+        print(f"{name:<12}{cell('median_ms', 11, '.2f')}{cell('p95_ms', 9, '.2f')}"
+              f"{cell('detection_rate', 8, '.0%')}{cell('direction_agreement', 8, '.0%')}"
+              f"{cell('agreement_with_hand', 9, '.0%')}{cell('mean_position_offset', 8, '.3f')}")
+    print("\nagree: same direction as MediaPipe on every frame, w/ hand: on frames where MediaPipe found a hand,")
+    print("offset: distance to MediaPipe's wrist (fraction of the frame) where both found a hand")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare gesture backends against MediaPipe")
+    parser.add_argument("--video", help="Recorded footage to run the backends on")
+    parser.add_argument("--frames", type=int, default=600, help="Most frames to use")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    names = list(dict.fromkeys([REFERENCE] + args.backends))
+    frames = read_frames(args.video, args.frames) if args.video else synthetic(args.frames)
+    if not args.video:
+        print("No --video given, timing synthetic frames (agreement is not meaningful)")
+
+    report = compare(frames, names)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"video": args.video, "backends": report}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
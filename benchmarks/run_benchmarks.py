@@ -0,0 +1,433 @@
+"""
+HandSnake - Benchmarks
+Times the gesture and game hot paths without a camera, GPU or display
+and compares the results against a stored baseline
+
+Results are compared as ratios to an in-run reference benchmark (plain
+Python and NumPy work), so a baseline saved on one machine still says
+something on another, and a machine running slower overall doesn't read
+as a regression everywhere.
+
+Usage:
+    python benchmarks/run_benchmarks.py                    # run and compare
+    python benchmarks/run_benchmarks.py --save-baseline    # store new baseline
+    python benchmarks/run_benchmarks.py --output results.json --filter snake
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# Render into an offscreen surface
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add src to path (modules import each other by name)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import numpy as np
+import cv2
+import pygame
+
+from config import *
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+
+def synthetic_frames(count=8, width=CAMERA_WIDTH, height=480, seed=0):
+    """
+    Deterministic camera-like frames: noisy background with a skin-coloured
+    hand-sized blob moving across the frame
+    """
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(count):
+        frame = rng.integers(40, 90, (height, width, 3), dtype=np.uint8)
+        center = (int(width * (0.2 + 0.6 * i / max(count - 1, 1))), height // 2)
+        cv2.ellipse(frame, center, (50, 70), 0, 0, 360, (120, 160, 220), -1)
+        frames.append(frame)
+    return frames
+
+
+def serpentine_body(length, columns):
+    """Snake body of the given length folded across the board, head first"""
+    body = []
+    for i in range(length):
+        row, column = divmod(i, columns)
+        if row % 2:
+            column = columns - 1 - column
+        body.append((column * SNAKE_SIZE, row * SNAKE_SIZE))
+    body.reverse()
+    return body
+
+
+def measure(function, repeat=9, number=None, min_time=0.05, setup=None):
+    """
+    Median and min time per call in microseconds
+    number is calibrated so each repeat takes at least min_time
+    setup runs before each repeat, outside the timed region
+    """
+    if number is None:
+        number = 1
+        while True:
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            if time.perf_counter() - start >= min_time or number >= 1 << 20:
+                break
+            number *= 2
+
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+
+    return {"median_us": statistics.median(samples), "min_us": min(samples), "calls": number}
+
+
+# Benchmarks ------------------------------------------------------------------
+
+REFERENCE = "reference.python_numpy"
+
+
+def bench_reference(results):
+    """Fixed mix of interpreter and NumPy work every result is divided by"""
+    values = np.random.default_rng(0).random(4096)
+
+    def reference():
+        total = 0
+        for i in range(500):
+            total += i * i
+        np.sort(values)
+        return total
+
+    results[REFERENCE] = measure(reference, repeat=15)
+
+
+def bench_gesture(results):
+    from gesture_controller import GestureController
+
+    controller = GestureController(source=None)
+    frames = synthetic_frames()
+    index = [0]
+
+    def detect():
+        frame = frames[index[0] % len(frames)].copy()
+        index[0] += 1
+        controller.detect_gesture(frame)
+
+    # Graph initialisation is not part of the steady-state cost
+    detect()
+    results["gesture.detect_gesture"] = measure(detect, repeat=5, min_time=0.2)
+
+    frame = frames[0].copy()
+    controller._draw_zones(frame)
+    results["gesture.draw_zones"] = measure(lambda: controller._draw_zones(frame))
+
+    def overlay():
+        controller._draw_zones(frame)
+        controller._draw_direction_indicator(frame, LEFT)
+    results["gesture.overlay"] = measure(overlay)
+
+    controller.release()
+
+    # Cheap backend on the same frames (the blob moves, so the motion mask sees it)
+    from gesture_backends import BlobBackend
+
+    blob = BlobBackend()
+
+    def blob_detect():
+        index[0] += 1
+        blob.detect(frames[index[0] % len(frames)], 0.0)
+    results["gesture.blob_detect"] = measure(blob_detect)
+
+    # Tracked frame between detections: filter step and optical flow only
+    from gesture_controller import landmarks_from_points
+    from hand_tracker import HandTracker
+
+    points = np.zeros((21, 3))
+    points[:, 0] = np.linspace(0.6, 0.7, 21)
+    points[:, 1] = 0.2
+    detector = StaticHandDetector(landmarks_from_points(points))
+    tracker = HandTracker(detector, interval=1 << 30)
+    shifted = [frames[0], np.roll(frames[0], 2, axis=1)]
+    tracker.process(shifted[0], 0.0)
+
+    def track():
+        index[0] += 1
+        tracker.process(shifted[index[0] % 2], index[0] / 30)
+    results["gesture.track_frame"] = measure(track)
+
+    # Landmark extraction and classification of a long recording
+    from gesture_controller import classify_directions, landmarks_to_array
+
+    hands = [landmarks_from_points(points)]
+    results["gesture.landmarks_to_array"] = measure(lambda: landmarks_to_array(hands))
+
+    recording = np.random.default_rng(0).random((10000, 21, 3), dtype=np.float32)
+    results["gesture.classify_10000_frames"] = measure(lambda: classify_directions(recording, 0.15))
+
+
+class StaticHandDetector:
+    """Reports the same hand for every frame, isolating tracking cost"""
+
+    def __init__(self, hand_landmarks):
+        self.results = type("Results", (), {
+            "multi_hand_landmarks": [hand_landmarks],
+            "multi_handedness": None,
+        })()
+
+    def process(self, frame):
+        return self.results
+
+
+def bench_snake(results):
+    from engine import Snake, Food
+
+    columns = 200
+    rows = 60
+    for length in (3, 100, 1000, 10000):
+        snake = Snake(0, 0)
+        snake.body = serpentine_body(length, columns)
+        snake.direction = DOWN
+        start_body = list(snake.body)
+
+        # Move and collide in place; the body is put back before each repeat,
+        # outside the timer (rebuilding the occupancy index is O(length))
+        def move_and_collide():
+            snake.move()
+            snake.check_collision(columns * SNAKE_SIZE, rows * SNAKE_SIZE * 10)
+
+        def restore(snake=snake, start_body=start_body):
+            snake.body = start_body
+
+        results[f"snake.move_collision.len_{length}"] = measure(move_and_collide, setup=restore)
+
+    # Respawn at high fill ratios
+    for fill in (0.5, 0.9, 0.99):
+        food = Food(columns * SNAKE_SIZE, rows * SNAKE_SIZE)
+        snake = Snake(0, 0, food.free_cells)
+        snake.body = serpentine_body(int(columns * rows * fill), columns)
+        results[f"food.respawn.fill_{int(fill * 100)}"] = measure(food.respawn)
+
+
+def bench_draw(results):
+    from snake_game import SnakeGame
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    game = SnakeGame(GAME_WIDTH, SCREEN_HEIGHT, seed=0)
+    game.snake.body = serpentine_body(200, GAME_WIDTH // SNAKE_SIZE)
+    results["snake_game.draw"] = measure(lambda: game.draw(surface, CAMERA_WIDTH))
+
+    def tick_and_draw_dirty():
+        if game.game_over:
+            game.reset()
+        game.update()
+        game.draw_dirty(surface, CAMERA_WIDTH)
+
+    game.reset()
+    game.draw_dirty(surface, CAMERA_WIDTH)
+    results["snake_game.draw_dirty"] = measure(tick_and_draw_dirty, number=10)
+
+    # 2000x2000 cell board: the view scrolls on most ticks, cost must not grow with the board
+    world = SnakeGame(2000 * SNAKE_SIZE, 2000 * SNAKE_SIZE, seed=0, view_size=(GAME_WIDTH, SCREEN_HEIGHT))
+    turns = [UP, RIGHT, DOWN, RIGHT]
+
+    def tick_and_draw_world():
+        if world.game_over:
+            world.reset()
+        world.update(turns[world.tick // 40 % 4])
+        world.draw_dirty(surface, CAMERA_WIDTH)
+
+    world.draw_dirty(surface, CAMERA_WIDTH)
+    results["snake_game.draw_dirty_world_2000"] = measure(tick_and_draw_world, number=10)
+    pygame.quit()
+
+
+def bench_engine(results):
+    from engine import BatchSnakeEngine
+
+    engine = BatchSnakeEngine(1024, 32, 36, seed=0)
+    directions = np.random.default_rng(0).integers(-1, 4, (64, 1024))
+    step = [0]
+
+    def batch_step():
+        engine.step(directions[step[0] % 64])
+        step[0] += 1
+
+    results["engine.batch_step_1024"] = measure(batch_step)
+
+
+def bench_spectator(results):
+    from engine import SnakeEngine
+    from spectator import encode_delta, encode_keyframe
+
+    game = SnakeEngine(GAME_WIDTH, SCREEN_HEIGHT, seed=0, players=2)
+    game.snake.body = serpentine_body(200, GAME_WIDTH // SNAKE_SIZE)
+    game.update()
+    results["spectator.encode_delta"] = measure(lambda: encode_delta(game))
+    results["spectator.encode_keyframe"] = measure(lambda: encode_keyframe(game))
+
+
+def bench_snapshot(results):
+    from engine import SnakeEngine
+    from snapshot import RewindHistory, encode_snapshot
+
+    game = SnakeEngine(GAME_WIDTH, SCREEN_HEIGHT, seed=0, players=2)
+    game.snake.body = serpentine_body(200, GAME_WIDTH // SNAKE_SIZE)
+    history = RewindHistory()
+    history.record(game)
+    game.update()
+    history.record(game)
+
+    def step():
+        history.step_back(game)
+        history.step_forward(game)
+
+    results["snapshot.encode_snapshot"] = measure(lambda: encode_snapshot(game))
+    results["snapshot.step_back_and_forward"] = measure(step)
+
+
+BENCHMARKS = {
+    "reference": bench_reference,
+    "gesture": bench_gesture,
+    "snake": bench_snake,
+    "draw": bench_draw,
+    "engine": bench_engine,
+    "spectator": bench_spectator,
+    "snapshot": bench_snapshot,
+}
+
+
+# Baseline comparison ---------------------------------------------------------
+
+def run_rounds(groups, rounds):
+    """
+    Run the groups `rounds` times, interleaved so a slow spell of the
+    machine hits every benchmark in some round rather than all rounds of
+    a few. Keeps the best repeat of all rounds, and how far the rounds'
+    best times spread (the noise the comparison allows for)
+    """
+    runs = []
+    for round_index in range(rounds):
+        results = {}
+        for group in groups:
+            print(f"Running {group} benchmarks ({round_index + 1}/{rounds})...")
+            BENCHMARKS[group](results)
+        runs.append(results)
+
+    merged = {}
+    for name in runs[0]:
+        mins = [run[name]["min_us"] for run in runs]
+        merged[name] = {
+            "min_us": min(mins),
+            "median_us": statistics.median(run[name]["median_us"] for run in runs),
+            "spread": max(mins) / min(mins) - 1,
+            "calls": runs[0][name]["calls"],
+        }
+    return merged
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns names of benchmarks slower than the baseline by more than
+    the tolerance plus the noise both runs measured across their rounds
+    Compares the best repeat (min_us), relative to the reference benchmark
+    when both runs have it; a single run's median is too noisy to gate on
+    """
+    scale = 1.0
+    if REFERENCE in results and REFERENCE in baseline:
+        scale = results[REFERENCE]["min_us"] / baseline[REFERENCE]["min_us"]
+        print(f"\nThis run's reference is {scale:.2f}x the baseline's, times are compared relative to it")
+
+    regressions = []
+    print(f"\n{'benchmark':<40}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, result in results.items():
+        if name == REFERENCE:
+            continue
+        if name not in baseline:
+            print(f"{name:<40}{'-':>12}{result['min_us']:>12.2f}{'new':>9}")
+            continue
+
+        expected = baseline[name]["min_us"] * scale
+        change = result["min_us"] / expected - 1
+
+        # Benchmarks whose rounds spread widely get that much more slack
+        noise = max(result.get("spread", 0.0), baseline[name].get("spread", 0.0))
+        flag = "  REGRESSION" if change > tolerance + noise else ""
+        print(f"{name:<40}{expected:>12.2f}{result['min_us']:>12.2f}{change:>+8.0%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    # String hashing is randomized per process, and dict-heavy microbenchmarks
+    # (e.g. spectator.encode_delta) shift by up to 70% with it: pin the seed
+    if os.environ.get("PYTHONHASHSEED") is None:
+        os.environ["PYTHONHASHSEED"] = "0"
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+
+    parser = argparse.ArgumentParser(description="HandSnake hot-path benchmarks")
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="Allowed slowdown on top of the measured noise (0.3 = 30%%)")
+    parser.add_argument("--filter", default="", help="Only run groups containing this text")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the suite, the best of them counts")
+    args = parser.parse_args()
+
+    groups = [group for group in BENCHMARKS if args.filter in group or group == "reference"]
+    results = run_rounds(groups, max(args.rounds, 1))
+
+    report = {
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "python": platform.python_version(),
+        },
+        "benchmarks": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found, run with --save-baseline first")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["benchmarks"]
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
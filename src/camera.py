@@ -0,0 +1,97 @@
+"""
+Camera Stream
+Background camera capture that keeps only the newest frame
+"""
+
+import threading
+import time
+
+
+class CameraStream:
+    """
+    Reads frames from a capture object on a background thread.
+    Only the most recent frame is kept, older frames are dropped, so the
+    consumer never blocks on camera I/O and never sees stale buffered frames.
+    """
+
+    def __init__(self, cap):
+        self.cap = cap
+
+        # Latest-frame slot (guarded by the lock)
+        self._lock = threading.Lock()
+        self._frame = None
+        self._timestamp = 0.0
+        self._frame_id = 0
+        self._last_read_id = 0
+
+        # Statistics
+        self.dropped_frames = 0
+
+        self._running = False
+        self._release = False
+        self._thread = None
+
+    def start(self):
+        """Start the capture thread"""
+        if self._running:
+            return self
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._capture_loop,
+            name="CameraStream",
+            daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def _capture_loop(self):
+        while self._running:
+            ret, frame = self.cap.read()
+            timestamp = time.perf_counter()
+
+            if not ret:
+                # Camera not delivering, don't spin at full speed
+                time.sleep(0.005)
+                continue
+
+            with self._lock:
+                # Frame in the slot was never consumed
+                if self._frame_id != self._last_read_id:
+                    self.dropped_frames += 1
+
+                self._frame = frame
+                self._timestamp = timestamp
+                self._frame_id += 1
+
+        # Released here, so it can never happen in the middle of a read
+        if self._release:
+            self.cap.release()
+
+    def read_latest(self):
+        """
+        Take the newest frame if it has not been read yet
+        Returns: (frame_id, capture_timestamp, frame) or None
+        """
+        with self._lock:
+            if self._frame is None or self._frame_id == self._last_read_id:
+                return None
+
+            self._last_read_id = self._frame_id
+            return self._frame_id, self._timestamp, self._frame
+
+    def stop(self, release=False):
+        """
+        Stop the capture thread
+        release: also release the capture, from the capture thread once
+        its current read returns (a camera stuck in a read doesn't hold up
+        shutdown for longer than a second)
+        """
+        self._release = release
+        self._running = False
+        if self._thread is None:
+            if release:
+                self.cap.release()
+            return
+        self._thread.join(timeout=1.0)
+        self._thread = None
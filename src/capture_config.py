@@ -0,0 +1,147 @@
+"""
+Capture Configuration
+Picks a native camera mode (resolution, pixel format, frame rate) instead of
+letting the driver rescale every frame, and caches the choice per device
+"""
+
+import json
+import os
+from collections import namedtuple
+import cv2
+from config import *
+
+CaptureMode = namedtuple("CaptureMode", ["width", "height", "fourcc", "fps"])
+
+# Common webcam resolutions, smallest first
+CANDIDATE_SIZES = [
+    (320, 240), (424, 240), (640, 360), (640, 480), (800, 448), (800, 600),
+    (848, 480), (960, 540), (1024, 576), (1280, 720), (1280, 960), (1920, 1080)
+]
+
+# Uncompressed YUYV needs no decoding, MJPG needs less USB bandwidth
+CANDIDATE_FOURCCS = ["YUYV", "MJPG"]
+
+
+def fourcc_code(name):
+    return cv2.VideoWriter_fourcc(*name)
+
+
+def fourcc_name(code):
+    code = int(code)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+def apply_mode(cap, mode):
+    """
+    Request a mode, returns the mode the device actually reports
+    The pixel format goes first, drivers may reset the size when it changes
+    """
+    cap.set(cv2.CAP_PROP_FOURCC, fourcc_code(mode.fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, mode.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, mode.height)
+    cap.set(cv2.CAP_PROP_FPS, mode.fps)
+
+    # Keep at most one frame queued in the driver, older frames are latency
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    return CaptureMode(
+        int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        fourcc_name(cap.get(cv2.CAP_PROP_FOURCC)),
+        round(cap.get(cv2.CAP_PROP_FPS))
+    )
+
+
+def probe_modes(cap, fps=CAPTURE_FPS, sizes=CANDIDATE_SIZES, fourccs=CANDIDATE_FOURCCS):
+    """
+    Modes the device accepts without substituting another size or format
+    Returns: list of CaptureMode as reported back by the device
+    """
+    modes = []
+    for fourcc in fourccs:
+        for width, height in sizes:
+            actual = apply_mode(cap, CaptureMode(width, height, fourcc, fps))
+            if (actual.width, actual.height, actual.fourcc) == (width, height, fourcc):
+                if actual not in modes:
+                    modes.append(actual)
+    return modes
+
+
+def choose_mode(modes, min_width=CAPTURE_MIN_WIDTH, min_height=CAPTURE_MIN_HEIGHT, fps=CAPTURE_FPS):
+    """
+    Cheapest mode that is at least min_width x min_height: modes reaching
+    the target frame rate first, then fewest pixels, then no decoding needed
+    Falls back to the largest mode if none is big enough, None if no modes
+    """
+    if not modes:
+        return None
+
+    large_enough = [mode for mode in modes if mode.width >= min_width and mode.height >= min_height]
+    if not large_enough:
+        return max(modes, key=lambda mode: (mode.width * mode.height, mode.fps))
+
+    def cost(mode):
+        codec_rank = CANDIDATE_FOURCCS.index(mode.fourcc) if mode.fourcc in CANDIDATE_FOURCCS else 0
+        return (mode.fps < fps, mode.width * mode.height, codec_rank)
+
+    return min(large_enough, key=cost)
+
+
+def device_key(cap, source):
+    """Cache key for a capture device"""
+    try:
+        backend = cap.getBackendName()
+    except (AttributeError, cv2.error):
+        backend = "unknown"
+    return f"{backend}:{source}"
+
+
+def load_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(path, cache):
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"Could not save capture settings: {e}")
+
+
+def configure_capture(cap, source, cache_path=CAPTURE_CACHE_PATH,
+                      min_width=CAPTURE_MIN_WIDTH, min_height=CAPTURE_MIN_HEIGHT, fps=CAPTURE_FPS):
+    """
+    Put the capture into its cheapest suitable native mode
+    A cached mode is reused if the device still accepts it, otherwise the
+    device is probed and the choice cached (cache_path None disables caching)
+    Returns: the CaptureMode in effect, or None if the device reports no usable mode
+    """
+    key = device_key(cap, source)
+    if cache_path:
+        cache_path = os.path.expanduser(cache_path)
+    cache = load_cache(cache_path) if cache_path else {}
+    wanted = [min_width, min_height, fps]
+
+    entry = cache.get(key)
+    if entry is not None and entry.get("requirements") == wanted:
+        cached = CaptureMode(**entry["mode"])
+        actual = apply_mode(cap, cached)
+        if (actual.width, actual.height, actual.fourcc) == (cached.width, cached.height, cached.fourcc):
+            return actual
+
+    mode = choose_mode(probe_modes(cap, fps), min_width, min_height, fps)
+    if mode is None:
+        return None
+
+    actual = apply_mode(cap, mode)
+    if cache_path:
+        cache[key] = {"requirements": wanted, "mode": actual._asdict()}
+        save_cache(cache_path, cache)
+    return actual
@@ -9,6 +9,8 @@ SCREEN_HEIGHT = 720
 CAMERA_WIDTH = SCREEN_WIDTH // 2
 GAME_WIDTH = SCREEN_WIDTH // 2
 FPS = 30
+RENDER_FPS = 60  # Render loop cap, 0 = as fast as possible
+DIRTY_RECT_RENDERING = True  # Only push changed screen areas to the display
 
 # Colors (RGB)
 BLACK = (0, 0, 0)
@@ -22,12 +24,92 @@ MAGENTA = (255, 0, 255)
 
 # Snake settings
 SNAKE_SIZE = 20
-SNAKE_SPEED = 10
+SNAKE_SPEED = 10  # Game ticks per second
+MAX_CATCH_UP_TICKS = 3  # Most ticks run in one frame after a stall
 INITIAL_LENGTH = 3
+PLAYERS = 1  # 2 = two hands drive two snakes on one board
+PLAYER_COLORS = [(GREEN, CYAN), (YELLOW, MAGENTA)]  # (head, body) per player
+WORLD_COLUMNS = 0  # Board size in cells, 0 = fit the game area; larger boards scroll with the snake
+WORLD_ROWS = 0
+VIEWPORT_MARGIN = 6  # Cells between the head and the view edge before the view scrolls
+CHUNK_CELLS = 16  # Side of a pre-rendered background chunk in cells
+CHUNK_CACHE_DISTANCE = 1  # Chunks kept beyond the visible ones before they are evicted
 
 # Gesture settings
 GESTURE_CONFIDENCE = 0.7
+GESTURE_THRESHOLD = 0.15  # Hand offset from the frame centre (fraction of the frame) that counts as a direction
+MODEL_COMPLEXITY = 1  # MediaPipe Hands model, 0 = lite (faster, less accurate)
+GESTURE_BACKEND = "mediapipe"  # "mediapipe" (hand landmarks) or "blob" (skin-colour blob centroid, far cheaper)
+BLOB_WIDTH = 160  # Frame width (pixels) the blob backend searches at
+BLOB_MIN_AREA = 0.01  # Smallest hand blob as a fraction of the frame
+BLOB_SKIN_LOWER = (0, 135, 85)  # Skin colour range in YCrCb
+BLOB_SKIN_UPPER = (255, 180, 135)
+BLOB_MOTION_MASK = True  # Only count skin that moved recently (ignores faces and skin-coloured walls)
+BLOB_MOTION_HISTORY = 90  # Frames over which the blob backend's background adapts
+BLOB_MOTION_THRESHOLD = 15  # Brightness change (0-255) from the background that counts as motion
 CAMERA_INDEX = 0
+GESTURE_RATE = 30  # Gesture inference runs per second, 0 = every frame
+INFERENCE_MODE = "inline"  # "inline" or "process" (MediaPipe in a worker process)
+INFERENCE_RING_SLOTS = 3  # Shared-memory frame slots for the worker process
+INFERENCE_SCALE = 1.0  # Downscale factor for full-frame hand searches
+ROI_TRACKING = False  # Run detection on a crop around the last hand position
+ROI_MARGIN = 0.5  # Crop padding as a fraction of the hand size
+ROI_MIN_SIZE = 160  # Smallest crop side in pixels
+DETECTION_INTERVAL = 1  # Run the hand model every N frames and track in between, 1 = every frame
+TRACKING_MIN_SCORE = 0.8  # Detections less confident than this are re-checked next frame
+TRACKING_OPTICAL_FLOW = True  # Correct tracked positions with sparse optical flow
+TRACKING_PROCESS_NOISE = 25.0  # Hand acceleration noise (normalized units / s^2, squared)
+TRACKING_MEASUREMENT_NOISE = 2.5e-5  # Detected landmark variance (normalized units, squared)
+TRACKING_FLOW_NOISE = 1e-4  # Optical flow variance (normalized units, squared)
+PREDICTIVE_DIRECTION = False  # Commit directions early when the hand is about to cross a zone edge
+PREDICTION_WINDOW = 6  # Recent wrist positions used to estimate velocity and acceleration
+PREDICTION_CONFIDENCE = 0.6  # Minimum confidence (0-1) for an early direction
+PREDICTION_CONFIRM_FRAMES = 2  # Consecutive frames that must agree before committing
+PREDICTION_MIN_SPEED = 0.3  # Slowest wrist movement (frame sizes / s) that is extrapolated
+PREDICTION_MAX_HORIZON = 0.15  # Longest look-ahead in seconds
+PREDICTION_EXTRA_LATENCY = 0.05  # Delay after detection (game tick, display) added to the look-ahead
+ASSIGN_HANDEDNESS_PENALTY = 0.3  # Extra cost (frame sizes) for a player's hand changing left/right label
+ASSIGN_MEMORY_FRAMES = 15  # Frames a missing player's last hand position is remembered
+
+# Camera settings
+BACKGROUND_WARM_UP = True  # Open the camera and load the hand model while the game window is already up
+WARM_UP_EXIT_TIMEOUT = 2.0  # Seconds quitting waits for a camera or hand model still loading
+THREADED_CAPTURE = True  # Read camera frames on a background thread
+VIDEO_SOURCE = None  # Video file to use instead of the camera
+CAPTURE_NEGOTIATION = True  # Pick a native camera mode instead of a rescaled CAMERA_WIDTH x SCREEN_HEIGHT
+CAPTURE_MIN_WIDTH = 640  # Smallest camera frame usable for inference
+CAPTURE_MIN_HEIGHT = 480
+CAPTURE_FPS = 30  # Target camera frame rate
+CAPTURE_CACHE_PATH = "~/.handsnake/capture_modes.json"  # Chosen mode per device, None = probe every launch
+
+# Adaptive quality settings
+ADAPTIVE_QUALITY = True  # Turn down visuals and inference cost while frames miss QUALITY_TARGET_FPS
+QUALITY_TARGET_FPS = FPS
+QUALITY_WINDOW = 30  # Frames averaged for each decision
+QUALITY_UP_HEADROOM = 0.6  # Step back up once frames take less than this share of the budget...
+QUALITY_UP_FRAMES = 90  # ...for this many frames in a row (doubles after a step up that didn't hold)
+QUALITY_INFERENCE_SCALE = 0.5  # Full-frame search scale at the low-res inference level
+QUALITY_PREVIEW_INTERVAL = 3  # Camera preview shows every Nth processed frame at the slowest level
+
+# Recording / replay settings
+RECORD_LANDMARKS_PATH = None  # Write per-frame landmarks to this file
+REPLAY_LANDMARKS_PATH = None  # Play back a landmark recording instead of the camera
+REPLAY_SPEED = 1.0  # Replay speed multiplier, 0 = as fast as possible
+REPLAY_MAX_BATCH = 100  # Most recorded frames replayed per rendered frame
+
+# Spectator settings
+SPECTATOR_SERVER = False  # Stream the game to spectator viewers (python spectator_viewer.py)
+SPECTATOR_HOST = "127.0.0.1"  # "0.0.0.0" to accept viewers from other machines
+SPECTATOR_PORT = 8765
+SPECTATOR_KEYFRAME_INTERVAL = 50  # Ticks between full board states, deltas in between
+SPECTATOR_MAX_BUFFER = 64 * 1024  # Unsent bytes before a slow viewer skips ahead to the latest keyframe
+
+# Rewind / autosave settings
+REWIND_TICKS = SNAKE_SPEED * 30  # Ticks of history kept for rewinding (per-tick diffs)
+REWIND_SNAPSHOT_INTERVAL = 50  # Ticks between full snapshots in the history, for faster seeking
+REWIND_UNDO_TICKS = SNAKE_SPEED * 2  # How far U rewinds, e.g. to before a crash
+AUTOSAVE_PATH = "~/.handsnake/autosave.hsrw"  # Resumed with --resume, None disables autosaving
+AUTOSAVE_TICKS = 100  # Ticks between autosaves
 
 # Gesture directions
 UP = "UP"
@@ -36,6 +118,14 @@ LEFT = "LEFT"
 RIGHT = "RIGHT"
 NONE = "NONE"
 
+# Profiler settings
+PROFILER_ENABLED = True
+PROFILE_WINDOW = 300  # Frames used for the rolling percentiles
+PROFILE_HISTORY = 100000  # Frames kept for export (only with PROFILE_EXPORT_PATH set)
+PROFILE_HUD_REFRESH = 15  # Frames between HUD updates
+PROFILE_EXPORT_PATH = None  # e.g. "frame_times.csv" or "frame_times.json"
+
 # Font settings
 FONT_SIZE = 36
-SMALL_FONT_SIZE = 24
\ No newline at end of file
+SMALL_FONT_SIZE = 24
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept in the shared cache
\ No newline at end of file
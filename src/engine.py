@@ -0,0 +1,531 @@
+"""
+Snake Engine
+Pure game logic without Pygame, plus a NumPy engine that
+advances many independent games at once
+"""
+
+import random
+from collections import deque
+import numpy as np
+from config import *
+
+
+class FreeCells:
+    """
+    Set of free board cells with O(1) add, remove and random pick.
+    Cells live in a virtual array that starts as the identity order
+    (swap-remove keeps free cells in front of self.size); only displaced
+    entries are stored, so building the index never scans the board.
+    compact() puts the array into an order that depends only on which
+    cells are taken, so it never has to be saved with a game.
+    """
+    
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+        self.size = columns * rows  # Number of free cells
+        self._slots = {}      # array position -> cell index (if not identity)
+        self._positions = {}  # cell index -> array position (if not identity)
+        self._compact = True  # Order is the one compact() would build
+    
+    def _index(self, cell):
+        column, row = cell[0] // SNAKE_SIZE, cell[1] // SNAKE_SIZE
+        if 0 <= column < self.columns and 0 <= row < self.rows:
+            return row * self.columns + column
+        return None
+    
+    def _cell(self, index):
+        row, column = divmod(index, self.columns)
+        return (column * SNAKE_SIZE, row * SNAKE_SIZE)
+    
+    def _place(self, position, index):
+        if position == index:
+            self._slots.pop(position, None)
+            self._positions.pop(index, None)
+        else:
+            self._slots[position] = index
+            self._positions[index] = position
+    
+    def _swap_into(self, position, index, boundary):
+        # Exchange the cell at `position` with the cell at `boundary`
+        other = self._slots.get(boundary, boundary)
+        self._place(position, other)
+        self._place(boundary, index)
+    
+    def __contains__(self, cell):
+        index = self._index(cell)
+        return index is not None and self._positions.get(index, index) < self.size
+    
+    def __len__(self):
+        return self.size
+    
+    def remove(self, cell):
+        """Mark a cell as taken (ignored if already taken or off the board)"""
+        index = self._index(cell)
+        if index is None:
+            return
+        position = self._positions.get(index, index)
+        if position < self.size:
+            self.size -= 1
+            self._swap_into(position, index, self.size)
+            self._compact = False
+    
+    def add(self, cell):
+        """Mark a cell as free (ignored if already free or off the board)"""
+        index = self._index(cell)
+        if index is None:
+            return
+        position = self._positions.get(index, index)
+        if position >= self.size:
+            self._swap_into(position, index, self.size)
+            self.size += 1
+            self._compact = False
+    
+    def compact(self):
+        """
+        Rebuild the order from the set of taken cells alone, in O(taken):
+        taken cells in front of self.size trade places with free cells
+        behind it, both in index order. Drops every other displaced entry,
+        and a board rebuilt from the same snakes gets the same order, so
+        random picks repeat exactly
+        """
+        if self._compact:
+            return
+        total = self.columns * self.rows
+        taken = {self._slots.get(position, position) for position in range(self.size, total)}
+        front = sorted(index for index in taken if index < self.size)
+        behind = [index for index in range(self.size, total) if index not in taken]
+        
+        # Each pair swaps places, so both maps hold the same entries
+        self._slots = dict(zip(front, behind))
+        self._slots.update(zip(behind, front))
+        self._positions = dict(self._slots)
+        self._compact = True
+    
+    def choice(self, rng=random):
+        """Random free cell, or None if the board is full"""
+        if self.size == 0:
+            return None
+        position = rng.randrange(self.size)
+        return self._cell(self._slots.get(position, position))
+
+
+class Snake:
+    def __init__(self, x, y, free_cells=None):
+        self.free_cells = free_cells  # Board index kept in sync with the body
+        self.body = [(x, y)]
+        self.direction = RIGHT
+        self.grow = False
+    
+    @property
+    def body(self):
+        """Body cells, head first (a deque)"""
+        return self._body
+    
+    @body.setter
+    def body(self, cells):
+        # Release cells of a replaced body
+        if self.free_cells is not None:
+            for cell in getattr(self, "occupancy", ()):
+                self.free_cells.add(cell)
+        
+        self._body = deque()
+        self.occupancy = {}  # cell -> number of body segments on it
+        for cell in cells:
+            self.push_tail(cell)
+    
+    def occupies(self, cell):
+        """Check if any body segment is on the cell, O(1)"""
+        return cell in self.occupancy
+    
+    def _occupy(self, cell):
+        count = self.occupancy.get(cell, 0)
+        self.occupancy[cell] = count + 1
+        if count == 0 and self.free_cells is not None:
+            self.free_cells.remove(cell)
+    
+    def _vacate(self, cell):
+        count = self.occupancy[cell] - 1
+        if count:
+            self.occupancy[cell] = count
+        else:
+            del self.occupancy[cell]
+            if self.free_cells is not None:
+                self.free_cells.add(cell)
+    
+    def push_head(self, cell):
+        self._body.appendleft(cell)
+        self._occupy(cell)
+    
+    def pop_tail(self):
+        cell = self._body.pop()
+        self._vacate(cell)
+        return cell
+    
+    def pop_head(self):
+        cell = self._body.popleft()
+        self._vacate(cell)
+        return cell
+    
+    def push_tail(self, cell):
+        self._body.append(cell)
+        self._occupy(cell)
+        
+    def move(self):
+        head_x, head_y = self.body[0]
+        
+        # Calculate new head position based on direction
+        if self.direction == UP:
+            new_head = (head_x, head_y - SNAKE_SIZE)
+        elif self.direction == DOWN:
+            new_head = (head_x, head_y + SNAKE_SIZE)
+        elif self.direction == LEFT:
+            new_head = (head_x - SNAKE_SIZE, head_y)
+        elif self.direction == RIGHT:
+            new_head = (head_x + SNAKE_SIZE, head_y)
+        else:
+            new_head = (head_x, head_y)
+        
+        # Insert new head
+        self.push_head(new_head)
+        
+        # Remove tail unless growing
+        if not self.grow:
+            return self.pop_tail()
+        else:
+            self.grow = False
+            return None
+    
+    def change_direction(self, new_direction):
+        # Prevent moving in opposite direction
+        opposite_directions = {
+            UP: DOWN,
+            DOWN: UP,
+            LEFT: RIGHT,
+            RIGHT: LEFT
+        }
+        
+        if new_direction != opposite_directions.get(self.direction):
+            self.direction = new_direction
+    
+    def grow_snake(self):
+        self.grow = True
+    
+    def check_collision(self, width, height):
+        head_x, head_y = self.body[0]
+        
+        # Wall collision
+        if head_x < 0 or head_x >= width or head_y < 0 or head_y >= height:
+            return True
+        
+        # Self collision (head shares its cell with another segment)
+        if self.occupancy[self.body[0]] > 1:
+            return True
+        
+        return False
+
+
+class Food:
+    def __init__(self, width, height, rng=random):
+        self.width = width
+        self.height = height
+        self.rng = rng
+        self.free_cells = FreeCells(width // SNAKE_SIZE, height // SNAKE_SIZE)
+        self.position = self.spawn()
+    
+    def spawn(self):
+        """
+        Pick a random free cell, None if the board is full
+        The pick is made from the compacted order, which depends only on
+        which cells are taken: a game restored from a snapshot spawns the
+        same food, and nothing that merely reads the game can change it.
+        Compacting costs O(taken) after the board changed, the pick is O(1)
+        """
+        self.free_cells.compact()
+        return self.free_cells.choice(self.rng)
+    
+    def respawn(self, snake_body=()):
+        """
+        Move food to a free cell, returns False if the board is full
+        snake_body is only needed for a snake not attached to free_cells
+        """
+        # Exclude an untracked body for this pick only
+        taken = [cell for cell in snake_body if cell in self.free_cells]
+        for cell in taken:
+            self.free_cells.remove(cell)
+        
+        self.position = self.spawn()
+        
+        for cell in taken:
+            self.free_cells.add(cell)
+        
+        return self.position is not None
+
+
+class SnakeEngine:
+    """
+    Headless snake game. All randomness comes from a seeded RNG,
+    so the same seed and inputs always replay the same game.
+    With players > 1 several snakes share the board and the food, and
+    running into another snake counts as a crash.
+    """
+    
+    # Subclasses swap these for drawable versions
+    snake_class = Snake
+    food_class = Food
+    
+    def __init__(self, width, height, seed=None, players=1):
+        self.width = width
+        self.height = height
+        self.players = players
+        self.rng = random.Random(seed)
+        self.reset()
+    
+    def _start_positions(self):
+        """(x, y, direction) per player: centered alone, facing rows otherwise"""
+        if self.players == 1:
+            return [(self.width // 2, self.height // 2, RIGHT)]
+        
+        starts = []
+        for player in range(self.players):
+            y = self.height * (player + 1) // (self.players + 1)
+            if player % 2 == 0:
+                starts.append((self.width // 4, y, RIGHT))
+            else:
+                starts.append((self.width * 3 // 4, y, LEFT))
+        return starts
+    
+    def reset(self):
+        self.food = self.food_class(self.width, self.height, self.rng)
+        self.snakes = []
+        for x, y, direction in self._start_positions():
+            snake = self.snake_class(
+                x // SNAKE_SIZE * SNAKE_SIZE, y // SNAKE_SIZE * SNAKE_SIZE, self.food.free_cells
+            )
+            snake.direction = direction
+            self.snakes.append(snake)
+        self.snake = self.snakes[0]
+        
+        if any(snake.occupies(self.food.position) for snake in self.snakes):
+            self.food.respawn()
+        self.scores = [0] * self.players
+        self.game_over = False
+        self.winner = None  # Surviving player when a multiplayer game ends
+        self.tick = 0
+        
+        # What the last update changed
+        self.removed_tails = [None] * self.players
+        self.food_moved = False
+    
+    def restore(self, state, restore_rng=True):
+        """
+        Replace the whole game state with a decoded snapshot (see snapshot.py)
+        Without restore_rng the random sequence carries on from where it was
+        """
+        self.width = state.width
+        self.height = state.height
+        self.players = len(state.snakes)
+        
+        # Fresh board index and explicit food. Building Food draws from the
+        # RNG, so the saved RNG state is applied afterwards
+        self.food = self.food_class(self.width, self.height, self.rng)
+        self.food.position = state.food
+        if restore_rng:
+            self.rng.setstate(state.rng_state)
+        self.snakes = []
+        for saved in state.snakes:
+            snake = self.snake_class(*saved.body[0], self.food.free_cells)
+            snake.body = saved.body
+            snake.direction = saved.direction
+            snake.grow = saved.grow
+            self.snakes.append(snake)
+        self.snake = self.snakes[0]
+        self.food.free_cells.compact()
+        
+        self.scores = [saved.score for saved in state.snakes]
+        self.game_over = state.game_over
+        self.winner = state.winner
+        self.tick = state.tick
+        self.mark_restored()
+    
+    def mark_restored(self):
+        """Called after the state was replaced or rewound outside update()"""
+        self.removed_tails = [None] * self.players
+        self.food_moved = False
+    
+    @property
+    def score(self):
+        """Total score of all players"""
+        return sum(self.scores)
+    
+    @property
+    def removed_tail(self):
+        """Cell freed by the first snake in the last update"""
+        return self.removed_tails[0]
+    
+    def update(self, *directions):
+        """Advance one tick, directions are given per player (None = keep going)"""
+        if self.game_over:
+            return
+        
+        # Change direction if provided
+        for snake, direction in zip(self.snakes, directions):
+            if direction:
+                snake.change_direction(direction)
+        
+        # Move snakes. A head may follow into the cell another snake's tail
+        # leaves this tick: the head found the cell still taken and the tail
+        # then released it, so take every head's cell again
+        self.removed_tails = [snake.move() for snake in self.snakes]
+        if self.players > 1:
+            for snake in self.snakes:
+                self.food.free_cells.remove(snake.body[0])
+        self.food_moved = False
+        self.tick += 1
+        
+        # Check food collision
+        for player, snake in enumerate(self.snakes):
+            if snake.body[0] == self.food.position:
+                snake.grow_snake()
+                self.scores[player] += 10
+                
+                # Board full, nowhere left to put food
+                if not self.food.respawn():
+                    self.game_over = True
+                    return
+                self.food_moved = True
+                break
+        
+        # Check collisions
+        crashed = [self._crashed(player) for player in range(self.players)]
+        if any(crashed):
+            self.game_over = True
+            if self.players > 1:
+                survivors = [player for player in range(self.players) if not crashed[player]]
+                self.winner = survivors[0] if len(survivors) == 1 else None
+    
+    def _crashed(self, player):
+        """Wall, own body or another snake under this snake's head"""
+        snake = self.snakes[player]
+        if snake.check_collision(self.width, self.height):
+            return True
+        
+        head = snake.body[0]
+        return any(other.occupies(head) for other in self.snakes if other is not snake)
+
+
+# Direction codes used by BatchSnakeEngine and batch gesture classification
+DIRECTION_CODES = {UP: 0, RIGHT: 1, DOWN: 2, LEFT: 3}
+DIRECTION_NAMES = (UP, RIGHT, DOWN, LEFT)  # Indexed by code
+NO_DIRECTION = -1
+_DELTAS = np.array([[0, -1], [1, 0], [0, 1], [-1, 0]], dtype=np.int32)
+
+
+class BatchSnakeEngine:
+    """
+    N independent games on a board of columns x rows cells, advanced together.
+    
+    Each board cell stores the tick at which it becomes free again, so moving
+    a snake is a single write per game and the tail never has to be found:
+    a cell is occupied while its value is greater than the game's tick.
+    """
+    
+    def __init__(self, num_games, columns, rows, seed=None):
+        self.num_games = num_games
+        self.columns = columns
+        self.rows = rows
+        self.rng = np.random.default_rng(seed)
+        
+        self.grid = np.zeros((num_games, rows, columns), dtype=np.int32)
+        self.ticks = np.zeros(num_games, dtype=np.int32)
+        self.heads = np.zeros((num_games, 2), dtype=np.int32)  # (x, y) cells
+        self.food = np.zeros((num_games, 2), dtype=np.int32)
+        self.directions = np.zeros(num_games, dtype=np.int8)
+        self.lengths = np.zeros(num_games, dtype=np.int32)
+        self.scores = np.zeros(num_games, dtype=np.int32)
+        self.games = np.arange(num_games)
+        
+        self.reset()
+    
+    def reset(self, games=None):
+        """Reset all games, or only the given indices / boolean mask"""
+        games = self.games if games is None else self.games[games]
+        if len(games) == 0:
+            return
+        
+        self.grid[games] = 0
+        self.ticks[games] = 0
+        self.heads[games] = (self.columns // 2, self.rows // 2)
+        self.directions[games] = DIRECTION_CODES[RIGHT]
+        self.lengths[games] = 1
+        self.scores[games] = 0
+        
+        # Start cell is occupied until the first move frees it
+        self.grid[games, self.heads[games, 1], self.heads[games, 0]] = 1
+        self._spawn_food(games)
+    
+    def _spawn_food(self, games):
+        """Place food on a random free cell, returns mask of games with a full board"""
+        free = self.grid[games] <= self.ticks[games, None, None]
+        keys = self.rng.random(free.shape, dtype=np.float32) * free
+        flat = keys.reshape(len(games), -1).argmax(axis=1)
+        self.food[games, 0] = flat % self.columns
+        self.food[games, 1] = flat // self.columns
+        return ~free.reshape(len(games), -1).any(axis=1)
+    
+    def observations(self):
+        """Compact per-game features: head x, head y, food x, food y, direction, length"""
+        return np.column_stack((self.heads, self.food, self.directions, self.lengths))
+    
+    def grid_observations(self):
+        """Board images: 0 empty, 1 body, 2 head, 3 food"""
+        boards = (self.grid > self.ticks[:, None, None]).astype(np.int8)
+        boards[self.games, self.food[:, 1], self.food[:, 0]] = 3
+        boards[self.games, self.heads[:, 1], self.heads[:, 0]] = 2
+        return boards
+    
+    def step(self, directions=None):
+        """
+        Advance every game by one tick
+        directions: array of direction codes (0 up, 1 right, 2 down, 3 left),
+                    -1 keeps the current direction
+        Returns: (scores, done, observations). Scores are final for games that
+        just ended; those games are reset before returning.
+        """
+        # Change direction unless it reverses the snake
+        if directions is not None:
+            directions = np.asarray(directions)
+            turn = (directions >= 0) & (directions != (self.directions + 2) % 4)
+            self.directions = np.where(turn, directions, self.directions).astype(np.int8)
+        
+        self.ticks += 1
+        new_heads = self.heads + _DELTAS[self.directions]
+        x, y = new_heads[:, 0], new_heads[:, 1]
+        
+        # Wall collision, then self collision on boards that are still valid
+        done = (x < 0) | (x >= self.columns) | (y < 0) | (y >= self.rows)
+        xs = np.clip(x, 0, self.columns - 1)
+        ys = np.clip(y, 0, self.rows - 1)
+        done |= self.grid[self.games, ys, xs] > self.ticks
+        
+        alive = ~done
+        self.heads[alive] = new_heads[alive]
+        self.grid[alive, ys[alive], xs[alive]] = self.ticks[alive] + self.lengths[alive]
+        
+        # Eating: every occupied cell stays one tick longer
+        ate = alive & (x == self.food[:, 0]) & (y == self.food[:, 1])
+        eaters = self.games[ate]
+        if len(eaters):
+            self.lengths[eaters] += 1
+            self.scores[eaters] += 10
+            boards = self.grid[eaters]
+            boards += boards > self.ticks[eaters, None, None]
+            self.grid[eaters] = boards
+            
+            # Board full ends the game
+            full = self._spawn_food(eaters)
+            done[eaters[full]] = True
+        
+        scores = self.scores.copy()
+        self.reset(done)
+        return scores, done, self.observations()
@@ -0,0 +1,145 @@
+"""
+Gesture Backends
+Hand finders behind GestureController. A backend reports where each hand
+is and how sure it is, so direction logic is shared by all of them.
+The MediaPipe backend lives in gesture_controller.py, the cheap ones here.
+"""
+
+from collections import namedtuple
+import cv2
+import numpy as np
+from landmark_recording import NUM_LANDMARKS
+from profiler import NULL_PROFILER
+from config import *
+
+WRIST = 0  # Landmark used as the hand position
+
+# positions: (hands, 2) normalized hand positions (wrist, or a blob centre)
+# confidences: (hands,) 0-1, landmarks: (hands, 21, 3) or None if the
+# backend has none, labels: handedness per hand or None
+HandDetections = namedtuple("HandDetections", ["positions", "confidences", "landmarks", "labels"])
+
+
+def no_hands(landmarks=True):
+    """Detections of an empty frame"""
+    return HandDetections(
+        np.empty((0, 2), dtype=np.float32), np.empty(0, dtype=np.float32),
+        np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32) if landmarks else None, None
+    )
+
+
+def detections_from_landmarks(landmarks, labels=None, confidences=None):
+    """Detections for (hands, 21, 3) landmarks, positioned at the wrist"""
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    if confidences is None:
+        confidences = np.ones(len(landmarks), dtype=np.float32)
+    return HandDetections(
+        landmarks[:, WRIST, :2], np.asarray(confidences, dtype=np.float32), landmarks, labels
+    )
+
+
+class GestureBackend:
+    """
+    Interface of a hand finder. detect() takes a BGR frame and its capture
+    time and returns HandDetections for up to max_hands hands.
+    """
+
+    name = None
+
+    def detect(self, frame, capture_time):
+        raise NotImplementedError
+
+    def warm_up(self, frame):
+        """Pay one-off costs (model graphs, buffers) before the first frame"""
+
+    def set_quality(self, scale, model_complexity):
+        """Cheaper or better detection (see quality.py), ignored where it doesn't apply"""
+
+    def set_profiler(self, profiler):
+        """Time detection stages with another FrameProfiler"""
+        self.profiler = profiler
+
+    def close(self):
+        pass
+
+
+class BlobBackend(GestureBackend):
+    """
+    Finds hands as the largest skin-coloured regions that moved recently,
+    located with image moments on a small copy of the frame. Costs well
+    under a millisecond, but has no landmarks or handedness, and a hand
+    held still fades into the background model (the snake keeps going).
+    """
+
+    name = "blob"
+
+    def __init__(self, max_hands=1, width=BLOB_WIDTH, min_area=BLOB_MIN_AREA,
+                 motion_mask=BLOB_MOTION_MASK, profiler=NULL_PROFILER):
+        self.max_hands = max_hands
+        self.width = width
+        self.scale = 1.0
+        self.min_area = min_area
+        self.profiler = profiler
+        self.lower = np.array(BLOB_SKIN_LOWER, dtype=np.uint8)
+        self.upper = np.array(BLOB_SKIN_UPPER, dtype=np.uint8)
+        self.kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+
+        # Moving pixels only, so faces and skin-coloured walls don't count.
+        # The background is a running average of brightness (far cheaper than MOG2)
+        self.motion_mask = motion_mask
+        self.background = None
+
+    def set_quality(self, scale, model_complexity):
+        self.scale = scale
+
+    def mask(self, frame):
+        """Skin (and motion) mask of a downscaled frame"""
+        height, width = frame.shape[:2]
+        small_width = max(int(self.width * self.scale), 16)
+        small_height = max(round(height * small_width / width), 1)
+
+        with self.profiler.stage("detect.convert"):
+            small = cv2.resize(frame, (small_width, small_height), interpolation=cv2.INTER_LINEAR)
+            ycrcb = cv2.cvtColor(small, cv2.COLOR_BGR2YCrCb)
+            mask = cv2.inRange(ycrcb, self.lower, self.upper)
+        if self.motion_mask:
+            with self.profiler.stage("detect.motion"):
+                cv2.bitwise_and(mask, self._moving(cv2.extractChannel(ycrcb, 0)), dst=mask)
+        return cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel)
+
+    def _moving(self, luma):
+        """Pixels brighter or darker than the background, then learn the frame"""
+        if self.background is None or self.background.shape != luma.shape:
+            self.background = luma.astype(np.float32)
+        difference = cv2.absdiff(luma, cv2.convertScaleAbs(self.background))
+        cv2.accumulateWeighted(luma, self.background, 1.0 / BLOB_MOTION_HISTORY)
+        return cv2.threshold(difference, BLOB_MOTION_THRESHOLD, 255, cv2.THRESH_BINARY)[1]
+
+    def detect(self, frame, capture_time):
+        mask = self.mask(frame)
+        height, width = mask.shape
+
+        with self.profiler.stage("detect.process"):
+            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            min_pixels = self.min_area * width * height
+            blobs = sorted(
+                ((cv2.contourArea(contour), contour) for contour in contours),
+                key=lambda blob: blob[0], reverse=True
+            )[:self.max_hands]
+
+            positions, confidences = [], []
+            for area, contour in blobs:
+                moments = cv2.moments(contour)
+                if area < min_pixels or moments["m00"] == 0:
+                    break
+                positions.append((moments["m10"] / moments["m00"] / width,
+                                  moments["m01"] / moments["m00"] / height))
+
+                # Blobs at the minimum size are doubtful, four times that is a clear hand
+                confidences.append(min(area / (4 * min_pixels), 1.0))
+
+        if not positions:
+            return no_hands(landmarks=False)
+        return HandDetections(
+            np.array(positions, dtype=np.float32), np.array(confidences, dtype=np.float32), None, None
+        )
@@ -1,110 +1,843 @@
 """
 Gesture Controller
-Hand detection and gesture recognition using MediaPipe
+Hand detection and gesture recognition, with MediaPipe or a cheaper
+backend from gesture_backends.py. MediaPipe is imported only when a
+backend or drawing needs it, so cheap backends never load it.
 """
 
+import itertools
+import threading
+import time
+from collections import deque
 import cv2
-import mediapipe as mp
 import numpy as np
+from camera import CameraStream
+from capture_config import configure_capture
+from hand_tracker import HandTracker
+from gesture_backends import (
+    WRIST, GestureBackend, BlobBackend, detections_from_landmarks, no_hands
+)
+from engine import DIRECTION_CODES, DIRECTION_NAMES, NO_DIRECTION
+from landmark_recording import LandmarkRecorder, LandmarkReplay, NUM_LANDMARKS, record_hands
+from profiler import NULL_PROFILER
+from startup import NULL_STARTUP_TIMER, BackgroundLoader
 from config import *
 
+def create_hands(max_num_hands=1, model_complexity=MODEL_COMPLEXITY):
+    """Create a MediaPipe Hands instance with the configured settings"""
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=max_num_hands,
+        model_complexity=model_complexity,
+        min_detection_confidence=GESTURE_CONFIDENCE,
+        min_tracking_confidence=GESTURE_CONFIDENCE
+    )
 
-class GestureController:
-    def __init__(self):
-        # Initialize MediaPipe Hands
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=GESTURE_CONFIDENCE,
-            min_tracking_confidence=GESTURE_CONFIDENCE
+
+def classify_offsets(offsets, threshold):
+    """
+    Vectorized direction classification of hand offsets from the frame
+    center (as a fraction of the frame size), shape (..., 2).
+    Horizontal movement is prioritized over vertical.
+    Returns: direction codes (DIRECTION_CODES, NO_DIRECTION), shape (...)
+    """
+    offsets = np.asarray(offsets)
+    rel_x = offsets[..., 0]
+    rel_y = offsets[..., 1]
+    horizontal = np.abs(rel_x) > np.abs(rel_y)
+    
+    codes = np.full(rel_x.shape, NO_DIRECTION, dtype=np.int8)
+    codes[horizontal & (rel_x > threshold)] = DIRECTION_CODES[RIGHT]
+    codes[horizontal & (rel_x < -threshold)] = DIRECTION_CODES[LEFT]
+    codes[~horizontal & (rel_y > threshold)] = DIRECTION_CODES[DOWN]
+    codes[~horizontal & (rel_y < -threshold)] = DIRECTION_CODES[UP]
+    return codes
+
+
+def classify_directions(landmarks, threshold, present=None):
+    """
+    Direction codes for many frames at once from their wrist positions
+    landmarks: (frames, 21, 3) normalized landmarks, e.g. a recording's
+    "landmarks" column; present: optional mask of frames that have a hand
+    """
+    landmarks = np.asarray(landmarks)
+    codes = classify_offsets(landmarks[..., WRIST, :2] - 0.5, threshold)
+    if present is not None:
+        codes[~np.asarray(present, dtype=bool)] = NO_DIRECTION
+    return codes
+
+
+def direction_name(code):
+    """Direction constant for a direction code"""
+    code = int(code)
+    return DIRECTION_NAMES[code] if code != NO_DIRECTION else NONE
+
+
+def direction_from_offset(rel_x, rel_y, threshold):
+    """Direction for a single hand offset (see classify_offsets)"""
+    return direction_name(classify_offsets((rel_x, rel_y), threshold)[()])
+
+
+def landmarks_to_array(multi_hand_landmarks):
+    """MediaPipe hand landmark lists as one (hands, 21, 3) float32 array"""
+    if not multi_hand_landmarks:
+        return np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32)
+    
+    count = len(multi_hand_landmarks) * NUM_LANDMARKS * 3
+    values = np.fromiter(
+        (value for hand in multi_hand_landmarks for lm in hand.landmark
+         for value in (lm.x, lm.y, lm.z)),
+        dtype=np.float32, count=count
+    )
+    return values.reshape(-1, NUM_LANDMARKS, 3)
+
+
+class DirectionPredictor:
+    """
+    Compensates for pipeline latency by looking ahead: wrist velocity and
+    acceleration are fitted over the last few positions, and a direction is
+    committed once the extrapolated position is past the threshold
+    `latency` seconds from now. Early directions need enough confidence and
+    several agreeing frames, which keeps jitter from turning the snake.
+    """
+    
+    def __init__(self, threshold, window=PREDICTION_WINDOW, min_confidence=PREDICTION_CONFIDENCE,
+                 confirm_frames=PREDICTION_CONFIRM_FRAMES, min_speed=PREDICTION_MIN_SPEED,
+                 max_horizon=PREDICTION_MAX_HORIZON):
+        self.threshold = threshold
+        self.min_confidence = min_confidence
+        self.confirm_frames = confirm_frames
+        self.min_speed = min_speed
+        self.max_horizon = max_horizon
+        self.samples = deque(maxlen=window)
+        
+        self._candidate = NONE
+        self._candidate_frames = 0
+        
+        # Statistics
+        self.early_directions = 0
+        self.confidence = 0.0
+    
+    def reset(self):
+        """Forget the motion history (hand lost)"""
+        self.samples.clear()
+        self._candidate = NONE
+        self._candidate_frames = 0
+    
+    def update(self, rel_x, rel_y, timestamp, latency):
+        """
+        Add a wrist offset (as in direction_from_offset) observed at timestamp
+        Returns: the measured direction if there is one, else a predicted direction or NONE
+        """
+        self.samples.append((timestamp, rel_x, rel_y))
+        
+        direction = direction_from_offset(rel_x, rel_y, self.threshold)
+        if direction != NONE:
+            self._candidate = NONE
+            self._candidate_frames = 0
+            return direction
+        
+        predicted, self.confidence = self._extrapolate(min(latency, self.max_horizon))
+        if predicted == NONE or self.confidence < self.min_confidence:
+            self._candidate = NONE
+            self._candidate_frames = 0
+            return NONE
+        
+        # False-positive guard: the same early direction on consecutive frames
+        if predicted == self._candidate:
+            self._candidate_frames += 1
+        else:
+            self._candidate = predicted
+            self._candidate_frames = 1
+        
+        if self._candidate_frames < self.confirm_frames:
+            return NONE
+        
+        if self._candidate_frames == self.confirm_frames:
+            self.early_directions += 1
+        return predicted
+    
+    def _extrapolate(self, horizon):
+        """Predicted direction at now + horizon and its confidence"""
+        if len(self.samples) < 3 or horizon <= 0:
+            return NONE, 0.0
+        
+        samples = np.array(self.samples)
+        times = samples[:, 0] - samples[-1, 0]
+        positions = samples[:, 1:]
+        if times[0] >= 0:
+            return NONE, 0.0
+        
+        # Quadratic fit: coefficients are (acceleration / 2, velocity, position) at now
+        coefficients, residuals, _, _, _ = np.polyfit(times, positions, 2, full=True)
+        half_acceleration, velocity, position = coefficients
+        if np.hypot(*velocity) < self.min_speed:
+            return NONE, 0.0
+        
+        future = position + velocity * horizon + half_acceleration * horizon ** 2
+        direction = direction_from_offset(future[0], future[1], self.threshold)
+        if direction == NONE:
+            return NONE, 0.0
+        
+        # The hand has to be heading into the zone, not drifting out of it
+        axis = 0 if direction in (LEFT, RIGHT) else 1
+        if np.sign(velocity[axis]) != np.sign(future[axis]):
+            return NONE, 0.0
+        
+        # Confidence: how far past the threshold relative to the fit noise
+        margin = abs(future[axis]) - self.threshold
+        noise = np.sqrt(residuals[axis] / len(times)) if len(residuals) else 0.0
+        noise = max(noise, 1e-3) * (1 + horizon / -times[0])
+        return direction, margin / (margin + noise)
+
+
+def landmarks_from_points(points):
+    """Build a MediaPipe landmark list from (x, y, z) points (for drawing)"""
+    from mediapipe.framework.formats import landmark_pb2
+    hand_landmarks = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in points:
+        hand_landmarks.landmark.add(x=float(x), y=float(y), z=float(z))
+    return hand_landmarks
+
+
+def draw_landmarks(frame, points):
+    """Draw a hand's (x, y, z) points as MediaPipe's hand skeleton"""
+    from mediapipe import solutions
+    solutions.drawing_utils.draw_landmarks(
+        frame, landmarks_from_points(points), solutions.hands.HAND_CONNECTIONS
+    )
+
+
+def handedness_labels(results):
+    """Handedness label ("Left" or "Right") of each detected hand"""
+    handedness = getattr(results, "multi_handedness", None) or []
+    return [hand.classification[0].label for hand in handedness]
+
+
+class PlayerAssigner:
+    """
+    Keeps each player on the same hand from frame to frame. Hands are
+    matched to players by the smallest total wrist movement since each
+    player was last seen, plus a penalty when the handedness label changes.
+    Players without a recent position are placed left to right.
+    """
+    
+    def __init__(self, players, handedness_penalty=ASSIGN_HANDEDNESS_PENALTY,
+                 memory=ASSIGN_MEMORY_FRAMES):
+        self.players = players
+        self.handedness_penalty = handedness_penalty
+        self.memory = memory
+        self.positions = [None] * players  # Last wrist (x, y), normalized
+        self.labels = [None] * players
+        self.missing = [0] * players
+    
+    def _cost(self, player, wrist, label):
+        position = self.positions[player]
+        if position is None:
+            # New player: their share of the frame, left to right
+            home = (player + 0.5) / self.players
+            return abs(wrist[0] - home) + 1.0
+        
+        cost = float(np.hypot(wrist[0] - position[0], wrist[1] - position[1]))
+        if label is not None and self.labels[player] is not None and label != self.labels[player]:
+            cost += self.handedness_penalty
+        return cost
+    
+    def assign(self, wrists, labels=None):
+        """
+        wrists: (hands, 2) normalized wrist positions, labels: handedness per hand
+        Returns: player index for each hand (at most `players` hands are assigned)
+        """
+        hands = min(len(wrists), self.players)
+        if labels is None or len(labels) != len(wrists):
+            labels = [None] * len(wrists)
+        
+        # Few players and hands, so every assignment can be tried
+        best, best_cost = (), None
+        for players in itertools.permutations(range(self.players), hands):
+            cost = sum(self._cost(player, wrists[hand], labels[hand])
+                       for hand, player in enumerate(players))
+            if best_cost is None or cost < best_cost:
+                best, best_cost = players, cost
+        
+        for player in range(self.players):
+            if player in best:
+                hand = best.index(player)
+                self.positions[player] = (float(wrists[hand][0]), float(wrists[hand][1]))
+                self.labels[player] = labels[hand]
+                self.missing[player] = 0
+            else:
+                self.missing[player] += 1
+                if self.missing[player] > self.memory:
+                    self.positions[player] = None
+                    self.labels[player] = None
+        
+        return list(best) + [None] * (len(wrists) - hands)
+
+
+def hand_roi(hand_landmarks, width, height, margin):
+    """
+    Square region around a hand, grown by margin (fraction of the hand size)
+    Returns: (x0, y0, x1, y1) in pixels, clamped to the frame
+    """
+    xs = [lm.x * width for lm in hand_landmarks.landmark]
+    ys = [lm.y * height for lm in hand_landmarks.landmark]
+    
+    center_x = (min(xs) + max(xs)) / 2
+    center_y = (min(ys) + max(ys)) / 2
+    half = max(max(xs) - min(xs), max(ys) - min(ys)) * (1 + margin) / 2
+    half = max(half, ROI_MIN_SIZE / 2)
+    
+    x0 = max(0, int(center_x - half))
+    y0 = max(0, int(center_y - half))
+    x1 = min(width, int(center_x + half))
+    y1 = min(height, int(center_y + half))
+    return x0, y0, x1, y1
+
+
+def map_landmarks_to_frame(hand_landmarks, roi, width, height):
+    """Convert landmarks normalized to a crop back to full-frame coordinates (in place)"""
+    x0, y0, x1, y1 = roi
+    crop_width = x1 - x0
+    crop_height = y1 - y0
+    
+    for lm in hand_landmarks.landmark:
+        lm.x = (x0 + lm.x * crop_width) / width
+        lm.y = (y0 + lm.y * crop_height) / height
+
+
+class HandDetector:
+    """
+    MediaPipe Hands with a cheaper search strategy:
+    full-frame searches run on a downscaled frame, and once a hand is found
+    detection runs on a crop around its last position. Landmarks are always
+    returned in full-frame coordinates. All max_hands hands are found in
+    one pass; cropping is single-hand only.
+    
+    With background_rebuild a model change is built (and warmed up) on a
+    loader thread while the current model keeps running, so lowering
+    quality never stalls the frame loop.
+    """
+    
+    def __init__(self, scale=INFERENCE_SCALE, use_roi=ROI_TRACKING, roi_margin=ROI_MARGIN,
+                 profiler=NULL_PROFILER, max_hands=1, model_complexity=MODEL_COMPLEXITY,
+                 background_rebuild=False):
+        self.max_hands = max_hands
+        self.model_complexity = model_complexity
+        self.hands = create_hands(max_hands, model_complexity)
+        self.background_rebuild = background_rebuild
+        self.target_complexity = model_complexity
+        self._rebuild = None  # BackgroundLoader building the next model
+        self.scale = scale
+        self.use_roi = use_roi and max_hands == 1
+        self.roi_margin = roi_margin
+        self.roi = None
+        self.profiler = profiler
+    
+    def process(self, frame):
+        """Detect hands in a BGR frame, returns the MediaPipe results"""
+        if self._rebuild is not None:
+            self._update_model()
+        height, width = frame.shape[:2]
+        
+        if self.roi is not None:
+            results = self._process_region(frame, self.roi, 1.0)
+            if results.multi_hand_landmarks:
+                self._update_roi(results, width, height)
+                return results
+            
+            # Hand lost, fall back to a full-frame search
+            self.roi = None
+        
+        results = self._process_region(frame, (0, 0, width, height), self.scale)
+        if results.multi_hand_landmarks and self.use_roi:
+            self._update_roi(results, width, height)
+        return results
+    
+    def _process_region(self, frame, roi, scale):
+        x0, y0, x1, y1 = roi
+        region = frame[y0:y1, x0:x1]
+        
+        # Resize and convert only the pixels we actually feed to the model
+        with self.profiler.stage("detect.convert"):
+            if scale != 1.0:
+                region = cv2.resize(region, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            rgb_region = cv2.cvtColor(region, cv2.COLOR_BGR2RGB)
+        
+        with self.profiler.stage("detect.process"):
+            results = self.hands.process(rgb_region)
+        
+        # Normalized coordinates are scale independent, only crops need mapping
+        height, width = frame.shape[:2]
+        if results.multi_hand_landmarks and (x1 - x0, y1 - y0) != (width, height):
+            for hand_landmarks in results.multi_hand_landmarks:
+                map_landmarks_to_frame(hand_landmarks, roi, width, height)
+        
+        return results
+    
+    def _update_roi(self, results, width, height):
+        self.roi = hand_roi(results.multi_hand_landmarks[0], width, height, self.roi_margin)
+    
+    def set_quality(self, scale, model_complexity):
+        """Change the search scale, and the model (rebuilt only if it differs)"""
+        self.scale = scale
+        self.target_complexity = model_complexity
+        if self.background_rebuild:
+            self._update_model()
+        elif model_complexity != self.model_complexity:
+            self.hands.close()
+            self.hands = create_hands(self.max_hands, model_complexity)
+            self.model_complexity = model_complexity
+    
+    def _update_model(self):
+        """
+        Swap in a model built in the background once it is ready, and start
+        building the wanted one if it differs (one build at a time)
+        """
+        rebuild = self._rebuild
+        if rebuild is not None:
+            if not rebuild.done:
+                return
+            self._rebuild = None
+            if rebuild.error is not None:
+                print(f"Could not switch the hand model ({rebuild.error}), keeping complexity {self.model_complexity}")
+                self.target_complexity = self.model_complexity
+            else:
+                # Closing a model costs as much as building one
+                old = self.hands
+                self.hands, self.model_complexity = rebuild.result
+                threading.Thread(target=old.close, name="hands-close", daemon=True).start()
+        
+        if self.target_complexity != self.model_complexity:
+            complexity = self.target_complexity
+            self._rebuild = BackgroundLoader(lambda: self._build_model(complexity)).start()
+    
+    def _build_model(self, complexity):
+        """New model with its first (slow) inference already done"""
+        hands = create_hands(self.max_hands, complexity)
+        hands.process(np.zeros((64, 64, 3), dtype=np.uint8))
+        return hands, complexity
+    
+    def close(self):
+        if self._rebuild is not None and self._rebuild.join() and self._rebuild.result is not None:
+            self._rebuild.result[0].close()
+        self.hands.close()
+
+
+class MediaPipeBackend(GestureBackend):
+    """
+    MediaPipe Hands: 21 landmarks and handedness per hand, positioned at
+    the wrist. With DETECTION_INTERVAL > 1 a single hand is tracked
+    between detections.
+    """
+    
+    name = "mediapipe"
+    
+    def __init__(self, max_hands=1, profiler=NULL_PROFILER):
+        self.detector = HandDetector(profiler=profiler, max_hands=max_hands, background_rebuild=True)
+        
+        # Skip-frame tracking follows a single hand
+        self.tracker = None
+        if DETECTION_INTERVAL > 1 and max_hands == 1:
+            self.tracker = HandTracker(self.detector, profiler=profiler)
+    
+    def detect(self, frame, capture_time):
+        if self.tracker is not None:
+            points, _ = self.tracker.process(frame, capture_time)
+            if points is None:
+                return no_hands()
+            return detections_from_landmarks(points[None], confidences=[self.tracker.score])
+        
+        results = self.detector.process(frame)
+        handedness = getattr(results, "multi_handedness", None) or []
+        return detections_from_landmarks(
+            landmarks_to_array(results.multi_hand_landmarks), handedness_labels(results),
+            [hand.classification[0].score for hand in handedness] or None
         )
-        self.mp_draw = mp.solutions.drawing_utils
+    
+    def warm_up(self, frame):
+        self.detector.process(frame)
+    
+    def set_quality(self, scale, model_complexity):
+        self.detector.set_quality(scale, model_complexity)
+    
+    def set_profiler(self, profiler):
+        self.detector.profiler = profiler
+        if self.tracker is not None:
+            self.tracker.profiler = profiler
+    
+    def close(self):
+        self.detector.close()
+
+
+def create_backend(name=GESTURE_BACKEND, max_hands=1, profiler=NULL_PROFILER):
+    """Gesture backend by its config name"""
+    if name == "mediapipe":
+        return MediaPipeBackend(max_hands, profiler)
+    if name == "blob":
+        return BlobBackend(max_hands, profiler=profiler)
+    raise ValueError(f"Unknown gesture backend {name!r}, use \"mediapipe\" or \"blob\"")
+
+
+class GestureController:
+    def __init__(self, source=CAMERA_INDEX, profiler=NULL_PROFILER,
+                 replay_path=None, replay_speed=REPLAY_SPEED, record_path=None, seed=0,
+                 timer=NULL_STARTUP_TIMER, players=PLAYERS, backend=GESTURE_BACKEND):
+        """
+        source: camera index or video file path, None to run without a camera
+        replay_path: landmark recording to play back instead of camera and MediaPipe
+        replay_speed: replay speed multiplier, 0 = as fast as possible
+        record_path: file to record the detected landmarks of every frame to
+        seed: seed of the game being recorded, stored in the recording
+        timer: StartupTimer for the startup breakdown
+        players: number of hands to track, one per player
+        backend: "mediapipe" or "blob" (see gesture_backends.py)
+        """
+        self.profiler = profiler
+        self.players = players
+        
+        # Replay needs neither a camera nor the model
+        self.replay = LandmarkReplay(replay_path, replay_speed) if replay_path else None
+        self._replay_canvas = np.full((SCREEN_HEIGHT, CAMERA_WIDTH, 3), 40, dtype=np.uint8)
+        if record_path and backend != "mediapipe" and self.replay is None:
+            print(f"Landmark recording needs the mediapipe backend, not recording with {backend!r}")
+            record_path = None
+        self.recorder = LandmarkRecorder(record_path, seed, players) if record_path else None
+        
+        # Initialize the hand finder (MediaPipe in a worker process for
+        # "process" mode, cheap backends always run inline)
+        self.inference_mode = "replay" if self.replay is not None else INFERENCE_MODE
+        if self.inference_mode == "process" and backend != "mediapipe":
+            self.inference_mode = "inline"
+        self.backend = None
+        if self.inference_mode == "inline":
+            with timer.phase("hands.create"):
+                self.backend = create_backend(backend, players, profiler)
+        self.worker = None
+        self._submitted_frames = 0
+        self._worker_result_id = None
+        self._worker_hands = (no_hands(), [])
+        self._worker_directions = [NONE] * players
+        
+        # Keeps each player on the same hand
+        self.assigner = PlayerAssigner(players) if players > 1 else None
         
         # Initialize camera
-        self.cap = cv2.VideoCapture(CAMERA_INDEX)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, SCREEN_HEIGHT)
+        self.cap = None
+        self.stream = None
+        self.capture_mode = None
+        if source is not None and self.replay is None:
+            with timer.phase("camera.open"):
+                self.cap = cv2.VideoCapture(source)
+            if not self.cap.isOpened():
+                self.cap.release()
+                self.cap = None
+                self.release()
+                raise RuntimeError(f"camera not available ({source!r} could not be opened)")
+            
+            # Cameras are put into a native mode (cached per device),
+            # anything else gets the display size requested as before
+            if CAPTURE_NEGOTIATION and not isinstance(source, str):
+                with timer.phase("camera.configure"):
+                    self.capture_mode = configure_capture(self.cap, source)
+            if self.capture_mode is None:
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, SCREEN_HEIGHT)
+            
+            # Background capture keeps only the newest camera frame,
+            # video files are read in order so sessions replay exactly
+            if THREADED_CAPTURE and not isinstance(source, str):
+                self.stream = CameraStream(self.cap).start()
+        self._frame_id = 0
         
         # Gesture detection settings
         self.last_direction = NONE
-        self.gesture_threshold = 0.15  # Minimum movement to register gesture
+        self.gesture_threshold = GESTURE_THRESHOLD
+        
+        # Optional look-ahead to hide capture and inference latency, per player
+        self.predictors = None
+        if PREDICTIVE_DIRECTION:
+            self.predictors = [DirectionPredictor(self.gesture_threshold) for _ in range(players)]
+        self.latency = 0.0
+        self._capture_times = {}
+        
+        # Cached static overlay, rebuilt when the geometry changes
+        self._overlay_key = None
+        
+        # Quality settings (lowered by the adaptive quality governor)
+        self.draw_zones = True
+        self.draw_landmarks = True
+        self.inference_scale = INFERENCE_SCALE
+        self.model_complexity = MODEL_COMPLEXITY
     
-    def detect_gesture(self, frame):
+    def set_quality(self, quality):
+        """Apply a quality.Quality: overlay drawing and inference cost"""
+        self.draw_zones = quality.draw_zones
+        self.draw_landmarks = quality.draw_landmarks
+        self.inference_scale = quality.inference_scale
+        self.model_complexity = quality.model_complexity
+        if self.backend is not None:
+            self.backend.set_quality(quality.inference_scale, quality.model_complexity)
+        if self.worker is not None:
+            self.worker.configure(quality.inference_scale, quality.model_complexity)
+    
+    def set_profiler(self, profiler):
+        """
+        Time stages with another FrameProfiler. A FrameProfiler belongs to
+        one thread, so a controller built on a loader thread gets the shared
+        one only once the main thread takes it over
+        """
+        self.profiler = profiler
+        if self.backend is not None:
+            self.backend.set_profiler(profiler)
+    
+    def warm_up(self):
+        """
+        Pay one-off costs before the first real frame: MediaPipe builds its
+        graph on the first inference, and the zone overlay is cached
+        """
+        height, width = SCREEN_HEIGHT, CAMERA_WIDTH
+        if self.cap is not None:
+            width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or width
+            height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or height
+        
+        blank = np.zeros((height, width, 3), dtype=np.uint8)
+        if self.backend is not None:
+            self.backend.warm_up(blank)
+        self._draw_zones(blank)
+    
+    def read_frame(self):
+        """
+        Get the newest camera frame without waiting on the camera
+        Returns: (frame_id, capture_timestamp, frame) or None if no new frame
+        """
+        if self.stream is not None:
+            return self.stream.read_latest()
+        if self.cap is None:
+            return None
+        
+        # Synchronous fallback
+        ret, frame = self.cap.read()
+        if not ret:
+            return None
+        self._frame_id += 1
+        return self._frame_id, time.perf_counter(), frame
+    
+    def read_replay(self, limit=REPLAY_MAX_BATCH):
+        """
+        Recorded frames that have come due, oldest first and none skipped
+        Each record's "tick" is the game tick its directions were applied on
+        """
+        return self.replay.next_records(limit)
+    
+    def detect_gesture(self, frame, capture_time=None):
         """
-        Detect hand gesture and return direction
+        Detect hand gesture and return direction (the first player's)
         Returns: (direction, annotated_frame)
         """
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        directions, frame = self.detect_gestures(frame, capture_time)
+        return directions[0], frame
+    
+    def detect_gestures(self, frame, capture_time=None, annotate=True, tick=0):
+        """
+        Detect every player's hand gesture
+        annotate: draw the overlay, hands and directions onto the frame
+        tick: game tick the directions will be applied on (for recordings)
+        Returns: (list of directions, one per player, annotated_frame)
+        """
+        if capture_time is None:
+            capture_time = time.perf_counter()
         
-        # Process the frame
-        results = self.hands.process(rgb_frame)
+        if self.inference_mode == "process":
+            return self._detect_gesture_in_worker(frame, capture_time, annotate, tick)
         
-        direction = NONE
+        # Process the frame (colour conversion happens inside the backend)
+        hands = self.backend.detect(frame, capture_time)
         
-        # Draw hand landmarks and detect gesture
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                # Draw landmarks
-                self.mp_draw.draw_landmarks(
-                    frame, 
-                    hand_landmarks, 
-                    self.mp_hands.HAND_CONNECTIONS
-                )
-                
-                # Get direction from hand position
-                direction = self._get_direction_from_hand(hand_landmarks, frame.shape)
+        if self.recorder is not None:
+            self.recorder.write(capture_time, hands.landmarks, hands.labels, tick, self.latency)
         
-        # Draw direction indicator
-        self._draw_direction_indicator(frame, direction)
+        directions, hand_players = self._player_directions(hands, capture_time)
+        if self.predictors is not None:
+            self._measure_latency(capture_time)
         
-        return direction, frame
+        if annotate:
+            self._annotate(frame, hands, hand_players, directions)
+        return directions, frame
     
-    def _get_direction_from_hand(self, hand_landmarks, frame_shape):
+    def _annotate(self, frame, hands, hand_players, directions):
+        """Static overlay first, hands and text are drawn on top"""
+        if self.draw_zones:
+            with self.profiler.stage("detect.zones"):
+                self._draw_zones(frame)
+        self._draw_hands(frame, hands, hand_players)
+        self._draw_directions(frame, directions)
+    
+    def replay_gestures(self, record, annotate=True):
+        """
+        Directions from a recorded frame instead of the camera and model
+        The recorded timestamp and latency estimate stand in for measured
+        ones, so the same directions come out as while recording
+        Returns: (list of directions, one per player, annotated blank canvas or None)
+        """
+        hands = detections_from_landmarks(*record_hands(record))
+        self.latency = float(record["latency"])
+        directions, hand_players = self._player_directions(hands, float(record["timestamp"]))
+        if not annotate:
+            return directions, None
+        
+        frame = self._replay_canvas.copy()
+        self._annotate(frame, hands, hand_players, directions)
+        return directions, frame
+    
+    def _detect_gesture_in_worker(self, frame, capture_time, annotate=True, tick=0):
         """
-        Determine direction based on hand position
-        Uses the position of the hand center (wrist) relative to frame center
+        Hand the frame to the inference process and use its newest result
+        The result may lag the displayed frame by a frame or two, and until
+        a new result arrives the previous one is kept
         """
-        height, width, _ = frame_shape
+        # The ring is sized for one frame shape: a new size needs a new worker
+        if self.worker is not None and frame.shape != self.worker.frame_shape:
+            print(f"Frame size changed from {self.worker.frame_shape} to {frame.shape}, "
+                  f"restarting the inference worker")
+            self.worker.close()
+            self.worker = None
         
-        # Get wrist position (landmark 0)
-        wrist = hand_landmarks.landmark[self.mp_hands.HandLandmark.WRIST]
+        # Worker is started on the first frame, once the frame size is known
+        if self.worker is None:
+            from inference_worker import InferenceWorker
+            self.worker = InferenceWorker(frame.shape, self.players)
+            self.worker.configure(self.inference_scale, self.model_complexity)
         
-        # Convert normalized coordinates to pixel coordinates
-        wrist_x = wrist.x * width
-        wrist_y = wrist.y * height
+        with self.profiler.stage("detect.process"):
+            try:
+                self._submitted_frames += 1
+                self.worker.submit(self._submitted_frames, frame)
+                self._capture_times[self._submitted_frames] = capture_time
+                result = self.worker.poll()
+            except RuntimeError as e:
+                return self._fall_back_inline(e, frame, capture_time, annotate, tick)
         
-        # Calculate center of frame
-        center_x = width / 2
-        center_y = height / 2
+        if result is not None and result[0] != self._worker_result_id:
+            frame_id, landmarks, labels = result
+            self._worker_result_id = frame_id
+            result_time = self._pop_capture_time(frame_id)
+            
+            # Each result is recorded once, stamped with its own frame's capture time
+            if self.recorder is not None:
+                self.recorder.write(result_time, landmarks, labels, tick, self.latency)
+            
+            hands = detections_from_landmarks(landmarks, labels)
+            directions, hand_players = self._player_directions(hands, result_time)
+            if self.predictors is not None:
+                self._measure_latency(result_time)
+            self._worker_directions = directions
+            self._worker_hands = (hands, hand_players)
         
-        # Calculate relative position
-        rel_x = (wrist_x - center_x) / width
-        rel_y = (wrist_y - center_y) / height
+        if annotate:
+            self._annotate(frame, *self._worker_hands, self._worker_directions)
+        return list(self._worker_directions), frame
+    
+    def _fall_back_inline(self, error, frame, capture_time, annotate, tick):
+        """Run the model in this process after the worker died"""
+        print(f"Hand detection worker failed ({error}), running it inline instead")
+        self.worker.close()
+        self.worker = None
+        self.inference_mode = "inline"
+        self.backend = create_backend("mediapipe", self.players, self.profiler)
+        self.backend.set_quality(self.inference_scale, self.model_complexity)
+        return self.detect_gestures(frame, capture_time, annotate, tick)
+    
+    def _pop_capture_time(self, frame_id):
+        """Capture time of a submitted frame, forgetting it and any older frames"""
+        capture_time = self._capture_times.pop(frame_id, time.perf_counter())
         
-        # Determine direction based on position
-        # Prioritize horizontal movement over vertical
-        if abs(rel_x) > abs(rel_y):
-            if rel_x > self.gesture_threshold:
-                return RIGHT
-            elif rel_x < -self.gesture_threshold:
-                return LEFT
+        # Frames dropped or overtaken by this result will never report back
+        for stale in [key for key in self._capture_times if key < frame_id]:
+            del self._capture_times[stale]
+        return capture_time
+    
+    def _player_directions(self, hands, capture_time):
+        """
+        Direction for each player from the detected hands (HandDetections)
+        Returns: (directions per player, player per hand or None)
+        """
+        directions = [NONE] * self.players
+        if self.assigner is not None:
+            hand_players = self.assigner.assign(hands.positions, hands.labels)
         else:
-            if rel_y > self.gesture_threshold:
-                return DOWN
-            elif rel_y < -self.gesture_threshold:
-                return UP
+            # Single player: the last hand wins
+            hand_players = [None] * len(hands.positions)
+            if len(hands.positions):
+                hand_players[-1] = 0
         
-        return NONE
+        for hand, player in enumerate(hand_players):
+            if player is not None:
+                directions[player] = self._direction_for_position(
+                    hands.positions[hand], capture_time, player
+                )
+        
+        # A predictor must not extrapolate across a gap
+        if self.predictors is not None:
+            for player, predictor in enumerate(self.predictors):
+                if player not in hand_players:
+                    predictor.reset()
+        
+        return directions, hand_players
     
-    def _draw_direction_indicator(self, frame, direction):
+    def _direction_for_position(self, position, capture_time, player=0):
+        """
+        Direction for one hand's normalized (x, y) position, looking ahead
+        by the pipeline latency if enabled
+        """
+        rel_x, rel_y = position - 0.5
+        if self.predictors is None:
+            return direction_from_offset(rel_x, rel_y, self.gesture_threshold)
+        
+        return self.predictors[player].update(
+            rel_x, rel_y, capture_time, self.latency + PREDICTION_EXTRA_LATENCY
+        )
+    
+    def _measure_latency(self, capture_time):
+        """Smoothed delay from frame capture until its direction is known"""
+        self.latency += 0.1 * ((time.perf_counter() - capture_time) - self.latency)
+    
+    def _draw_hands(self, frame, hands, hand_players):
         """
-        Draw direction text and visual indicator on frame
+        Draw hand landmarks (or a marker for backends without them),
+        labelled with their player in multiplayer
         """
-        height, width, _ = frame.shape
+        height, width = frame.shape[:2]
+        for hand, (x, y) in enumerate(hands.positions):
+            center = (int(x * width), int(y * height))
+            if self.draw_landmarks:
+                with self.profiler.stage("detect.landmarks"):
+                    if hands.landmarks is not None:
+                        draw_landmarks(frame, hands.landmarks[hand])
+                    else:
+                        cv2.circle(frame, center, 20, (0, 255, 255), 2)
+            
+            player = hand_players[hand] if hand < len(hand_players) else None
+            if self.players > 1 and player is not None:
+                cv2.putText(frame, f"P{player + 1}", (center[0], center[1] + 30),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    
+    def _draw_directions(self, frame, directions):
+        """Direction text for one player, or a line with every player's direction"""
+        if self.players == 1:
+            self._draw_direction_indicator(frame, directions[0])
+            return
         
-        # Draw direction text
+        text = "  ".join(f"P{player + 1}: {direction}"
+                         for player, direction in enumerate(directions))
+        cv2.putText(frame, text, (10, 40),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+    
+    def _draw_direction_indicator(self, frame, direction):
+        """
+        Draw direction text (the only per-frame part of the overlay)
+        """
         if direction != NONE:
             color = (0, 255, 0)  # Green
             text = f"Direction: {direction}"
@@ -114,52 +847,95 @@ class GestureController:
         
         cv2.putText(frame, text, (10, 40), 
                     cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
+    
+    def _draw_zones(self, frame):
+        """
+        Composite the cached static overlay (zones, crosshair, zone labels)
+        The layer is rebuilt only when the frame size or threshold changes
+        """
+        height, width = frame.shape[:2]
+        key = (width, height, self.gesture_threshold)
+        if key != self._overlay_key:
+            self._build_overlay(width, height)
+            self._overlay_key = key
         
-        # Draw center crosshair
-        center_x, center_y = width // 2, height // 2
-        cv2.line(frame, (center_x - 20, center_y), (center_x + 20, center_y), (255, 255, 255), 2)
-        cv2.line(frame, (center_x, center_y - 20), (center_x, center_y + 20), (255, 255, 255), 2)
+        # The center square is outside every zone and stays unblended
+        center = self._overlay_center
+        center_pixels = frame[center].copy()
+        
+        # Blend zones: frame * (1 - alpha) + zone colours * alpha
+        alpha = self._overlay_alpha
+        cv2.addWeighted(self._overlay_tint, alpha, frame, 1 - alpha, 0, frame)
+        frame[center] = center_pixels
         
-        # Draw zone indicators
-        self._draw_zones(frame, width, height)
+        # Stamp crosshair (blended like the zones under it) and labels
+        frame[self._overlay_stamp] = self._overlay_stamp_colors
     
-    def _draw_zones(self, frame, width, height):
+    def _build_overlay(self, width, height):
         """
-        Draw colored zones to help user understand gesture areas
+        Pre-render the static overlay for the given frame geometry
         """
         zone_size = int(width * self.gesture_threshold)
         center_x, center_y = width // 2, height // 2
-        
-        # Semi-transparent overlay
-        overlay = frame.copy()
         alpha = 0.3
         
+        # Zone colours
+        tint = np.zeros((height, width, 3), dtype=np.uint8)
+        
         # Left zone (blue)
-        cv2.rectangle(overlay, (0, 0), (center_x - zone_size, height), (255, 0, 0), -1)
+        cv2.rectangle(tint, (0, 0), (center_x - zone_size, height), (255, 0, 0), -1)
         
         # Right zone (blue)
-        cv2.rectangle(overlay, (center_x + zone_size, 0), (width, height), (255, 0, 0), -1)
+        cv2.rectangle(tint, (center_x + zone_size, 0), (width, height), (255, 0, 0), -1)
         
         # Up zone (green)
-        cv2.rectangle(overlay, (0, 0), (width, center_y - zone_size), (0, 255, 0), -1)
+        cv2.rectangle(tint, (0, 0), (width, center_y - zone_size), (0, 255, 0), -1)
         
         # Down zone (green)
-        cv2.rectangle(overlay, (0, center_y + zone_size), (width, height), (0, 255, 0), -1)
-        
-        # Blend overlay with original frame
-        cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
-        
-        # Draw zone labels
-        cv2.putText(frame, "LEFT", (20, center_y), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        cv2.putText(frame, "RIGHT", (width - 100, center_y), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        cv2.putText(frame, "UP", (center_x - 20, 30), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        cv2.putText(frame, "DOWN", (center_x - 40, height - 20), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-    
-    def release(self):
-        """Release camera resources"""
-        self.cap.release()
-        self.hands.close()
\ No newline at end of file
+        cv2.rectangle(tint, (0, center_y + zone_size), (width, height), (0, 255, 0), -1)
+        
+        self._overlay_tint = tint
+        self._overlay_alpha = alpha
+        self._overlay_center = (
+            slice(max(0, center_y - zone_size + 1), max(0, center_y + zone_size)),
+            slice(max(0, center_x - zone_size + 1), max(0, center_x + zone_size))
+        )
+        
+        # The white crosshair is under the zones, so it takes their tint
+        # where it reaches into one (a small threshold or frame)
+        stamp = cv2.addWeighted(tint, alpha, np.full_like(tint, 255), 1 - alpha, 0)
+        stamp[self._overlay_center] = 255
+        crosshair = np.zeros((height, width), dtype=np.uint8)
+        cv2.line(crosshair, (center_x - 20, center_y), (center_x + 20, center_y), 255, 2)
+        cv2.line(crosshair, (center_x, center_y - 20), (center_x, center_y + 20), 255, 2)
+        
+        # Zone labels are on top, plain white
+        white = np.zeros((height, width), dtype=np.uint8)
+        cv2.putText(white, "LEFT", (20, center_y), 
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, 255, 2)
+        cv2.putText(white, "RIGHT", (width - 100, center_y), 
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, 255, 2)
+        cv2.putText(white, "UP", (center_x - 20, 30), 
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, 255, 2)
+        cv2.putText(white, "DOWN", (center_x - 40, height - 20), 
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, 255, 2)
+        stamp[white > 0] = 255
+        
+        self._overlay_stamp = np.nonzero(crosshair | white)
+        self._overlay_stamp_colors = stamp[self._overlay_stamp]
+    
+    def release(self, tick=None):
+        """
+        Release camera resources
+        tick: the game's final tick, so a replay of the recording runs to it
+        """
+        if self.stream is not None:
+            self.stream.stop(release=True)
+        elif self.cap is not None:
+            self.cap.release()
+        if self.backend is not None:
+            self.backend.close()
+        if self.worker is not None:
+            self.worker.close()
+        if self.recorder is not None:
+            self.recorder.close(tick)
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+Hand Tracker
+Runs the hand model only every few frames and follows the hand in between
+with a constant-velocity Kalman filter, corrected by sparse optical flow
+"""
+
+import cv2
+import numpy as np
+from profiler import NULL_PROFILER
+from config import *
+
+# Wrist and finger bases move rigidly with the hand and have good texture
+FLOW_LANDMARKS = (0, 5, 9, 13, 17)
+MIN_FLOW_POINTS = 3
+MAX_FLOW_ERROR = 1.0  # Forward-backward disagreement (pixels) for a point to count
+FLOW_PARAMS = dict(winSize=(21, 21), maxLevel=2)
+FLOW_SEARCH_MARGIN = 64  # Pixels around the flow points handed to LK
+
+
+class ConstantVelocityFilter:
+    """
+    Kalman filter with a position/velocity state for every coordinate.
+    All coordinates share one motion and measurement model, so a single
+    2x2 covariance serves them all and each step is a few array ops.
+    """
+
+    def __init__(self, process_noise=TRACKING_PROCESS_NOISE,
+                 measurement_noise=TRACKING_MEASUREMENT_NOISE):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.position = None
+        self.velocity = None
+        self.covariance = None
+
+    def reset(self, position):
+        """Start from a measured position with unknown velocity"""
+        self.position = np.array(position, dtype=np.float64)
+        self.velocity = np.zeros_like(self.position)
+        self.covariance = np.diag([self.measurement_noise, 1.0])
+
+    def predict(self, dt):
+        """Advance the state by dt seconds, returns the predicted position"""
+        self.position += self.velocity * dt
+
+        transition = np.array([[1.0, dt], [0.0, 1.0]])
+        noise = self.process_noise * np.array([
+            [dt ** 3 / 3, dt ** 2 / 2],
+            [dt ** 2 / 2, dt]
+        ])
+        self.covariance = transition @ self.covariance @ transition.T + noise
+        return self.position
+
+    def correct(self, measured, measurement_noise=None):
+        """Blend in a measured position, returns the corrected position"""
+        if measurement_noise is None:
+            measurement_noise = self.measurement_noise
+
+        covariance = self.covariance
+        gain = covariance[:, 0] / (covariance[0, 0] + measurement_noise)
+        innovation = measured - self.position
+        self.position += gain[0] * innovation
+        self.velocity += gain[1] * innovation
+        self.covariance = covariance - np.outer(gain, covariance[0])
+        return self.position
+
+
+class HandTracker:
+    """
+    Wraps a HandDetector. Full detection runs every `interval` frames, or
+    sooner when the last detection was low confidence, optical flow loses
+    the hand or the prediction leaves the frame. Frames in between reuse the
+    last detected hand shape, moved by the filter.
+    """
+
+    def __init__(self, detector, interval=DETECTION_INTERVAL, min_score=TRACKING_MIN_SCORE,
+                 optical_flow=TRACKING_OPTICAL_FLOW, profiler=NULL_PROFILER):
+        self.detector = detector
+        self.interval = interval
+        self.min_score = min_score
+        self.optical_flow = optical_flow
+        self.profiler = profiler
+        self.filter = ConstantVelocityFilter()
+
+        self.points = None  # Last hand landmarks (21, 3), normalized
+        self.score = 0.0
+        self.frames_since_detection = 0
+        self.last_time = None
+        self._previous_gray = None
+
+        # Statistics
+        self.detections = 0
+        self.tracked_frames = 0
+
+    @property
+    def active(self):
+        return self.points is not None
+
+    def process(self, frame, timestamp):
+        """
+        Locate the hand in a BGR frame
+        Returns: (points, detected) with points a (21, 3) array or None
+        """
+        dt = 0.0 if self.last_time is None else max(timestamp - self.last_time, 0.0)
+        self.last_time = timestamp
+
+        gray = None
+        if self.optical_flow:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        points = None
+        if self.active:
+            previous = self.filter.position.copy()
+            self.filter.predict(dt)
+            if self._should_track():
+                with self.profiler.stage("detect.track"):
+                    points = self._track(gray, previous, frame.shape)
+
+        detected = points is None
+        if detected:
+            points = self._detect(frame)
+
+        self._previous_gray = gray
+        return points, detected
+
+    def _should_track(self):
+        return self.frames_since_detection + 1 < self.interval and self.score >= self.min_score
+
+    def _track(self, gray, previous, frame_shape):
+        """Move the hand to its predicted position, None if the track was lost"""
+        predicted = self.filter.position
+        if gray is not None and self._previous_gray is not None:
+            shift = self._flow_shift(gray, previous, frame_shape)
+            if shift is None:
+                return None
+            predicted = self.filter.correct(previous + shift, TRACKING_FLOW_NOISE)
+
+        # Hand leaving the frame needs a real detection
+        wrist = predicted[0]
+        if not (0.0 <= wrist[0] <= 1.0 and 0.0 <= wrist[1] <= 1.0):
+            return None
+
+        self.points[:, :2] = predicted
+        self.frames_since_detection += 1
+        self.tracked_frames += 1
+        return self.points.copy()
+
+    def _flow_shift(self, gray, previous, frame_shape):
+        """Median hand movement between frames (normalized), None if lost"""
+        height, width = frame_shape[:2]
+        scale = np.array([width, height], dtype=np.float32)
+
+        start = (previous[list(FLOW_LANDMARKS)] * scale).astype(np.float32).reshape(-1, 1, 2)
+
+        # Only build image pyramids for the area around the hand
+        x0, y0 = np.maximum(start.min(axis=(0, 1)) - FLOW_SEARCH_MARGIN, 0).astype(int)
+        x1, y1 = (start.max(axis=(0, 1)) + FLOW_SEARCH_MARGIN).astype(int)
+        before = self._previous_gray[y0:y1, x0:x1]
+        after = gray[y0:y1, x0:x1]
+        if before.size == 0:
+            return None
+        start -= np.array([x0, y0], dtype=np.float32)
+
+        end, status, _ = cv2.calcOpticalFlowPyrLK(before, after, start, None, **FLOW_PARAMS)
+
+        # LK reports success on untextured regions too, so only keep points
+        # that flow back to where they started
+        back, back_status, _ = cv2.calcOpticalFlowPyrLK(after, before, end, None, **FLOW_PARAMS)
+        error = np.linalg.norm((back - start).reshape(-1, 2), axis=1)
+        found = (status.ravel() == 1) & (back_status.ravel() == 1) & (error < MAX_FLOW_ERROR)
+        if found.sum() < MIN_FLOW_POINTS:
+            return None
+
+        movement = (end - start).reshape(-1, 2)[found]
+        return np.median(movement, axis=0) / scale
+
+    def _detect(self, frame):
+        """Run the model and restart the track from its result"""
+        results = self.detector.process(frame)
+        self.detections += 1
+        self.frames_since_detection = 0
+
+        if not results.multi_hand_landmarks:
+            self.points = None
+            return None
+
+        was_tracking = self.active
+        hand = results.multi_hand_landmarks[0]
+        self.points = np.array([(lm.x, lm.y, lm.z) for lm in hand.landmark], dtype=np.float64)
+        points = self.points.copy()
+
+        handedness = getattr(results, "multi_handedness", None)
+        self.score = handedness[0].classification[0].score if handedness else 1.0
+
+        # Keep the velocity estimate across detections of the same hand
+        if was_tracking:
+            self.filter.correct(self.points[:, :2])
+        else:
+            self.filter.reset(self.points[:, :2])
+        return points
+
+    def reset(self):
+        """Drop the current track, the next frame runs full detection"""
+        self.points = None
+        self.last_time = None
+        self._previous_gray = None
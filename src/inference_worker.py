@@ -0,0 +1,155 @@
+"""
+Inference Worker
+Runs MediaPipe Hands in a separate process, frames are passed
+through a shared-memory ring buffer instead of being pickled
+"""
+
+import multiprocessing
+import queue
+from multiprocessing import shared_memory
+import numpy as np
+from config import *
+
+
+def _next_requests(requests):
+    """Block for one request, then take everything else already queued"""
+    batch = [requests.get()]
+    while True:
+        try:
+            batch.append(requests.get_nowait())
+        except queue.Empty:
+            return batch
+
+
+def _worker_main(shm_name, frame_shape, slots, max_hands, requests, results, create_detector=None):
+    """
+    Worker process entry point
+    Owns the hand detector and reads BGR frames from the ring by slot index.
+    Of the frames queued since the last result only the newest is run,
+    the older ones are released unseen (running them in order would make
+    every result as old as the queue is long). Sends back
+    (frame_id, landmarks, handedness labels, frames released).
+    ("configure", scale, model_complexity) requests change the detector.
+    create_detector: factory taking max_hands (default HandDetector)
+    """
+    from gesture_controller import HandDetector, handedness_labels, landmarks_to_array
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray((slots,) + tuple(frame_shape), dtype=np.uint8, buffer=shm.buf)
+    detector = (create_detector or HandDetector)(max_hands=max_hands)
+
+    # Build the MediaPipe graph before the first real frame arrives
+    detector.process(np.zeros(frame_shape, dtype=np.uint8))
+
+    try:
+        while True:
+            newest = None
+            released = 0
+            for request in _next_requests(requests):
+                if request is None:
+                    return
+                if request[0] == "configure":
+                    detector.set_quality(*request[1:])
+                    continue
+                newest = request
+                released += 1
+            if newest is None:
+                continue
+
+            slot, frame_id = newest
+            output = detector.process(ring[slot])
+
+            landmarks = landmarks_to_array(output.multi_hand_landmarks)
+            results.put((frame_id, landmarks, handedness_labels(output), released))
+    finally:
+        detector.close()
+        del ring
+        shm.close()
+
+
+class InferenceWorker:
+    """
+    Main-process handle for the inference process.
+    submit() never blocks: if every ring slot is still in flight the frame
+    is dropped, poll() returns the newest result received so far.
+    Both raise RuntimeError once the process has died.
+    """
+
+    def __init__(self, frame_shape, max_hands=1, slots=INFERENCE_RING_SLOTS, create_detector=None):
+        self.frame_shape = tuple(frame_shape)
+        self.slots = slots
+
+        # Shared ring buffer of BGR frames
+        frame_size = int(np.prod(self.frame_shape))
+        self.shm = shared_memory.SharedMemory(create=True, size=frame_size * slots)
+        self.ring = np.ndarray((slots,) + self.frame_shape, dtype=np.uint8, buffer=self.shm.buf)
+
+        # Only slot indices and small results cross the queues
+        ctx = multiprocessing.get_context("spawn")
+        self.requests = ctx.Queue()
+        self.results = ctx.Queue()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(self.shm.name, self.frame_shape, slots, max_hands, self.requests, self.results,
+                  create_detector),
+            name="InferenceWorker",
+            daemon=True
+        )
+        self.process.start()
+
+        self._next_slot = 0
+        self._in_flight = 0
+        self.latest = None
+        self.dropped_frames = 0
+
+    def submit(self, frame_id, frame):
+        """Copy a frame into the ring and queue it, returns False if dropped"""
+        self._check_alive()
+        if self._in_flight >= self.slots or frame.shape != self.frame_shape:
+            self.dropped_frames += 1
+            return False
+
+        # Slots are released in order, so the next one is always free here
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % self.slots
+        np.copyto(self.ring[slot], frame)
+
+        self.requests.put((slot, frame_id))
+        self._in_flight += 1
+        return True
+
+    def poll(self):
+        """
+        Collect finished results without blocking
+        Returns: newest (frame_id, landmarks, handedness labels) or None
+        """
+        while True:
+            try:
+                frame_id, landmarks, labels, released = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self._in_flight -= released
+            self.latest = (frame_id, landmarks, labels)
+
+        self._check_alive()
+        return self.latest
+
+    def _check_alive(self):
+        # A dead worker (failed model start, crash) would otherwise hold every slot forever
+        if not self.process.is_alive():
+            raise RuntimeError(f"inference worker exited with code {self.process.exitcode}")
+
+    def configure(self, scale, model_complexity):
+        """Change the detector's search scale and model, applied before the next frame"""
+        self.requests.put(("configure", scale, model_complexity))
+
+    def close(self):
+        """Stop the worker process and free the shared memory"""
+        self.requests.put(None)
+        self.process.join(timeout=2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+
+        del self.ring
+        self.shm.close()
+        self.shm.unlink()
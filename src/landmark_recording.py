@@ -0,0 +1,147 @@
+"""
+Landmark Recording
+Compact binary recording of per-frame hand landmarks, and a replay
+source that feeds them back without a camera or MediaPipe
+
+File layout: 24-byte header (magic, version, record size, game seed,
+players) followed by fixed-size little-endian records, so files can be memory-mapped.
+Every record carries the game tick its directions were applied on, so a
+replay can drive the game tick by tick and end up in the recorded game,
+and every detected hand (up to MAX_HANDS) with its handedness label.
+"""
+
+import struct
+import time
+import numpy as np
+from config import *
+
+MAGIC = b"HSLM"
+VERSION = 3
+HEADER = struct.Struct("<4sHHqB7x")
+NUM_LANDMARKS = 21
+MAX_HANDS = 2  # One per player
+LABELS = (None, "Left", "Right")  # Handedness codes in the "labels" column
+
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("tick", "<u4"),      # Game tick the frame's directions were applied on
+    ("latency", "<f4"),   # Pipeline latency estimate the direction predictor used
+    ("hands", "u1"),      # Hands detected, the first ones in "landmarks" and "labels" are set
+    ("labels", "u1", (MAX_HANDS,)),
+    ("landmarks", "<f4", (MAX_HANDS, NUM_LANDMARKS, 3)),
+])
+
+
+class LandmarkRecorder:
+    """Appends one record per processed frame"""
+
+    def __init__(self, path, seed=0, players=1):
+        self.path = path
+        self.seed = seed
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize, seed, players))
+        self._record = np.zeros(1, dtype=RECORD_DTYPE)
+        self.count = 0
+
+    def write(self, timestamp, landmarks=None, labels=None, tick=0, latency=0.0):
+        """
+        Record one frame
+        landmarks: (hands, 21, 3) normalized landmarks, None or empty if no hand
+        labels: handedness label per hand, or None if unknown
+        tick: game tick the frame's directions are applied on
+        latency: latency estimate used to predict directions
+        """
+        hands = 0 if landmarks is None else min(len(landmarks), MAX_HANDS)
+        record = self._record[0]
+        record["timestamp"] = timestamp
+        record["tick"] = tick
+        record["latency"] = latency
+        record["hands"] = hands
+        record["labels"] = 0
+        record["landmarks"] = 0
+        if hands:
+            record["landmarks"][:hands] = landmarks[:hands]
+            if labels is not None:
+                record["labels"][:hands] = [LABELS.index(label) for label in labels[:hands]]
+
+        self.file.write(self._record.tobytes())
+        self.count += 1
+
+    def close(self, tick=None):
+        """
+        tick: the game's final tick, recorded as a last frame without hands
+        so a replay runs on past the last detection
+        """
+        if tick is not None and self.count:
+            self.write(float(self._record[0]["timestamp"]), tick=tick, latency=float(self._record[0]["latency"]))
+        self.file.close()
+
+
+def record_hands(record):
+    """(landmarks (hands, 21, 3), labels or None) of a recorded frame"""
+    hands = int(record["hands"])
+    codes = record["labels"][:hands]
+    labels = [LABELS[code] for code in codes] if codes.all() else None
+    return record["landmarks"][:hands], labels
+
+
+def read_header(path):
+    """(seed, players) of the game a recording was made in"""
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is not a landmark recording")
+    magic, version, record_size, seed, players = HEADER.unpack(header)
+
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a landmark recording")
+    if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"Unsupported recording version {version} in {path}")
+    return seed, players
+
+
+def load_recording(path):
+    """Memory-map a recording, returns a structured array of RECORD_DTYPE"""
+    read_header(path)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size)
+
+
+class LandmarkReplay:
+    """
+    Plays a recording back at `speed` times real time (0 = as fast as
+    records are requested). next_records() never waits and never skips a
+    record: it returns the records that have come due, in order.
+    """
+
+    def __init__(self, path, speed=REPLAY_SPEED, clock=time.perf_counter):
+        self.seed, self.players = read_header(path)
+        self.records = load_recording(path)
+        self.speed = speed
+        self.clock = clock
+        self.index = 0
+        self.start_time = None
+
+    @property
+    def finished(self):
+        return self.index >= len(self.records)
+
+    def next_records(self, limit=REPLAY_MAX_BATCH):
+        """Records due since the last call, oldest first, at most `limit`"""
+        if self.finished:
+            return self.records[:0]
+
+        # Maximum speed: every remaining record is due
+        due = len(self.records)
+        if self.speed != 0:
+            now = self.clock()
+            if self.start_time is None:
+                self.start_time = now
+
+            # Every record whose scaled time has passed
+            elapsed = (now - self.start_time) * self.speed
+            first = self.records["timestamp"][0]
+            due = int(np.searchsorted(self.records["timestamp"], first + elapsed, side="right"))
+
+        start = self.index
+        self.index = max(min(due, start + limit), start)
+        return self.records[start:self.index]
@@ -3,74 +3,351 @@ HandSnake - Main Application
 Control Snake game with hand gestures
 """
 
-import cv2
+import os
+import time
+STARTED = time.perf_counter()
+
+import argparse
+import random
 import pygame
 import numpy as np
 from snake_game import SnakeGame
-from gesture_controller import GestureController
+from text_cache import text_cache
+from scheduler import FixedStepScheduler, RateLimiter
+from profiler import FrameProfiler, NULL_PROFILER
+from startup import StartupTimer, BackgroundLoader
+from spectator import SpectatorServer
+from snapshot import RewindHistory
+from quality import QualityGovernor
+from landmark_recording import read_header
 from config import *
 
+# OpenCV and MediaPipe are imported by the gesture loader, off the main thread
+cv2 = None
+
+
+def load_gesture_controller(timer, **options):
+    """
+    Import the vision stack, open the camera and warm up the hand model
+    Runs on the gesture loader thread
+    """
+    global cv2
+    with timer.phase("import cv2"):
+        import cv2
+    with timer.phase("import gesture_controller"):
+        from gesture_controller import GestureController
+    
+    controller = GestureController(timer=timer, **options)
+    with timer.phase("model warm-up"):
+        controller.warm_up()
+    return controller
+
+
+MANUAL_KEYS = {
+    pygame.K_UP: (0, UP),
+    pygame.K_DOWN: (0, DOWN),
+    pygame.K_LEFT: (0, LEFT),
+    pygame.K_RIGHT: (0, RIGHT),
+    pygame.K_w: (1, UP),
+    pygame.K_s: (1, DOWN),
+    pygame.K_a: (1, LEFT),
+    pygame.K_d: (1, RIGHT),
+}
+
 
 class HandSnake:
-    def __init__(self):
+    def __init__(self, source=CAMERA_INDEX, replay_path=None, record_path=None, replay_speed=REPLAY_SPEED,
+                 players=PLAYERS, spectators=SPECTATOR_SERVER, resume=False, backend=GESTURE_BACKEND,
+                 world=(WORLD_COLUMNS, WORLD_ROWS)):
+        self.startup_timer = StartupTimer(start=STARTED)
+        self.startup_timer.mark("imports done")
+        
+        # Per-stage frame timings (F3 shows the HUD)
+        # (whole-session history only when it is going to be exported)
+        self.profiler = NULL_PROFILER
+        if PROFILER_ENABLED:
+            self.profiler = FrameProfiler(history=PROFILE_HISTORY if PROFILE_EXPORT_PATH else 0)
+        self.show_profiler = False
+        self.profiler_surface = None
+        
+        # Recordings store the game seed, a replay plays the same game again
+        seed = None
+        if replay_path:
+            seed, recorded_players = read_header(replay_path)
+            if recorded_players != players:
+                print(f"{replay_path} is a {recorded_players}-player recording, "
+                      f"replaying it with --players {recorded_players}")
+                players = recorded_players
+        elif record_path:
+            seed = random.getrandbits(63)
+        if resume and seed is not None:
+            print("--resume is ignored when recording or replaying")
+            resume = False
+        self.replaying = bool(replay_path)
+        self.replay_speed = replay_speed
+        
+        # Camera and hand model load in the background while the window is up
+        # (without the profiler, which only the main thread may touch)
+        options = dict(
+            source=source, replay_path=replay_path, replay_speed=replay_speed,
+            record_path=record_path, seed=seed or 0, players=players, backend=backend
+        )
+        self.gesture_controller = None
+        self.gesture_loader = BackgroundLoader(
+            lambda: load_gesture_controller(self.startup_timer, **options)
+        )
+        if BACKGROUND_WARM_UP:
+            self.gesture_loader.start()
+        
         # Initialize Pygame
-        pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("HandSnake - Control Snake with Hand Gestures")
+        with self.startup_timer.phase("window"):
+            pygame.init()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("HandSnake - Control Snake with Hand Gestures")
         
-        # Initialize game and gesture controller
-        self.snake_game = SnakeGame(GAME_WIDTH, SCREEN_HEIGHT)
-        self.gesture_controller = GestureController()
+        # Initialize game (boards larger than the game area scroll)
+        self.board_size = board_size(*world)
+        with self.startup_timer.phase("game"):
+            self.snake_game = SnakeGame(*self.board_size, seed=seed, players=players,
+                                        view_size=(GAME_WIDTH, SCREEN_HEIGHT))
+        
+        # Recent ticks for rewinding, and the autosave to resume from
+        self.autosave_path = os.path.expanduser(AUTOSAVE_PATH) if AUTOSAVE_PATH else None
+        self.rewind = RewindHistory()
+        if resume:
+            self.resume_game(players)
+        self.rewind.record(self.snake_game)
+        
+        # Live game state for spectator viewers (the server process starts
+        # in the background, the first keyframe waits in its queue)
+        self.spectator_server = None
+        if spectators:
+            with self.startup_timer.phase("spectators"):
+                self.spectator_server = SpectatorServer().start(wait=False)
+            self.publish_spectators(keyframe=True)
+            print(f"Spectators can watch on port {self.spectator_server.port}")
+        
+        if not BACKGROUND_WARM_UP:
+            self.gesture_loader.start().join()
+            self.check_gesture_loader()
         
         # Game state
         self.running = True
         self.paused = False
         self.clock = pygame.time.Clock()
-        self.current_direction = None
+        self.players = players
+        self.current_directions = [None] * players
+        self.has_camera_frame = False
+        self.replay_finished = False
+        self.camera_updated = False
+        self.screen_drawn = False
+        self.first_frame_shown = False
+        
+        # Persistent camera surface that shares memory with a BGR buffer,
+        # frames are resized straight into the buffer (no per-frame surfaces)
+        self.camera_buffer = np.zeros((SCREEN_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
+        self.camera_surface = pygame.image.frombuffer(
+            self.camera_buffer, (CAMERA_WIDTH, SCREEN_HEIGHT), "BGR"
+        )
+        
+        # Game ticks run on a fixed timestep, gesture inference at its own rate
+        self.scheduler = FixedStepScheduler(SNAKE_SPEED)
+        self.gesture_limiter = RateLimiter(GESTURE_RATE)
+        
+        # Cheaper overlays and inference while frames miss the target rate
+        self.governor = QualityGovernor() if ADAPTIVE_QUALITY else None
+        self.camera_frames = 0
+        
+    def check_gesture_loader(self):
+        """Adopt the gesture controller once the background loader finishes"""
+        if self.gesture_controller is not None or not self.gesture_loader.done:
+            return
+        
+        if self.gesture_loader.error is not None:
+            print(f"Hand tracking unavailable: {self.gesture_loader.error}")
+            print("Use the arrow keys to play")
+            self.gesture_loader.error = None
+        elif self.gesture_loader.result is not None:
+            self.gesture_controller = self.gesture_loader.result
+            self.gesture_loader.result = None
+            self.gesture_controller.set_profiler(self.profiler)
+            if self.governor is not None and self.governor.level:
+                self.gesture_controller.set_quality(self.governor.quality)
+            self.startup_timer.mark("gestures ready")
+            print(self.startup_timer.report())
+        
+        # Replace the warming-up message
+        self.screen_drawn = False
+    
+    def resume_game(self, players):
+        """Continue the autosaved game, if there is a matching one"""
+        if not self.autosave_path or not os.path.exists(self.autosave_path):
+            print("No autosaved game to resume")
+            return
+        
+        game = SnakeGame(*self.board_size, players=players, view_size=(GAME_WIDTH, SCREEN_HEIGHT))
+        try:
+            rewind = RewindHistory.load(self.autosave_path, game)
+        except (OSError, ValueError) as e:
+            print(f"Could not resume the autosaved game: {e}")
+            return
+        if game.players != players or (game.width, game.height) != self.board_size:
+            print(f"The autosaved game is a {game.players}-player game on a "
+                  f"{game.width // SNAKE_SIZE}x{game.height // SNAKE_SIZE} cell board, start with "
+                  f"--players {game.players} --world {game.width // SNAKE_SIZE}x{game.height // SNAKE_SIZE} "
+                  f"to resume it")
+            return
         
-        # Frame counter for game update speed
-        self.frame_count = 0
-        self.update_frequency = FPS // SNAKE_SPEED
+        self.snake_game = game
+        self.rewind = rewind
+        print(f"Resumed the autosaved game at tick {game.tick}")
+    
+    def autosave(self):
+        """Save the game and its rewind history for --resume"""
+        if self.autosave_path is None:
+            return
+        try:
+            self.rewind.save(self.autosave_path, self.snake_game)
+        except OSError as e:
+            print(f"Autosave disabled: {e}")
+            self.autosave_path = None
+    
+    def step(self):
+        """Run one game tick with the current directions"""
+        self.snake_game.update(*self.current_directions)
+        self.rewind.record(self.snake_game)
+        self.publish_spectators()
+        if self.snake_game.tick % AUTOSAVE_TICKS == 0:
+            self.autosave()
+    
+    def restart(self):
+        """Start a new game (the random sequence carries on)"""
+        self.snake_game.reset()
+        self.current_directions = [None] * self.players
+        self.rewind.record(self.snake_game, restart=True)
+        self.publish_spectators(keyframe=True)
+    
+    def seek(self, tick):
+        """Rewind (or redo) to a recorded tick"""
+        if not self.rewind.seek(self.snake_game, tick):
+            return
+        self.current_directions = [None] * self.players
+        self.publish_spectators(keyframe=True)
+    
+    def update_quality(self, frame_ms):
+        """Feed a frame's work time to the governor and apply level changes"""
+        if self.governor is None or not self.governor.update(frame_ms):
+            return
         
+        print(f"{self.governor.describe()} (frames took {self.governor.last_average:.1f} ms, "
+              f"budget {self.governor.budget:.1f} ms)")
+        if self.gesture_controller is not None:
+            self.gesture_controller.set_quality(self.governor.quality)
+        self.screen_drawn = False
+    
+    def publish_spectators(self, keyframe=False):
+        """Stream the game state to spectators, if enabled"""
+        if self.spectator_server is None:
+            return
+        try:
+            self.spectator_server.publish(self.snake_game, keyframe)
+        except OSError as e:
+            print(f"Spectator server unavailable: {e}")
+            self.spectator_server = None
+    
     def process_camera(self):
         """Process camera feed and detect gestures"""
-        ret, frame = self.gesture_controller.cap.read()
-        if not ret:
+        if self.gesture_controller is None:
             return None
+        
+        with self.profiler.stage("cap.read"):
+            captured = self.gesture_controller.read_frame()
+        if captured is None:
+            # No new frame yet, keep showing the previous one
+            return self.camera_buffer if self.has_camera_frame else None
+        frame_id, capture_time, frame = captured
             
         # Flip frame horizontally for mirror effect
-        frame = cv2.flip(frame, 1)
+        with self.profiler.stage("flip"):
+            frame = cv2.flip(frame, 1)
+        
+        # Every frame steers, at low quality only some are shown
+        self.camera_frames += 1
+        preview = self.governor is None or self.camera_frames % self.governor.quality.preview_interval == 0
         
         # Detect gesture
-        direction, annotated_frame = self.gesture_controller.detect_gesture(frame)
+        with self.profiler.stage("detect_gesture"):
+            directions, annotated_frame = self.gesture_controller.detect_gestures(
+                frame, capture_time, annotate=preview, tick=self.snake_game.tick
+            )
+        self.apply_directions(directions)
         
-        if direction != NONE:
-            self.current_direction = direction
+        if not preview and self.has_camera_frame:
+            return self.camera_buffer
+        
+        self.show_camera_frame(annotated_frame)
+        return self.camera_buffer
+    
+    def process_replay(self):
+        """
+        Feed the recorded frames that are due, running the game up to the
+        tick each one was recorded on. Ticks follow the recording instead of
+        the fixed-step scheduler, so the replay ends up in the recorded game
+        """
+        controller = self.gesture_controller
+        if controller is None or self.paused:
+            return self.camera_buffer if self.has_camera_frame else None
         
-        # Resize frame to fit half screen
-        annotated_frame = cv2.resize(annotated_frame, (CAMERA_WIDTH, SCREEN_HEIGHT))
+        records = controller.read_replay()
+        for i, record in enumerate(records):
+            # Ticks only go back when the recorded game was restarted
+            tick = int(record["tick"])
+            if tick < self.snake_game.tick:
+                self.restart()
+            with self.profiler.stage("snake_game.update"):
+                while self.snake_game.tick < tick and not self.snake_game.game_over:
+                    self.step()
+            
+            # Only the newest frame is shown
+            with self.profiler.stage("detect_gesture"):
+                directions, annotated_frame = controller.replay_gestures(record, annotate=i == len(records) - 1)
+            self.apply_directions(directions)
+            if annotated_frame is not None:
+                self.show_camera_frame(annotated_frame)
         
-        return annotated_frame
+        if controller.replay.finished and not self.replay_finished:
+            print(f"Replay finished at tick {self.snake_game.tick}")
+            self.replay_finished = True
+        return self.camera_buffer if self.has_camera_frame else None
+    
+    def apply_directions(self, directions):
+        """Detected directions steer, NONE keeps a player's last direction"""
+        for player, direction in enumerate(directions):
+            if direction != NONE:
+                self.current_directions[player] = direction
+    
+    def show_camera_frame(self, annotated_frame):
+        """Resize a frame into the display buffer"""
+        with self.profiler.stage("resize"):
+            if annotated_frame.shape == self.camera_buffer.shape:
+                np.copyto(self.camera_buffer, annotated_frame)
+            else:
+                cv2.resize(annotated_frame, (CAMERA_WIDTH, SCREEN_HEIGHT), dst=self.camera_buffer)
+        self.has_camera_frame = True
+        self.camera_updated = True
     
     def draw_camera_feed(self, frame):
         """Draw camera feed on left side of screen"""
         if frame is not None:
-            # Convert BGR to RGB
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Rotate frame for Pygame (OpenCV uses different coordinate system)
-            frame_rgb = np.rot90(frame_rgb)
-            frame_rgb = np.flipud(frame_rgb)
-            
-            # Convert to Pygame surface
-            frame_surface = pygame.surfarray.make_surface(frame_rgb)
-            
-            # Draw on screen (left side)
-            self.screen.blit(frame_surface, (0, 0))
+            # The surface reads the BGR buffer directly, SDL converts
+            # the pixel format while blitting (no copies or transposes)
+            self.screen.blit(self.camera_surface, (0, 0))
+        elif not self.gesture_loader.done:
+            text = text_cache.render("Warming up camera...", 36, YELLOW)
+            self.screen.blit(text, text.get_rect(center=(CAMERA_WIDTH // 2, SCREEN_HEIGHT // 3)))
     
     def draw_instructions(self):
         """Draw instructions overlay"""
-        font = pygame.font.Font(None, 24)
         instructions = [
             "Move your hand to control the snake:",
             "LEFT - Move hand to left",
@@ -80,16 +357,20 @@ class HandSnake:
             "",
             "Press P - Pause/Resume",
             "Press R - Restart Game",
+            "Press U - Undo (, and . step when paused)",
             "Press ESC - Quit"
         ]
         
-        y_offset = SCREEN_HEIGHT - 220
+        y_offset = SCREEN_HEIGHT - 5 - 25 * len(instructions)
         for i, instruction in enumerate(instructions):
-            text = font.render(instruction, True, WHITE)
             # Draw text with shadow for better visibility
-            shadow = font.render(instruction, True, BLACK)
-            self.screen.blit(shadow, (12, y_offset + i * 25 + 2))
+            text = text_cache.render_shadowed(instruction, 24, WHITE)
             self.screen.blit(text, (10, y_offset + i * 25))
+        
+        # Reduced quality level, if any
+        if self.governor is not None and self.governor.level:
+            text = text_cache.render_shadowed(self.governor.describe(), 24, YELLOW)
+            self.screen.blit(text, text.get_rect(topright=(CAMERA_WIDTH - 10, 10)))
     
     def draw_separator(self):
         """Draw vertical line separating camera and game"""
@@ -110,22 +391,120 @@ class HandSnake:
                 
                 # Restart game
                 elif event.key == pygame.K_r:
-                    self.snake_game.reset()
-                    self.current_direction = None
+                    self.restart()
                 
                 # Pause game
                 elif event.key == pygame.K_p:
                     self.paused = not self.paused
                 
-                # Manual controls (for testing)
-                elif event.key == pygame.K_UP:
-                    self.current_direction = UP
-                elif event.key == pygame.K_DOWN:
-                    self.current_direction = DOWN
-                elif event.key == pygame.K_LEFT:
-                    self.current_direction = LEFT
-                elif event.key == pygame.K_RIGHT:
-                    self.current_direction = RIGHT
+                # Undo the last moments (e.g. a crash), paused to get ready again
+                elif event.key == pygame.K_u:
+                    self.seek(max(self.rewind.first_tick, self.snake_game.tick - REWIND_UNDO_TICKS))
+                    self.paused = True
+                
+                # Step through the history while paused
+                elif event.key == pygame.K_COMMA and self.paused:
+                    self.seek(self.snake_game.tick - 1)
+                elif event.key == pygame.K_PERIOD and self.paused:
+                    self.seek(self.snake_game.tick + 1)
+                
+                # Toggle frame-time HUD
+                elif event.key == pygame.K_F3 and PROFILER_ENABLED:
+                    self.show_profiler = not self.show_profiler
+                    self.screen_drawn = False
+                
+                # Manual controls (for testing): arrows for player 1, WASD for player 2
+                elif event.key in MANUAL_KEYS:
+                    player, direction = MANUAL_KEYS[event.key]
+                    if player < self.players:
+                        self.current_directions[player] = direction
+    
+    def draw_everything(self, camera_frame):
+        """Redraw the whole screen and flip"""
+        self.screen.fill(BLACK)
+        
+        # Draw camera feed (left side)
+        with self.profiler.stage("draw_camera_feed"):
+            self.draw_camera_feed(camera_frame)
+        
+        # Draw separator
+        self.draw_separator()
+        
+        # Draw game (right side)
+        with self.profiler.stage("snake_game.draw"):
+            self.snake_game.draw(self.screen, offset_x=CAMERA_WIDTH)
+        
+        # Draw instructions
+        with self.profiler.stage("draw_instructions"):
+            self.draw_instructions()
+        
+        # Draw frame-time HUD
+        if self.show_profiler:
+            self.draw_profiler_hud()
+        
+        # Draw pause indicator
+        if self.paused:
+            pause_text = text_cache.render("PAUSED", 72, YELLOW)
+            text_rect = pause_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+            self.screen.blit(pause_text, text_rect)
+            
+            # Pause text spans both halves, repaint everything after resuming
+            self.snake_game.full_redraw = True
+        
+        # Update display
+        with self.profiler.stage("display.flip"):
+            pygame.display.flip()
+        self.screen_drawn = not self.paused
+        self.camera_updated = False
+    
+    def draw_changed(self, camera_frame):
+        """Redraw only changed areas and push just those rectangles"""
+        if not self.screen_drawn:
+            self.draw_everything(camera_frame)
+            return
+        
+        rects = []
+        
+        # Camera side (feed, separator, instructions) when a new frame arrived
+        if self.camera_updated:
+            with self.profiler.stage("draw_camera_feed"):
+                self.draw_camera_feed(camera_frame)
+            self.draw_separator()
+            with self.profiler.stage("draw_instructions"):
+                self.draw_instructions()
+            rects.append(pygame.Rect(0, 0, CAMERA_WIDTH + 2, SCREEN_HEIGHT))
+            self.camera_updated = False
+        
+        # Game side: changed cells and HUD only
+        with self.profiler.stage("snake_game.draw"):
+            rects.extend(self.snake_game.draw_dirty(self.screen, offset_x=CAMERA_WIDTH))
+        
+        # Frame-time HUD (opaque, so redrawing it every frame is safe)
+        if self.show_profiler:
+            rects.append(self.draw_profiler_hud())
+        
+        if rects:
+            with self.profiler.stage("display.flip"):
+                pygame.display.update(rects)
+    
+    def draw_profiler_hud(self):
+        """Draw per-stage p50/p95/p99 frame times, returns the HUD rect"""
+        # Re-render the table only every few frames
+        if self.profiler_surface is None or self.profiler.frame_index % PROFILE_HUD_REFRESH == 0:
+            font = text_cache.font(18)
+            rows = [("stage (ms)", "p50", "p95", "p99")]
+            for name, (p50, p95, p99) in self.profiler.summary().items():
+                rows.append((name, f"{p50:.2f}", f"{p95:.2f}", f"{p99:.2f}"))
+            
+            columns = (0, 150, 200, 250)
+            self.profiler_surface = pygame.Surface((300, len(rows) * 16 + 8))
+            self.profiler_surface.fill((20, 20, 20))
+            for i, row in enumerate(rows):
+                for x, value in zip(columns, row):
+                    text = font.render(value, True, YELLOW if i == 0 else WHITE)
+                    self.profiler_surface.blit(text, (x + 4, i * 16 + 4))
+        
+        return self.screen.blit(self.profiler_surface, (10, 60))
     
     def run(self):
         """Main game loop"""
@@ -134,61 +513,130 @@ class HandSnake:
         print("Press ESC to quit")
         
         while self.running:
+            frame_start = time.perf_counter()
+            
             # Handle events
             self.handle_events()
+            self.check_gesture_loader()
             
-            # Process camera feed
-            camera_frame = self.process_camera()
-            
-            # Update game (at controlled speed)
-            if not self.paused and not self.snake_game.game_over:
-                self.frame_count += 1
-                if self.frame_count >= self.update_frequency:
-                    self.snake_game.update(self.current_direction)
-                    self.frame_count = 0
+            # A replay runs the game up to its recorded ticks itself
+            if self.replaying:
+                camera_frame = self.process_replay()
+            else:
+                # Process camera feed (at the gesture rate)
+                if self.gesture_limiter.ready():
+                    camera_frame = self.process_camera()
+                else:
+                    camera_frame = self.camera_buffer if self.has_camera_frame else None
+                
+                # Update game (fixed timestep, independent of the frame rate)
+                if not self.paused and not self.snake_game.game_over:
+                    with self.profiler.stage("snake_game.update"):
+                        for _ in range(self.scheduler.advance()):
+                            self.step()
+                else:
+                    self.scheduler.reset()
             
             # Draw everything
-            self.screen.fill(BLACK)
+            if DIRTY_RECT_RENDERING and not self.paused:
+                self.draw_changed(camera_frame)
+            else:
+                self.draw_everything(camera_frame)
             
-            # Draw camera feed (left side)
-            self.draw_camera_feed(camera_frame)
+            # Quality follows the work time, not the frame cap's sleep
+            self.update_quality((time.perf_counter() - frame_start) * 1000.0)
             
-            # Draw separator
-            self.draw_separator()
+            # Control frame rate (rendering is not tied to the tick rate,
+            # a maximum-speed replay isn't held back by the cap)
+            self.clock.tick(0 if self.replaying and self.replay_speed == 0 else RENDER_FPS)
+            self.profiler.end_frame()
             
-            # Draw game (right side)
-            self.snake_game.draw(self.screen, offset_x=CAMERA_WIDTH)
-            
-            # Draw instructions
-            self.draw_instructions()
-            
-            # Draw pause indicator
-            if self.paused:
-                font = pygame.font.Font(None, 72)
-                pause_text = font.render("PAUSED", True, YELLOW)
-                text_rect = pause_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-                self.screen.blit(pause_text, text_rect)
-            
-            # Update display
-            pygame.display.flip()
-            
-            # Control frame rate
-            self.clock.tick(FPS)
+            if not self.first_frame_shown:
+                self.startup_timer.mark("first frame")
+                self.first_frame_shown = True
         
         # Cleanup
         self.cleanup()
     
     def cleanup(self):
         """Clean up resources"""
-        self.gesture_controller.release()
+        print(f"Game ticks: {self.scheduler.ticks}, "
+              f"late: {self.scheduler.late_ticks}, missed: {self.scheduler.missed_ticks}")
+        
+        self.autosave()
+        
+        # A controller still loading is released once it is ready, unless
+        # loading hangs (the loader is a daemon thread, exiting ends it)
+        if self.gesture_controller is None and not self.gesture_loader.join(WARM_UP_EXIT_TIMEOUT):
+            print("Hand tracking still loading, quitting without waiting for it")
+        controller = self.gesture_controller or self.gesture_loader.result
+        if controller is not None:
+            controller.release(self.snake_game.tick)
+        if self.spectator_server is not None:
+            self.spectator_server.stop()
+        if PROFILER_ENABLED and PROFILE_EXPORT_PATH:
+            self.profiler.export(PROFILE_EXPORT_PATH)
+            print(f"Frame timings written to {PROFILE_EXPORT_PATH}")
         pygame.quit()
         print("HandSnake closed. Thanks for playing!")
 
 
+def board_size(columns=0, rows=0):
+    """Board size in pixels for a world in cells, 0 = fit the game area"""
+    return (columns * SNAKE_SIZE if columns else GAME_WIDTH,
+            rows * SNAKE_SIZE if rows else SCREEN_HEIGHT)
+
+
+def parse_world(value):
+    """argparse type for --world COLUMNSxROWS"""
+    try:
+        columns, rows = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected COLUMNSxROWS, e.g. 2000x2000, not {value!r}")
+    if columns < 2 or rows < 2:
+        raise argparse.ArgumentTypeError("a board needs at least 2x2 cells")
+    return columns, rows
+
+
+def parse_args():
+    """Command line options (defaults come from config.py)"""
+    parser = argparse.ArgumentParser(description="Control Snake with hand gestures")
+    parser.add_argument("--video", default=VIDEO_SOURCE,
+                        help="Video file to use instead of the camera")
+    parser.add_argument("--record", default=RECORD_LANDMARKS_PATH,
+                        help="Record detected hand landmarks to this file")
+    parser.add_argument("--replay", default=REPLAY_LANDMARKS_PATH,
+                        help="Replay a landmark recording (no camera or MediaPipe model)")
+    parser.add_argument("--replay-speed", type=float, default=REPLAY_SPEED,
+                        help="Replay speed multiplier, 0 = as fast as possible")
+    parser.add_argument("--players", type=int, choices=(1, 2), default=PLAYERS,
+                        help="Number of players, one hand each")
+    parser.add_argument("--spectators", action="store_true", default=SPECTATOR_SERVER,
+                        help="Stream the game to spectator viewers (spectator_viewer.py)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the autosaved game")
+    parser.add_argument("--backend", choices=("mediapipe", "blob"), default=GESTURE_BACKEND,
+                        help="Hand finder: MediaPipe landmarks or a cheap skin-colour blob tracker")
+    parser.add_argument("--world", type=parse_world, default=(WORLD_COLUMNS, WORLD_ROWS), metavar="COLUMNSxROWS",
+                        help="Board size in cells, larger than the screen scrolls (default: fit the screen)")
+    return parser.parse_args()
+
+
 def main():
     """Entry point"""
+    args = parse_args()
     try:
-        game = HandSnake()
+        game = HandSnake(
+            source=args.video if args.video else CAMERA_INDEX,
+            replay_path=args.replay,
+            record_path=args.record,
+            replay_speed=args.replay_speed,
+            players=args.players,
+            spectators=args.spectators,
+            resume=args.resume,
+            backend=args.backend,
+            world=args.world
+        )
         game.run()
     except KeyboardInterrupt:
         print("\nGame interrupted by user")
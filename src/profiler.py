@@ -0,0 +1,155 @@
+"""
+Frame Profiler
+Per-stage frame timings with rolling percentiles and CSV/JSON export
+"""
+
+import contextlib
+import csv
+import json
+import time
+import numpy as np
+from config import *
+
+
+class _Stage:
+    """Reusable timing context for one stage name"""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+
+class FrameProfiler:
+    """
+    Collects per-stage times (ms) for each frame.
+    The last `window` samples of every stage are kept in a ring buffer for
+    percentiles, and up to `history` complete frames are kept for export
+    (history=0 keeps none). History is one float32 ring per stage, about
+    4 bytes per stage and frame, NaN where a frame didn't run the stage.
+    """
+
+    def __init__(self, window=PROFILE_WINDOW, history=PROFILE_HISTORY):
+        self.window = window
+        self.history = history
+        self.stage_names = []
+        self._stages = {}
+        self._rings = {}
+        self._counts = {}
+        self._history = {}
+        self._current = {}
+        self.frame_index = 0
+        self._frame_start = time.perf_counter()
+
+    def stage(self, name):
+        """Context manager timing one stage of the current frame"""
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = _Stage(self, name)
+            self._stages[name] = stage
+        return stage
+
+    def record(self, name, ms):
+        """Add time to a stage of the current frame"""
+        self._current[name] = self._current.get(name, 0.0) + ms
+
+    def end_frame(self):
+        """Close the current frame and push its timings into the rings"""
+        # Whole-frame time, including anything not wrapped in a stage
+        now = time.perf_counter()
+        self._current["frame"] = (now - self._frame_start) * 1000.0
+        self._frame_start = now
+
+        for name, ms in self._current.items():
+            ring = self._rings.get(name)
+            if ring is None:
+                ring = np.zeros(self.window, dtype=np.float32)
+                self._rings[name] = ring
+                self._counts[name] = 0
+                self.stage_names.append(name)
+
+            ring[self._counts[name] % self.window] = ms
+            self._counts[name] += 1
+
+        if self.history:
+            slot = self.frame_index % self.history
+            for name, ms in self._current.items():
+                history = self._history.get(name)
+                if history is None:
+                    history = self._history[name] = np.full(self.history, np.nan, dtype=np.float32)
+                history[slot] = ms
+            for name, history in self._history.items():
+                if name not in self._current:
+                    history[slot] = np.nan
+
+        self._current = {}
+        self.frame_index += 1
+
+    @property
+    def frames(self):
+        """Kept frames, oldest first: (frame index, {stage: ms})"""
+        if not self.history:
+            return []
+        first = max(self.frame_index - self.history, 0)
+        return [
+            (index, {name: float(history[index % self.history])
+                     for name, history in self._history.items()
+                     if not np.isnan(history[index % self.history])})
+            for index in range(first, self.frame_index)
+        ]
+
+    def percentiles(self, name):
+        """(p50, p95, p99) in ms over the rolling window"""
+        samples = self._rings[name][:min(self._counts[name], self.window)]
+        return tuple(float(value) for value in np.percentile(samples, (50, 95, 99)))
+
+    def summary(self):
+        """Percentiles for every stage seen so far"""
+        return {name: self.percentiles(name) for name in self.stage_names}
+
+    def export(self, path):
+        """Write per-frame timings to .json, or CSV for any other extension"""
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({
+                    "stages": self.stage_names,
+                    "summary": self.summary(),
+                    "frames": [dict(timings, frame=index) for index, timings in self.frames]
+                }, f)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame"] + self.stage_names)
+                for index, timings in self.frames:
+                    writer.writerow([index] + [
+                        f"{timings[name]:.3f}" if name in timings else ""
+                        for name in self.stage_names
+                    ])
+
+
+class NullProfiler:
+    """Drop-in profiler that records nothing"""
+
+    _stage = contextlib.nullcontext()
+
+    def stage(self, name):
+        return self._stage
+
+    def record(self, name, ms):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,125 @@
+"""
+Adaptive Quality
+Steps through cheaper quality levels while frames take longer than the
+frame budget, and back up when there is headroom again
+"""
+
+from collections import deque, namedtuple
+from config import *
+
+# What each level turns down, cumulative (level 3 also has no zones or landmarks)
+Quality = namedtuple("Quality", [
+    "draw_zones", "draw_landmarks", "inference_scale", "model_complexity", "preview_interval"
+])
+QUALITY_LEVELS = [
+    ("full", Quality(True, True, INFERENCE_SCALE, MODEL_COMPLEXITY, 1)),
+    ("no zone overlay", Quality(False, True, INFERENCE_SCALE, MODEL_COMPLEXITY, 1)),
+    ("no landmarks", Quality(False, False, INFERENCE_SCALE, MODEL_COMPLEXITY, 1)),
+    ("low-res inference", Quality(False, False, min(INFERENCE_SCALE, QUALITY_INFERENCE_SCALE),
+                                  MODEL_COMPLEXITY, 1)),
+    ("lite model", Quality(False, False, min(INFERENCE_SCALE, QUALITY_INFERENCE_SCALE), 0, 1)),
+    ("slow preview", Quality(False, False, min(INFERENCE_SCALE, QUALITY_INFERENCE_SCALE), 0,
+                             QUALITY_PREVIEW_INTERVAL)),
+]
+
+
+class QualityGovernor:
+    """
+    Watches the work time of recent frames (without the frame-cap sleep).
+    When the average over a full window is over budget the frame rate is
+    below target, and the governor steps down one level. It steps back up
+    only after the average stayed under up_headroom of the budget for
+    up_frames frames in a row.
+    A step up that has to be undone soon after doubles the wait before the
+    next one, so a machine right at a level boundary doesn't oscillate.
+    Costs O(1) per frame.
+    """
+
+    def __init__(self, target_fps=QUALITY_TARGET_FPS, window=QUALITY_WINDOW,
+                 up_headroom=QUALITY_UP_HEADROOM, up_frames=QUALITY_UP_FRAMES, levels=QUALITY_LEVELS):
+        self.budget = 1000.0 / target_fps  # ms per frame
+        self.window = window
+        self.up_headroom = up_headroom
+        self.base_up_frames = up_frames
+        self.up_frames = up_frames
+        self.levels = levels
+
+        self.level = 0
+        self.changes = 0
+        self.last_average = 0.0  # Average work time that caused the last change
+        self._samples = deque()
+        self._total = 0.0
+        self._headroom_frames = 0
+        self._since_up = None  # Frames since the last step up
+
+    @property
+    def name(self):
+        return self.levels[self.level][0]
+
+    @property
+    def quality(self):
+        return self.levels[self.level][1]
+
+    @property
+    def average(self):
+        """Mean work time (ms) over the current window"""
+        return self._total / len(self._samples) if self._samples else 0.0
+
+    def update(self, frame_ms):
+        """Add one frame's work time, returns True if the level changed"""
+        self._samples.append(frame_ms)
+        self._total += frame_ms
+        if len(self._samples) > self.window:
+            self._total -= self._samples.popleft()
+
+        full = len(self._samples) == self.window
+        if full and self.average < self.budget * self.up_headroom:
+            self._headroom_frames += 1
+        else:
+            self._headroom_frames = 0
+
+        if self._since_up is not None:
+            self._since_up += 1
+            if self._since_up > 2 * self.up_frames:
+                # The last step up held, forget earlier oscillation
+                self._since_up = None
+                self.up_frames = self.base_up_frames
+
+        if full and self.average > self.budget:
+            return self._step_down()
+        if self._headroom_frames >= self.up_frames:
+            return self._step_up()
+        return False
+
+    def _step_down(self):
+        if self.level == len(self.levels) - 1:
+            return False
+
+        # Undoing a recent step up: wait twice as long before the next try
+        if self._since_up is not None and self._since_up <= self.up_frames:
+            self.up_frames = min(self.up_frames * 2, self.base_up_frames * 32)
+        self._since_up = None
+        return self._set_level(self.level + 1)
+
+    def _step_up(self):
+        if self.level == 0:
+            self._headroom_frames = 0
+            return False
+
+        self._since_up = 0
+        return self._set_level(self.level - 1)
+
+    def _set_level(self, level):
+        self.level = level
+        self.changes += 1
+        self.last_average = self.average
+
+        # Judge the new level on its own frames only
+        self._samples.clear()
+        self._total = 0.0
+        self._headroom_frames = 0
+        return True
+
+    def describe(self):
+        """Current level for logs and the UI"""
+        return f"Quality {self.level}/{len(self.levels) - 1}: {self.name}"
@@ -0,0 +1,82 @@
+"""
+Scheduler
+Fixed-timestep game ticks and rate limiting, independent of the render loop
+"""
+
+import time
+from config import *
+
+
+class FixedStepScheduler:
+    """
+    Turns elapsed real time into a whole number of fixed-length ticks.
+    Slow frames are made up with extra ticks (up to max_catch_up per frame),
+    so game speed does not depend on how fast the loop runs. Time beyond
+    that is dropped and counted in missed_ticks.
+    """
+
+    def __init__(self, rate, max_catch_up=MAX_CATCH_UP_TICKS, clock=time.perf_counter):
+        self.step = 1.0 / rate
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+
+        self.accumulator = 0.0
+        self.last_time = None
+
+        # Statistics
+        self.ticks = 0
+        self.late_ticks = 0    # Ticks run as catch-up after a slow frame
+        self.missed_ticks = 0  # Ticks dropped because they were too late
+
+    def reset(self):
+        """Forget accumulated time (e.g. while paused)"""
+        self.accumulator = 0.0
+        self.last_time = None
+
+    def advance(self):
+        """Returns the number of game ticks due since the last call"""
+        now = self.clock()
+        if self.last_time is None:
+            self.last_time = now
+            return 0
+
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        due = int(self.accumulator / self.step)
+        if due > self.max_catch_up:
+            self.missed_ticks += due - self.max_catch_up
+            due = self.max_catch_up
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= due * self.step
+
+        if due > 1:
+            self.late_ticks += due - 1
+        self.ticks += due
+        return due
+
+    @property
+    def progress(self):
+        """Fraction of the way to the next tick, for interpolation"""
+        return self.accumulator / self.step
+
+
+class RateLimiter:
+    """Allows an action at most `rate` times per second (rate 0 = always)"""
+
+    def __init__(self, rate, clock=time.perf_counter):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.clock = clock
+        self.next_time = 0.0
+
+    def ready(self):
+        now = self.clock()
+        if now < self.next_time:
+            return False
+
+        # Stay on the fixed cadence unless we fell behind
+        self.next_time += self.interval
+        if self.next_time < now:
+            self.next_time = now + self.interval
+        return True
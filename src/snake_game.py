@@ -4,167 +4,289 @@ Classic snake game implementation with Pygame
 """
 
 import pygame
-import random
 from config import *
+from engine import FreeCells, SnakeEngine, Snake as SnakeLogic, Food as FoodLogic
+from text_cache import text_cache
+from viewport import Viewport, ChunkCache
 
 
-class Snake:
-    def __init__(self, x, y):
-        self.body = [(x, y)]
-        self.direction = RIGHT
-        self.grow = False
-        
-    def move(self):
-        head_x, head_y = self.body[0]
-        
-        # Calculate new head position based on direction
-        if self.direction == UP:
-            new_head = (head_x, head_y - SNAKE_SIZE)
-        elif self.direction == DOWN:
-            new_head = (head_x, head_y + SNAKE_SIZE)
-        elif self.direction == LEFT:
-            new_head = (head_x - SNAKE_SIZE, head_y)
-        elif self.direction == RIGHT:
-            new_head = (head_x + SNAKE_SIZE, head_y)
-        else:
-            new_head = (head_x, head_y)
-        
-        # Insert new head
-        self.body.insert(0, new_head)
-        
-        # Remove tail unless growing
-        if not self.grow:
-            self.body.pop()
-        else:
-            self.grow = False
-    
-    def change_direction(self, new_direction):
-        # Prevent moving in opposite direction
-        opposite_directions = {
-            UP: DOWN,
-            DOWN: UP,
-            LEFT: RIGHT,
-            RIGHT: LEFT
-        }
-        
-        if new_direction != opposite_directions.get(self.direction):
-            self.direction = new_direction
-    
-    def grow_snake(self):
-        self.grow = True
-    
-    def check_collision(self, width, height):
-        head_x, head_y = self.body[0]
-        
-        # Wall collision
-        if head_x < 0 or head_x >= width or head_y < 0 or head_y >= height:
-            return True
-        
-        # Self collision
-        if self.body[0] in self.body[1:]:
-            return True
-        
-        return False
+def draw_cell(surface, x, y, color):
+    """Draw one board cell with a black outline"""
+    pygame.draw.rect(surface, color, (x, y, SNAKE_SIZE, SNAKE_SIZE))
+    pygame.draw.rect(surface, BLACK, (x, y, SNAKE_SIZE, SNAKE_SIZE), 1)
+
+
+class Snake(SnakeLogic):
+    colors = PLAYER_COLORS[0]  # (head, body)
     
-    def draw(self, surface, offset_x=0):
+    def draw(self, surface, offset_x=0, view=None):
+        """view: visible board rect (see Viewport), cells outside it are skipped"""
+        head_color, body_color = self.colors
+        left, top = (view.x, view.y) if view is not None else (0, 0)
         for i, (x, y) in enumerate(self.body):
-            color = GREEN if i == 0 else CYAN  # Head is green, body is cyan
-            pygame.draw.rect(surface, color, (x + offset_x, y, SNAKE_SIZE, SNAKE_SIZE))
-            pygame.draw.rect(surface, BLACK, (x + offset_x, y, SNAKE_SIZE, SNAKE_SIZE), 1)
+            if view is not None and not view.collidepoint(x, y):
+                continue
+            color = head_color if i == 0 else body_color
+            draw_cell(surface, x - left + offset_x, y - top, color)
 
 
-class Food:
-    def __init__(self, width, height):
-        self.width = width
-        self.height = height
-        self.position = self.spawn()
-    
-    def spawn(self):
-        x = random.randint(0, (self.width - SNAKE_SIZE) // SNAKE_SIZE) * SNAKE_SIZE
-        y = random.randint(0, (self.height - SNAKE_SIZE) // SNAKE_SIZE) * SNAKE_SIZE
-        return (x, y)
-    
-    def respawn(self, snake_body):
-        while True:
-            self.position = self.spawn()
-            if self.position not in snake_body:
-                break
-    
-    def draw(self, surface, offset_x=0):
+class Food(FoodLogic):
+    def draw(self, surface, offset_x=0, view=None):
+        if self.position is None:
+            return
         x, y = self.position
-        pygame.draw.rect(surface, RED, (x + offset_x, y, SNAKE_SIZE, SNAKE_SIZE))
-        pygame.draw.rect(surface, BLACK, (x + offset_x, y, SNAKE_SIZE, SNAKE_SIZE), 1)
+        if view is not None:
+            if not view.collidepoint(x, y):
+                return
+            x, y = x - view.x, y - view.y
+        draw_cell(surface, x + offset_x, y, RED)
 
 
-class SnakeGame:
-    def __init__(self, width, height):
-        self.width = width
-        self.height = height
-        self.reset()
+class SnakeGame(SnakeEngine):
+    """Snake engine with Pygame drawing"""
+    
+    snake_class = Snake
+    food_class = Food
+    
+    def __init__(self, width, height, seed=None, players=1, view_size=None):
+        """
+        width, height: board size in pixels
+        view_size: (width, height) of the screen area the board is drawn in,
+        a larger board scrolls to follow the snakes (default: the board size)
+        """
+        # Visible part of the board and its pre-rendered background chunks
+        self.view_size = view_size or (width, height)
+        self._create_viewport(width, height)
+        
+        super().__init__(width, height, seed, players)
         
-        # Fonts
-        self.font = pygame.font.Font(None, FONT_SIZE)
-        self.small_font = pygame.font.Font(None, SMALL_FONT_SIZE)
+        # Fonts (shared with the text cache)
+        self.font = text_cache.font(FONT_SIZE)
+        self.small_font = text_cache.font(SMALL_FONT_SIZE)
+        self.hud_rect = pygame.Rect(0, 0, 0, 0)
+    
+    def _create_viewport(self, width, height):
+        self.viewport = Viewport(*self.view_size, width, height)
+        self.chunks = ChunkCache(width, height)
     
     def reset(self):
-        start_x = self.width // 2
-        start_y = self.height // 2
-        self.snake = Snake(start_x, start_y)
-        self.food = Food(self.width, self.height)
-        self.score = 0
-        self.game_over = False
-    
-    def update(self, direction=None):
+        super().reset()
+        for player, snake in enumerate(self.snakes):
+            snake.colors = PLAYER_COLORS[player % len(PLAYER_COLORS)]
+        self.viewport.center(self._focus())
+        
+        # Dirty tracking for draw_dirty()
+        self.dirty_cells = set()
+        self.hud_dirty = True
+        self.full_redraw = True
+    
+    def mark_restored(self):
+        super().mark_restored()
+        for player, snake in enumerate(self.snakes):
+            snake.colors = PLAYER_COLORS[player % len(PLAYER_COLORS)]
+        if (self.viewport.world_width, self.viewport.world_height) != (self.width, self.height):
+            self._create_viewport(self.width, self.height)
+        self.viewport.center(self._focus())
+        
+        # Anything may have changed
+        self.dirty_cells = set()
+        self.hud_dirty = True
+        self.full_redraw = True
+    
+    def _focus(self):
+        """Board point the view follows: the head, or the middle of all heads"""
+        heads = [snake.body[0] for snake in self.snakes]
+        return (sum(x for x, _ in heads) // len(heads), sum(y for _, y in heads) // len(heads))
+    
+    def update(self, *directions):
         if self.game_over:
             return
         
-        # Change direction if provided
-        if direction:
-            self.snake.change_direction(direction)
+        previous_directions = [snake.direction for snake in self.snakes]
+        previous_scores = list(self.scores)
+        old_heads = [snake.body[0] for snake in self.snakes]
         
-        # Move snake
-        self.snake.move()
+        super().update(*directions)
         
-        # Check food collision
-        if self.snake.body[0] == self.food.position:
-            self.snake.grow_snake()
-            self.food.respawn(self.snake.body)
-            self.score += 10
+        # Old heads change colour, new heads and freed tails change
+        self.dirty_cells.update(old_heads)
+        for snake, removed_tail in zip(self.snakes, self.removed_tails):
+            self.dirty_cells.add(snake.body[0])
+            if removed_tail is not None:
+                self.dirty_cells.add(removed_tail)
+        if self.food_moved:
+            self.dirty_cells.add(self.food.position)
+            if self.viewport.scrolls:
+                self.full_redraw = True  # Moves the off-screen food marker
         
-        # Check collisions
-        if self.snake.check_collision(self.width, self.height):
-            self.game_over = True
+        if previous_scores != self.scores or previous_directions != [
+                snake.direction for snake in self.snakes]:
+            self.hud_dirty = True
+        if self.game_over:
+            self.full_redraw = True
+        
+        # Scrolling moves everything on screen
+        if self.viewport.follow(self._focus()):
+            self.full_redraw = True
     
-    def draw(self, surface, offset_x=0):
-        # Draw game area background
-        game_area = pygame.Rect(offset_x, 0, self.width, self.height)
-        pygame.draw.rect(surface, BLACK, game_area)
+    def draw_dirty(self, surface, offset_x=0):
+        """
+        Redraw only what changed since the last draw
+        Returns: list of screen rects to pass to pygame.display.update()
+        """
+        view = self.viewport
+        if self.full_redraw:
+            self.draw(surface, offset_x)
+            return [pygame.Rect(offset_x, 0, view.width, view.height)]
+        
+        # Regions are in view space (the HUD stays put while the board scrolls)
+        regions = [pygame.Rect(x - view.x, y - view.y, SNAKE_SIZE, SNAKE_SIZE)
+                   for x, y in self.dirty_cells if (x, y) in view]
+        self.dirty_cells.clear()
         
-        # Draw grid lines (optional, for better visibility)
-        for x in range(0, self.width, SNAKE_SIZE):
-            pygame.draw.line(surface, (30, 30, 30), (offset_x + x, 0), (offset_x + x, self.height))
-        for y in range(0, self.height, SNAKE_SIZE):
-            pygame.draw.line(surface, (30, 30, 30), (offset_x, y), (offset_x + self.width, y))
+        # Text changed, or a cell under the text was redrawn
+        if self.hud_dirty or self.hud_rect.collidelist(regions) != -1:
+            regions.append(self.hud_rect.union(self._hud_bounds()))
+        
+        screen_rects = []
+        for region in regions:
+            screen_rects.append(self._redraw_region(surface, self._whole_cells(region), offset_x))
+        
+        return screen_rects
+    
+    def _whole_cells(self, region):
+        """
+        Grow a view-space region outward to whole cells (the view scrolls by
+        whole cells), a cell cut by the clip would get its outline drawn
+        along the cut
+        """
+        left = region.left // SNAKE_SIZE * SNAKE_SIZE
+        top = region.top // SNAKE_SIZE * SNAKE_SIZE
+        right = -(-region.right // SNAKE_SIZE) * SNAKE_SIZE
+        bottom = -(-region.bottom // SNAKE_SIZE) * SNAKE_SIZE
+        return pygame.Rect(left, top, right - left, bottom - top)
+    
+    def _redraw_region(self, surface, region, offset_x):
+        """Repaint one view-space region: background, cells inside it, then HUD text"""
+        view = self.viewport
+        region = region.clip(pygame.Rect(0, 0, view.width, view.height))
+        screen_rect = region.move(offset_x, 0)
+        surface.set_clip(screen_rect)
+        self.chunks.blit(surface, region.move(view.x, view.y), screen_rect.topleft)
+        self._draw_cells(surface, region, offset_x)
+        
+        marker = self._food_marker()
+        if marker is not None and region.colliderect(marker):
+            pygame.draw.rect(surface, RED, marker.move(offset_x, 0))
+        
+        if screen_rect.colliderect(self.hud_rect.move(offset_x, 0)) or self.hud_dirty:
+            self._draw_hud(surface, offset_x)
+        
+        surface.set_clip(None)
+        return screen_rect
+    
+    def _draw_cells(self, surface, region, offset_x):
+        """Draw whatever is on the cells overlapping a view-space region"""
+        view = self.viewport
+        board = region.move(view.x, view.y)
+        first_x = board.left // SNAKE_SIZE * SNAKE_SIZE
+        first_y = board.top // SNAKE_SIZE * SNAKE_SIZE
+        for y in range(first_y, board.bottom, SNAKE_SIZE):
+            for x in range(first_x, board.right, SNAKE_SIZE):
+                color = self._cell_color((x, y))
+                if color is not None:
+                    draw_cell(surface, x - view.x + offset_x, y - view.y, color)
+    
+    def _food_marker(self):
+        """View-space rect on the view edge pointing at off-screen food, None if it's visible"""
+        view = self.viewport
+        if self.food.position is None or self.food.position in view:
+            return None
+        x = min(max(self.food.position[0], view.x), view.x + view.width - SNAKE_SIZE) - view.x
+        y = min(max(self.food.position[1], view.y), view.y + view.height - SNAKE_SIZE) - view.y
+        quarter = SNAKE_SIZE // 4
+        return pygame.Rect(x + quarter, y + quarter, SNAKE_SIZE // 2, SNAKE_SIZE // 2)
+    
+    def _cell_color(self, cell):
+        """Colour of whatever is drawn on a cell (later snakes on top), None if empty"""
+        for snake in reversed(self.snakes):
+            if snake.occupies(cell):
+                head_color, body_color = snake.colors
+                return head_color if cell == snake.body[0] else body_color
+        if cell == self.food.position:
+            return RED
+        return None
+    
+    def _hud_text(self):
+        """Cached score and direction surfaces"""
+        if self.players == 1:
+            score = f"Score: {self.score}"
+            direction = f"Direction: {self.snake.direction}"
+        else:
+            score = "  ".join(f"P{player + 1}: {points}" for player, points in enumerate(self.scores))
+            direction = "Direction: " + " / ".join(snake.direction for snake in self.snakes)
         
-        # Draw food and snake
-        self.food.draw(surface, offset_x)
-        self.snake.draw(surface, offset_x)
+        score_text = text_cache.render(score, FONT_SIZE, WHITE)
+        direction_text = text_cache.render(direction, SMALL_FONT_SIZE, YELLOW)
+        return score_text, direction_text
+    
+    def _hud_bounds(self):
+        """Board-space rect covering the current score and direction text"""
+        score_text, direction_text = self._hud_text()
+        width = max(score_text.get_width(), direction_text.get_width())
+        return pygame.Rect(10, 10, width, 40 + direction_text.get_height())
+    
+    def _draw_hud(self, surface, offset_x):
+        score_text, direction_text = self._hud_text()
         
         # Draw score
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
         surface.blit(score_text, (offset_x + 10, 10))
         
         # Draw direction indicator
-        direction_text = self.small_font.render(f"Direction: {self.snake.direction}", True, YELLOW)
         surface.blit(direction_text, (offset_x + 10, 50))
         
+        self.hud_rect = self._hud_bounds()
+        self.hud_dirty = False
+    
+    def draw(self, surface, offset_x=0):
+        view = self.viewport
+        
+        # Draw game area background from the chunks in view
+        self.chunks.blit(surface, view.rect, (offset_x, 0))
+        self.chunks.evict(view.rect)
+        
+        # Draw food and snakes: walk the bodies, or the visible cells once
+        # the bodies are longer than that, so long snakes cost no more
+        if sum(len(snake.body) for snake in self.snakes) < view.width * view.height // SNAKE_SIZE ** 2:
+            self.food.draw(surface, offset_x, view.rect)
+            for snake in self.snakes:
+                snake.draw(surface, offset_x, view.rect)
+        else:
+            self._draw_cells(surface, pygame.Rect(0, 0, view.width, view.height), offset_x)
+        marker = self._food_marker()
+        if marker is not None:
+            pygame.draw.rect(surface, RED, marker.move(offset_x, 0))
+        
+        # Draw score and direction
+        self._draw_hud(surface, offset_x)
+        
         # Draw game over message
         if self.game_over:
-            game_over_text = self.font.render("GAME OVER!", True, RED)
-            restart_text = self.small_font.render("Press R to Restart", True, WHITE)
+            if self.players == 1:
+                message = "GAME OVER!"
+            elif self.winner is None:
+                message = "DRAW!"
+            else:
+                message = f"PLAYER {self.winner + 1} WINS!"
+            game_over_text = text_cache.render(message, FONT_SIZE, RED)
+            restart_text = text_cache.render("Press R to Restart", SMALL_FONT_SIZE, WHITE)
             
-            text_rect = game_over_text.get_rect(center=(offset_x + self.width // 2, self.height // 2))
-            restart_rect = restart_text.get_rect(center=(offset_x + self.width // 2, self.height // 2 + 40))
+            text_rect = game_over_text.get_rect(center=(offset_x + view.width // 2, view.height // 2))
+            restart_rect = restart_text.get_rect(center=(offset_x + view.width // 2, view.height // 2 + 40))
             
             surface.blit(game_over_text, text_rect)
-            surface.blit(restart_text, restart_rect)
\ No newline at end of file
+            surface.blit(restart_text, restart_rect)
+        
+        # Everything is up to date
+        self.dirty_cells.clear()
+        self.full_redraw = False
\ No newline at end of file
@@ -0,0 +1,389 @@
+"""
+Game Snapshots
+Compact binary snapshots of the full SnakeEngine state, and a bounded
+rewind history of per-tick diffs with periodic snapshots
+
+Snapshots hold everything needed to continue a game exactly, including the
+random generator. Diffs hold a tick's changes in both directions, so the
+history can be walked backwards and forwards one tick at a time.
+"""
+
+import os
+import struct
+from collections import deque, namedtuple
+import numpy as np
+from engine import DIRECTION_CODES, DIRECTION_NAMES
+from config import *
+
+SnakeState = namedtuple("SnakeState", ["body", "direction", "grow", "score"])
+GameState = namedtuple("GameState", [
+    "width", "height", "tick", "game_over", "winner", "food", "snakes", "rng_state"
+])
+
+MAGIC = b"HSGS"
+HISTORY_MAGIC = b"HSRW"
+VERSION = 2
+
+SNAPSHOT_HEADER = struct.Struct("<4sHIIIBBBhh")  # magic, version, tick, width, height, players, game over, winner, food
+SNAPSHOT_SNAKE = struct.Struct("<IBBI")  # score, direction, grow, length (cells follow, head first)
+RNG_STATE = struct.Struct("<625IBd")  # Mersenne Twister state, cached gauss value
+DIFF_HEADER = struct.Struct("<IBBhhhh")  # tick after, game over, winner, food before, food after
+DIFF_SNAKE = struct.Struct("<IIBBhhhh")  # score before/after, directions (before << 4 | after), flags, new head, removed tail
+HISTORY_HEADER = struct.Struct("<4sHIIIII")  # magic, version, capacity, interval, snapshots, history, redo (then the current state)
+ENTRY = struct.Struct("<II")  # tick, length
+
+NO_WINNER = 255
+NO_CELL = (-1, -1)
+
+# DIFF_SNAKE flags
+GROW_BEFORE = 1
+GROW_AFTER = 2
+TAIL_REMOVED = 4
+
+
+def _cell(position):
+    """Board pixels to (column, row)"""
+    if position is None:
+        return NO_CELL
+    return position[0] // SNAKE_SIZE, position[1] // SNAKE_SIZE
+
+
+def _position(column, row):
+    """(column, row) to board pixels"""
+    if (column, row) == NO_CELL:
+        return None
+    return column * SNAKE_SIZE, row * SNAKE_SIZE
+
+
+def encode_snapshot(game):
+    """Full state of a SnakeEngine as bytes"""
+    winner = NO_WINNER if game.winner is None else game.winner
+    parts = [SNAPSHOT_HEADER.pack(
+        MAGIC, VERSION, game.tick, game.width, game.height, game.players,
+        game.game_over, winner, *_cell(game.food.position)
+    )]
+    for score, snake in zip(game.scores, game.snakes):
+        parts.append(SNAPSHOT_SNAKE.pack(
+            score, DIRECTION_CODES[snake.direction], snake.grow, len(snake.body)
+        ))
+        cells = np.array(snake.body, dtype=np.int32).reshape(-1, 2) // SNAKE_SIZE
+        parts.append(cells.astype("<i2").tobytes())
+
+    # The free-cell order isn't stored: food is always picked from the
+    # compacted order, which restore() rebuilds from the snakes
+
+    _, key, gauss = game.rng.getstate()
+    parts.append(RNG_STATE.pack(*key, gauss is not None, gauss or 0.0))
+    return b"".join(parts)
+
+
+def decode_snapshot(data):
+    """Bytes from encode_snapshot() to a GameState"""
+    magic, version, tick, width, height, players, game_over, winner, *food = \
+        SNAPSHOT_HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a game snapshot")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+
+    snakes = []
+    offset = SNAPSHOT_HEADER.size
+    for _ in range(players):
+        score, direction, grow, length = SNAPSHOT_SNAKE.unpack_from(data, offset)
+        offset += SNAPSHOT_SNAKE.size
+        cells = np.frombuffer(data, dtype="<i2", count=length * 2, offset=offset)
+        offset += cells.nbytes
+        body = [tuple(cell) for cell in (cells.reshape(-1, 2).astype(np.int64) * SNAKE_SIZE).tolist()]
+        snakes.append(SnakeState(body, DIRECTION_NAMES[direction], bool(grow), score))
+
+    *key, has_gauss, gauss = RNG_STATE.unpack_from(data, offset)
+    rng_state = (3, tuple(key), gauss if has_gauss else None)
+
+    return GameState(
+        width, height, tick, bool(game_over), None if winner == NO_WINNER else winner,
+        _position(*food), snakes, rng_state
+    )
+
+
+def _write_atomic(path, data):
+    """Write a whole file so that a crash never leaves half of it"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+def save_snapshot(path, game):
+    _write_atomic(path, encode_snapshot(game))
+
+
+def load_snapshot(path):
+    with open(path, "rb") as f:
+        return decode_snapshot(f.read())
+
+
+class _Values:
+    """Per-tick values a diff records the previous state of"""
+
+    __slots__ = ("scores", "directions", "grows", "food")
+
+    def __init__(self, game):
+        self.scores = list(game.scores)
+        self.directions = [snake.direction for snake in game.snakes]
+        self.grows = [snake.grow for snake in game.snakes]
+        self.food = game.food.position
+
+
+def encode_diff(game, before):
+    """What the last update() changed, given the values from before it"""
+    winner = NO_WINNER if game.winner is None else game.winner
+    parts = [DIFF_HEADER.pack(
+        game.tick, game.game_over, winner, *_cell(before.food), *_cell(game.food.position)
+    )]
+    for player, snake in enumerate(game.snakes):
+        tail = game.removed_tails[player]
+        flags = ((GROW_BEFORE if before.grows[player] else 0) | (GROW_AFTER if snake.grow else 0)
+                 | (TAIL_REMOVED if tail is not None else 0))
+        parts.append(DIFF_SNAKE.pack(
+            before.scores[player], game.scores[player],
+            DIRECTION_CODES[before.directions[player]] << 4 | DIRECTION_CODES[snake.direction],
+            flags, *_cell(snake.body[0]), *_cell(tail)
+        ))
+    return b"".join(parts)
+
+
+def apply_diff(game, diff, forward=True):
+    """Move a game one tick forward (redo) or back (undo) along a diff"""
+    tick, game_over, winner, *food = DIFF_HEADER.unpack_from(diff)
+    entries = [DIFF_SNAKE.unpack_from(diff, DIFF_HEADER.size + player * DIFF_SNAKE.size)
+               for player in range(game.players)]
+
+    if forward:
+        for player, snake in enumerate(game.snakes):
+            _, score, directions, flags, *cells = entries[player]
+            snake.push_head(_position(*cells[:2]))
+            if flags & TAIL_REMOVED:
+                snake.pop_tail()
+            game.scores[player] = score
+            snake.direction = DIRECTION_NAMES[directions & 0xF]
+            snake.grow = bool(flags & GROW_AFTER)
+        game.food.position = _position(*food[2:])
+        game.game_over = bool(game_over)
+        game.winner = None if winner == NO_WINNER else winner
+        game.tick = tick
+    else:
+        # Exact mirror of the forward order
+        for player in reversed(range(game.players)):
+            snake = game.snakes[player]
+            score, _, directions, flags, *cells = entries[player]
+            if flags & TAIL_REMOVED:
+                snake.push_tail(_position(*cells[2:]))
+            snake.pop_head()
+            game.scores[player] = score
+            snake.direction = DIRECTION_NAMES[directions >> 4]
+            snake.grow = bool(flags & GROW_BEFORE)
+        game.food.position = _position(*food[:2])
+        game.game_over = False
+        game.winner = None
+        game.tick = tick - 1
+
+
+class RewindHistory:
+    """
+    The last `capacity` ticks of a game as per-tick diffs, plus a full
+    snapshot every `snapshot_interval` ticks. Memory stays bounded: the
+    oldest diffs fall out of a ring buffer, and snapshots older than the
+    history are dropped.
+
+    Stepping back or forward applies one diff (O(1)). Ticks undone stay
+    available for redo until the game moves on from an earlier tick.
+    Seeking further than the nearest snapshot restores that snapshot and
+    steps from there. Rewinding restores the board, not the random
+    generator, so food placed after a rewind is new.
+
+    save() also stores the game's current state, and load() continues
+    from it exactly as saved, random generator included.
+    """
+
+    def __init__(self, capacity=REWIND_TICKS, snapshot_interval=REWIND_SNAPSHOT_INTERVAL):
+        self.capacity = capacity
+        self.snapshot_interval = snapshot_interval
+        self.clear()
+
+    def clear(self):
+        self.tick = None  # Tick of the game state the history is at
+        self._history = deque(maxlen=self.capacity)  # Diffs up to self.tick, oldest first
+        self._redo = []  # Diffs after self.tick, next one last
+        self._snapshots = deque()  # (tick, snapshot), oldest first
+        self._before = None
+
+    @property
+    def first_tick(self):
+        """Earliest tick that can be rewound to"""
+        return None if self.tick is None else self.tick - len(self._history)
+
+    @property
+    def last_tick(self):
+        """Latest tick that can be redone"""
+        return None if self.tick is None else self.tick + len(self._redo)
+
+    def record(self, game, restart=False):
+        """
+        Add the game's state after an update. A new game (restart) or a
+        state that doesn't follow the last recorded tick starts a new history.
+        """
+        tick = game.tick
+        if not restart and tick == self.tick:
+            return
+
+        if restart or self.tick is None or tick != self.tick + 1:
+            self.clear()
+        else:
+            self._history.append(encode_diff(game, self._before))
+
+            # Moving on from an undone tick drops the redo branch
+            if self._redo:
+                self._redo.clear()
+                while self._snapshots and self._snapshots[-1][0] >= tick:
+                    self._snapshots.pop()
+
+        self.tick = tick
+        self._before = _Values(game)
+        if not self._snapshots or tick % self.snapshot_interval == 0:
+            self._snapshots.append((tick, encode_snapshot(game)))
+        self._drop_old_snapshots()
+
+    def _drop_old_snapshots(self):
+        # A snapshot is useful while it is inside the history
+        first = self.first_tick
+        while self._snapshots and self._snapshots[0][0] < first:
+            self._snapshots.popleft()
+
+    def step_back(self, game):
+        """Undo one tick, returns False at the start of the history"""
+        if not self._step_back(game):
+            return False
+        game.mark_restored()
+        return True
+
+    def step_forward(self, game):
+        """Redo one undone tick, returns False if there is none"""
+        if not self._step_forward(game):
+            return False
+        game.mark_restored()
+        return True
+
+    def _step_back(self, game):
+        if not self._history:
+            return False
+        diff = self._history.pop()
+        apply_diff(game, diff, forward=False)
+        self._redo.append(diff)
+        self.tick -= 1
+        self._before = _Values(game)
+        return True
+
+    def _step_forward(self, game):
+        if not self._redo:
+            return False
+        diff = self._redo.pop()
+        apply_diff(game, diff, forward=True)
+        self._history.append(diff)
+        self.tick += 1
+        self._before = _Values(game)
+        return True
+
+    def _move_to(self, tick):
+        """Move the history position without touching a game"""
+        while self.tick > tick:
+            self._redo.append(self._history.pop())
+            self.tick -= 1
+        while self.tick < tick:
+            self._history.append(self._redo.pop())
+            self.tick += 1
+
+    def seek(self, game, tick):
+        """
+        Put the game at any tick in the history, returns False if it is outside
+        Steps from the game's current state or from the closest snapshot,
+        whichever is nearer to the target
+        """
+        if self.tick is None or not self.first_tick <= tick <= self.last_tick:
+            return False
+
+        # The current state is only a starting point if it is the recorded one
+        distance = abs(tick - self.tick) if game.tick == self.tick else None
+        start = None
+        for snapshot_tick, snapshot in self._snapshots:
+            if distance is None or abs(tick - snapshot_tick) < distance:
+                distance = abs(tick - snapshot_tick)
+                start = (snapshot_tick, snapshot)
+        if distance is None:
+            return False
+
+        if start is not None:
+            snapshot_tick, snapshot = start
+            self._move_to(snapshot_tick)
+            game.restore(decode_snapshot(snapshot), restore_rng=False)
+            self._before = _Values(game)
+
+        while self.tick > tick:
+            self._step_back(game)
+        while self.tick < tick:
+            self._step_forward(game)
+        game.mark_restored()
+        return True
+
+    def save(self, path, game):
+        """
+        Write the history and the game's current state (random generator
+        included) to a file, atomically
+        """
+        saved = encode_snapshot(game)
+        parts = [HISTORY_HEADER.pack(
+            HISTORY_MAGIC, VERSION, self.capacity, self.snapshot_interval,
+            len(self._snapshots), len(self._history), len(self._redo)
+        )]
+        entries = [(saved_tick, snapshot) for saved_tick, snapshot in self._snapshots]
+        entries += [(0, diff) for diff in self._history]
+        entries += [(0, diff) for diff in self._redo]
+        entries.append((game.tick, saved))
+        for entry_tick, data in entries:
+            parts.append(ENTRY.pack(entry_tick, len(data)))
+            parts.append(data)
+        _write_atomic(path, b"".join(parts))
+
+    @classmethod
+    def load(cls, path, game):
+        """Restore a game and its history written by save()"""
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version, capacity, interval, snapshots, history, redo = \
+            HISTORY_HEADER.unpack_from(data)
+        if magic != HISTORY_MAGIC:
+            raise ValueError(f"{path} is not a rewind history")
+        if version != VERSION:
+            raise ValueError(f"Unsupported rewind history version {version} in {path}")
+
+        offset = HISTORY_HEADER.size
+        entries = []
+        for _ in range(snapshots + history + redo + 1):
+            entry_tick, length = ENTRY.unpack_from(data, offset)
+            offset += ENTRY.size
+            entries.append((entry_tick, data[offset:offset + length]))
+            offset += length
+
+        game.restore(decode_snapshot(entries[-1][1]))
+        rewind = cls(capacity, interval)
+        rewind.tick = game.tick
+        rewind._before = _Values(game)
+        rewind._snapshots.extend(entries[:snapshots])
+        rewind._history.extend(diff for _, diff in entries[snapshots:snapshots + history])
+        rewind._redo.extend(diff for _, diff in entries[snapshots + history:-1])
+        if not rewind._snapshots:
+            rewind._snapshots.append((game.tick, entries[-1][1]))
+        return rewind
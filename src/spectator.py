@@ -0,0 +1,432 @@
+"""
+Spectator Streaming
+Broadcasts game state to spectator viewers as compact binary messages:
+a keyframe with the full board every few ticks and a small delta per tick
+(new heads, removed tails, food, scores) in between. The server runs an
+asyncio loop in its own process.
+
+Every message is a 9-byte header (type, tick, payload length) followed by
+the payload, all little-endian. Cells are sent as (column, row) int16 pairs.
+"""
+
+import asyncio
+import itertools
+import multiprocessing
+import queue
+import socket
+import struct
+import threading
+from collections import deque
+import numpy as np
+from engine import DIRECTION_CODES, DIRECTION_NAMES
+from config import *
+
+MAGIC = b"HSSP"
+VERSION = 1
+
+HELLO = 0
+KEYFRAME = 1
+DELTA = 2
+
+HEADER = struct.Struct("<BII")  # type, tick, payload length
+HELLO_PAYLOAD = struct.Struct("<4sH")  # magic, version
+KEYFRAME_BOARD = struct.Struct("<HHBBBhh")  # columns, rows, players, game over, winner, food
+KEYFRAME_SNAKE = struct.Struct("<IBI")  # score, direction, length (cells follow, head first)
+DELTA_BOARD = struct.Struct("<BBhh")  # game over, winner, food
+DELTA_SNAKE = struct.Struct("<IBhhB")  # score, direction, new head, tail removed
+
+NO_WINNER = 255
+NO_FOOD = (-1, -1)
+
+
+def _cell(position):
+    """Board pixels to (column, row)"""
+    return position[0] // SNAKE_SIZE, position[1] // SNAKE_SIZE
+
+
+def _message(kind, tick, payload):
+    return HEADER.pack(kind, tick, len(payload)) + payload
+
+
+def encode_hello():
+    return _message(HELLO, 0, HELLO_PAYLOAD.pack(MAGIC, VERSION))
+
+
+def encode_keyframe(game):
+    """Full board state of a SnakeEngine"""
+    food = _cell(game.food.position) if game.food.position is not None else NO_FOOD
+    winner = NO_WINNER if game.winner is None else game.winner
+    parts = [KEYFRAME_BOARD.pack(
+        game.width // SNAKE_SIZE, game.height // SNAKE_SIZE, game.players,
+        game.game_over, winner, *food
+    )]
+    for score, snake in zip(game.scores, game.snakes):
+        parts.append(KEYFRAME_SNAKE.pack(score, DIRECTION_CODES[snake.direction], len(snake.body)))
+        cells = np.fromiter(itertools.chain.from_iterable(snake.body), dtype=np.int32,
+                            count=2 * len(snake.body)) // SNAKE_SIZE
+        parts.append(cells.astype("<i2").tobytes())
+    return _message(KEYFRAME, game.tick, b"".join(parts))
+
+
+def encode_delta(game):
+    """What the last SnakeEngine.update() changed"""
+    food = _cell(game.food.position) if game.food.position is not None else NO_FOOD
+    winner = NO_WINNER if game.winner is None else game.winner
+    parts = [DELTA_BOARD.pack(game.game_over, winner, *food)]
+    for score, snake, tail in zip(game.scores, game.snakes, game.removed_tails):
+        parts.append(DELTA_SNAKE.pack(
+            score, DIRECTION_CODES[snake.direction], *_cell(snake.body[0]), tail is not None
+        ))
+    return _message(DELTA, game.tick, b"".join(parts))
+
+
+class BoardState:
+    """
+    Board rebuilt from spectator messages. Cells are (column, row).
+    A delta that does not follow the current tick leaves the board
+    unsynced until the next keyframe.
+    """
+
+    def __init__(self):
+        self.columns = 0
+        self.rows = 0
+        self.tick = None
+        self.snakes = []      # deque of cells per player, head first
+        self.directions = []
+        self.scores = []
+        self.food = None
+        self.game_over = False
+        self.winner = None
+        self.synced = False
+
+    @property
+    def players(self):
+        return len(self.snakes)
+
+    def apply(self, kind, tick, payload):
+        """Apply one message, returns False if it had to be skipped"""
+        if kind == KEYFRAME:
+            self._apply_keyframe(payload)
+        elif kind == DELTA:
+            if not self.synced or tick != self.tick + 1:
+                self.synced = False
+                return False
+            self._apply_delta(payload)
+        else:
+            return False
+
+        self.tick = tick
+        self.synced = True
+        return True
+
+    def _set_board(self, game_over, winner, food_column, food_row):
+        self.game_over = bool(game_over)
+        self.winner = None if winner == NO_WINNER else winner
+        self.food = None if (food_column, food_row) == NO_FOOD else (food_column, food_row)
+
+    def _apply_keyframe(self, payload):
+        columns, rows, players, game_over, winner, *food = KEYFRAME_BOARD.unpack_from(payload)
+        self.columns = columns
+        self.rows = rows
+        self._set_board(game_over, winner, *food)
+
+        self.snakes, self.directions, self.scores = [], [], []
+        offset = KEYFRAME_BOARD.size
+        for _ in range(players):
+            score, direction, length = KEYFRAME_SNAKE.unpack_from(payload, offset)
+            offset += KEYFRAME_SNAKE.size
+            cells = np.frombuffer(payload, dtype="<i2", count=length * 2, offset=offset)
+            offset += cells.nbytes
+            self.snakes.append(deque(map(tuple, cells.reshape(-1, 2).tolist())))
+            self.directions.append(DIRECTION_NAMES[direction])
+            self.scores.append(score)
+
+    def _apply_delta(self, payload):
+        self._set_board(*DELTA_BOARD.unpack_from(payload))
+
+        offset = DELTA_BOARD.size
+        for player, body in enumerate(self.snakes):
+            score, direction, column, row, tail_removed = DELTA_SNAKE.unpack_from(payload, offset)
+            offset += DELTA_SNAKE.size
+            body.appendleft((column, row))
+            if tail_removed:
+                body.pop()
+            self.directions[player] = DIRECTION_NAMES[direction]
+            self.scores[player] = score
+
+
+class _Spectator:
+    """One connected viewer"""
+
+    __slots__ = ("writer", "task", "synced")
+
+    def __init__(self, writer, task, synced=True):
+        self.writer = writer
+        self.task = task
+        self.synced = synced  # False while messages are being skipped
+
+    @property
+    def buffered(self):
+        return self.writer.transport.get_write_buffer_size()
+
+    def write(self, data):
+        self.writer.write(data)
+
+
+class SpectatorHub:
+    """
+    Fans messages out to every connected viewer (runs in the server process).
+
+    A viewer whose unsent data grows past max_buffer stops receiving
+    messages. Once it has drained it is sent the latest keyframe and the
+    deltas after it, so it catches up on the present instead of the backlog.
+    New viewers are synced the same way.
+    """
+
+    def __init__(self, max_buffer=SPECTATOR_MAX_BUFFER):
+        self.max_buffer = max_buffer
+        self.clients = set()
+        self._history = []  # Latest keyframe and the deltas after it
+
+        # Statistics
+        self.resyncs = 0
+
+    async def serve(self, host, port, messages, status):
+        """
+        Accept viewers and broadcast every message from the `messages` queue
+        until it yields None. The bound port (or the error) goes to `status`.
+        """
+        try:
+            server = await asyncio.start_server(self._handle_client, host, port)
+        except OSError as error:
+            status.put(("error", str(error)))
+            return
+        status.put(("ready", server.sockets[0].getsockname()[1]))
+
+        # Queue reads block, so they run on a helper thread
+        loop = asyncio.get_running_loop()
+        finished = loop.create_future()
+
+        def receive():
+            parent = multiprocessing.parent_process()
+            while True:
+                try:
+                    message = messages.get(timeout=1.0)
+                except queue.Empty:
+                    # Don't outlive a game that was killed
+                    if parent is not None and not parent.is_alive():
+                        break
+                    continue
+                if message is None:
+                    break
+                loop.call_soon_threadsafe(self.broadcast, message, message[0] == KEYFRAME)
+            loop.call_soon_threadsafe(finished.set_result, None)
+
+        threading.Thread(target=receive, name="spectator-receive", daemon=True).start()
+        await finished
+
+        server.close()
+        tasks = [client.task for client in self.clients]
+        for client in self.clients:
+            client.writer.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await server.wait_closed()
+
+    async def _handle_client(self, reader, writer):
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        # Before the first keyframe there is nothing to follow yet
+        client = _Spectator(writer, asyncio.current_task(), synced=bool(self._history))
+        client.write(encode_hello() + b"".join(self._history))
+        self.clients.add(client)
+        try:
+            # Viewers send nothing, reading only notices the disconnect
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            writer.close()
+
+    def broadcast(self, message, keyframe):
+        if keyframe:
+            self._history = [message]
+        elif self._history:
+            self._history.append(message)
+
+        for client in self.clients:
+            self._send(client, message)
+
+    def _send(self, client, message):
+        if client.writer.is_closing():
+            return
+
+        if client.synced:
+            if client.buffered <= self.max_buffer:
+                client.write(message)
+                return
+            client.synced = False
+
+        # Lagging or new viewer: skip ahead once it has room again
+        if client.buffered <= self.max_buffer // 2 and self._history:
+            client.write(b"".join(self._history))
+            client.synced = True
+            self.resyncs += 1
+
+
+def _server_main(host, port, max_buffer, messages, status):
+    """Spectator process entry point"""
+    try:
+        asyncio.run(SpectatorHub(max_buffer).serve(host, port, messages, status))
+    except KeyboardInterrupt:
+        pass
+
+
+class SpectatorServer:
+    """
+    Game-side handle for the spectator process. Sockets and the fan-out to
+    viewers live in their own process, so however many viewers connect the
+    game thread only encodes one small message per tick and queues it.
+    """
+
+    def __init__(self, host=SPECTATOR_HOST, port=SPECTATOR_PORT,
+                 keyframe_interval=SPECTATOR_KEYFRAME_INTERVAL, max_buffer=SPECTATOR_MAX_BUFFER):
+        self.host = host
+        self.port = port
+        self.keyframe_interval = keyframe_interval
+        self.max_buffer = max_buffer
+        self.messages = None
+        self.process = None
+        self._status = None
+        self._last_tick = None
+
+        # Statistics
+        self.sent = 0
+
+    def start(self, wait=True):
+        """
+        Start the server process, returns self. With wait the port is bound
+        on return (OSError if it is taken), otherwise startup errors are
+        raised by a later publish().
+        """
+        ctx = multiprocessing.get_context("spawn")
+        self.messages = ctx.Queue()
+        self._status = ctx.Queue()
+        self.process = ctx.Process(
+            target=_server_main,
+            args=(self.host, self.port, self.max_buffer, self.messages, self._status),
+            name="SpectatorServer",
+            daemon=True
+        )
+        self.process.start()
+
+        if wait:
+            self._check_started(block=True)
+        return self
+
+    def _check_started(self, block):
+        """Read the startup report of the process, False while it is still starting"""
+        if self._status is None:
+            return True
+
+        while True:
+            try:
+                state, value = self._status.get(timeout=0.1) if block else self._status.get_nowait()
+                break
+            except queue.Empty:
+                if not self.process.is_alive():
+                    state, value = "error", "Spectator process exited during startup"
+                    break
+                if not block:
+                    return False
+
+        self._status = None
+        if state == "error":
+            self.stop()
+            raise OSError(value)
+        self.port = value
+        return True
+
+    def publish(self, game, keyframe=False):
+        """
+        Send the game's state after an update (or a full keyframe, e.g. after
+        a reset). Ticks already sent are ignored, skipped ticks send a keyframe.
+        """
+        if self.messages is None:
+            return
+        self._check_started(block=False)
+
+        tick = game.tick
+        if not keyframe and tick == self._last_tick:
+            return
+
+        keyframe = (keyframe or self._last_tick is None or tick != self._last_tick + 1
+                    or tick % self.keyframe_interval == 0)
+        self._last_tick = tick
+        self.messages.put(encode_keyframe(game) if keyframe else encode_delta(game))
+        self.sent += 1
+
+    def stop(self):
+        """Disconnect every viewer and stop the server process"""
+        if self.messages is None:
+            return
+
+        self.messages.put(None)
+        self.process.join(timeout=2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.messages = None
+
+
+async def read_message(reader):
+    """Next (type, tick, payload) from a stream"""
+    kind, tick, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+    payload = await reader.readexactly(length) if length else b""
+    return kind, tick, payload
+
+
+class SpectatorClient:
+    """Connects to a SpectatorServer and keeps a BoardState up to date"""
+
+    def __init__(self):
+        self.board = BoardState()
+        self.reader = None
+        self.writer = None
+        self.received = 0
+
+    async def connect(self, host=SPECTATOR_HOST, port=SPECTATOR_PORT):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+
+        # Check the greeting before trusting any length field
+        kind, _, length = HEADER.unpack(await self.reader.readexactly(HEADER.size))
+        if (kind != HELLO or length != HELLO_PAYLOAD.size or
+                HELLO_PAYLOAD.unpack(await self.reader.readexactly(length)) != (MAGIC, VERSION)):
+            self.writer.close()
+            raise ValueError(f"{host}:{port} is not a compatible HandSnake spectator server")
+        return self
+
+    async def receive(self):
+        """Read and apply one message, returns its type"""
+        kind, tick, payload = await read_message(self.reader)
+        self.board.apply(kind, tick, payload)
+        self.received += 1
+        return kind
+
+    async def run(self):
+        """Apply messages until the server closes the connection"""
+        try:
+            while True:
+                await self.receive()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
@@ -0,0 +1,112 @@
+"""
+HandSnake - Spectator Viewer
+Watches a game streamed by a HandSnake instance started with --spectators
+
+Usage:
+    python spectator_viewer.py                      # local game
+    python spectator_viewer.py --host 192.168.1.20  # game on another machine
+"""
+
+import argparse
+import asyncio
+import pygame
+from spectator import SpectatorClient
+from snake_game import draw_cell
+from text_cache import text_cache
+from viewport import Viewport, ChunkCache
+from config import *
+
+
+def draw_board(surface, board, viewport, chunks):
+    """Render the visible part of a BoardState: grid, food, snakes and scores"""
+    heads = [body[0] for body in board.snakes if body]
+    if heads:
+        viewport.follow((sum(column for column, _ in heads) // len(heads) * SNAKE_SIZE,
+                         sum(row for _, row in heads) // len(heads) * SNAKE_SIZE))
+    view = viewport.rect
+    chunks.blit(surface, view, (0, 0))
+    chunks.evict(view)
+
+    def draw(column, row, color):
+        x, y = column * SNAKE_SIZE, row * SNAKE_SIZE
+        if (x, y) in viewport:
+            draw_cell(surface, x - view.x, y - view.y, color)
+
+    if board.food is not None:
+        draw(*board.food, RED)
+
+    for player, body in enumerate(board.snakes):
+        head_color, body_color = PLAYER_COLORS[player % len(PLAYER_COLORS)]
+        for i, (column, row) in enumerate(body):
+            draw(column, row, head_color if i == 0 else body_color)
+
+    if board.players == 1:
+        score = f"Score: {board.scores[0]}"
+    else:
+        score = "  ".join(f"P{player + 1}: {points}" for player, points in enumerate(board.scores))
+    surface.blit(text_cache.render(score, FONT_SIZE, WHITE), (10, 10))
+
+    if board.game_over:
+        if board.players == 1:
+            message = "GAME OVER!"
+        elif board.winner is None:
+            message = "DRAW!"
+        else:
+            message = f"PLAYER {board.winner + 1} WINS!"
+        text = text_cache.render(message, FONT_SIZE, RED)
+        surface.blit(text, text.get_rect(center=(surface.get_width() // 2, surface.get_height() // 2)))
+
+
+async def watch(host, port, fps=RENDER_FPS):
+    """Receive in the background and redraw whenever the board changed"""
+    client = await SpectatorClient().connect(host, port)
+    receiver = asyncio.create_task(client.run())
+
+    pygame.init()
+    pygame.display.set_caption(f"HandSnake - Spectating {host}:{port}")
+    screen = pygame.display.set_mode((GAME_WIDTH, SCREEN_HEIGHT))
+    viewport = chunks = None
+    board = client.board
+    drawn = None
+
+    try:
+        while not receiver.done():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    return
+
+            if board.synced and (board.tick, board.columns, board.rows) != drawn:
+                # Boards larger than the window scroll with the snakes
+                size = (board.columns * SNAKE_SIZE, board.rows * SNAKE_SIZE)
+                if chunks is None or (chunks.world_width, chunks.world_height) != size:
+                    viewport = Viewport(GAME_WIDTH, SCREEN_HEIGHT, *size)
+                    chunks = ChunkCache(*size)
+                    screen = pygame.display.set_mode((viewport.width, viewport.height))
+                draw_board(screen, board, viewport, chunks)
+                pygame.display.flip()
+                drawn = (board.tick, board.columns, board.rows)
+
+            await asyncio.sleep(1 / fps)
+        print("Game closed by the host")
+    finally:
+        receiver.cancel()
+        await client.close()
+        pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a HandSnake game")
+    parser.add_argument("--host", default=SPECTATOR_HOST, help="Machine running the game")
+    parser.add_argument("--port", type=int, default=SPECTATOR_PORT, help="Spectator port of the game")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(watch(args.host, args.port))
+    except ConnectionRefusedError:
+        print(f"No game at {args.host}:{args.port}, start it with: python main.py --spectators")
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Startup
+Background loading of slow subsystems and a startup timing breakdown
+"""
+
+import contextlib
+import threading
+import time
+
+
+class _Phase:
+    """Timing context for one startup phase"""
+
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = self.timer.clock()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.record(self.name, self.start, self.timer.clock())
+        return False
+
+
+class StartupTimer:
+    """
+    Records named startup phases (possibly from several threads) relative
+    to a common start time, for a startup timing breakdown
+    """
+
+    def __init__(self, start=None, clock=time.perf_counter):
+        self.clock = clock
+        self.start = clock() if start is None else start
+        self.phases = []  # (name, start, end) in seconds since self.start
+        self._lock = threading.Lock()
+
+    def phase(self, name):
+        """Context manager timing one phase"""
+        return _Phase(self, name)
+
+    def record(self, name, start, end):
+        with self._lock:
+            self.phases.append((name, start - self.start, end - self.start))
+
+    def mark(self, name):
+        """Record a point in time (a zero-length phase)"""
+        now = self.clock()
+        self.record(name, now, now)
+
+    def report(self):
+        """Breakdown lines ordered by start time"""
+        with self._lock:
+            phases = sorted(self.phases, key=lambda phase: phase[1])
+
+        lines = ["Startup timings (s):"]
+        for name, start, end in phases:
+            if end > start:
+                lines.append(f"  {name:<28}{start:>7.3f} -> {end:>7.3f}  ({end - start:.3f})")
+            else:
+                lines.append(f"  {name:<28}{start:>7.3f}")
+        return "\n".join(lines)
+
+
+class NullStartupTimer:
+    """Drop-in timer that records nothing"""
+
+    _phase = contextlib.nullcontext()
+
+    def phase(self, name):
+        return self._phase
+
+    def record(self, name, start, end):
+        pass
+
+    def mark(self, name):
+        pass
+
+
+NULL_STARTUP_TIMER = NullStartupTimer()
+
+
+class BackgroundLoader:
+    """
+    Runs build() on a daemon thread so the caller can keep drawing.
+    Once done, `result` holds the return value or `error` the exception.
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self.result = None
+        self.error = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="background-loader", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.result = self.build()
+        except Exception as error:
+            self.error = error
+        finally:
+            self._done.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def join(self, timeout=None):
+        """Wait for the build to finish, returns True if it did"""
+        return self._done.wait(timeout)
@@ -0,0 +1,90 @@
+"""
+Text Cache
+Shared cache of fonts and rendered text surfaces
+"""
+
+from collections import OrderedDict
+import pygame
+from config import *
+
+
+class TextCache:
+    """
+    Caches fonts by (name, size) and rendered surfaces by
+    (font name, size, text, colour, shadow). Surfaces are evicted
+    least-recently-used once max_entries is reached.
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._fonts = {}
+        self._surfaces = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size, name=None):
+        """Get a loaded font, loading it on first use"""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self._fonts[key] = font
+        return font
+
+    def render(self, text, size, color, name=None):
+        """Get an antialiased text surface"""
+        key = (name, size, text, color, None)
+        surface = self._lookup(key)
+        if surface is None:
+            surface = self.font(size, name).render(text, True, color)
+            surface = self._store(key, surface)
+        return surface
+
+    def render_shadowed(self, text, size, color, shadow_color=BLACK, offset=(2, 2), name=None):
+        """Get a text surface with its drop shadow baked in"""
+        key = (name, size, text, color, (shadow_color, offset))
+        surface = self._lookup(key)
+        if surface is None:
+            font = self.font(size, name)
+            text_surface = font.render(text, True, color)
+            shadow_surface = font.render(text, True, shadow_color)
+
+            width, height = text_surface.get_size()
+            surface = pygame.Surface((width + offset[0], height + offset[1]), pygame.SRCALPHA)
+            surface.blit(shadow_surface, offset)
+            surface.blit(text_surface, (0, 0))
+            surface = self._store(key, surface)
+        return surface
+
+    def _lookup(self, key):
+        surface = self._surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._surfaces.move_to_end(key)
+        return surface
+
+    def _store(self, key, surface):
+        # Match the display format for faster blits when a display exists
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop all cached surfaces (fonts are kept)"""
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+
+# Shared instance used by the game and the main window
+text_cache = TextCache()
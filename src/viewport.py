@@ -0,0 +1,135 @@
+"""
+Viewport
+The visible window onto a board larger than the game area, and the
+pre-rendered background chunks it is drawn from. Everything here costs
+per visible pixel, never per board cell, so world size doesn't matter.
+"""
+
+import pygame
+from config import *
+
+
+class Viewport:
+    """
+    Window of width x height pixels onto a world_width x world_height board,
+    in board pixels. The view scrolls one cell at a time once the followed
+    point comes within `margin` cells of an edge, and never leaves the board.
+    On a board that fits, the view is the whole board and never moves.
+    """
+
+    def __init__(self, width, height, world_width, world_height, margin=VIEWPORT_MARGIN):
+        self.width = min(width, world_width)
+        self.height = min(height, world_height)
+        self.world_width = world_width
+        self.world_height = world_height
+        self.x = 0
+        self.y = 0
+
+        # Keep the dead zone at least one cell wide
+        self.margin_x = max(min(margin * SNAKE_SIZE, (self.width - SNAKE_SIZE) // 2), 0)
+        self.margin_y = max(min(margin * SNAKE_SIZE, (self.height - SNAKE_SIZE) // 2), 0)
+
+    @property
+    def rect(self):
+        """Visible board area in board pixels"""
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    @property
+    def scrolls(self):
+        return self.width < self.world_width or self.height < self.world_height
+
+    def _clamp(self, x, y):
+        # Whole cells only, so no cell is cut off at the left or top
+        x = min(max(x, 0), self.world_width - self.width) // SNAKE_SIZE * SNAKE_SIZE
+        y = min(max(y, 0), self.world_height - self.height) // SNAKE_SIZE * SNAKE_SIZE
+        moved = (x, y) != (self.x, self.y)
+        self.x, self.y = x, y
+        return moved
+
+    def center(self, point):
+        """Jump to put a board point in the middle, returns True if the view moved"""
+        return self._clamp(point[0] + SNAKE_SIZE // 2 - self.width // 2,
+                           point[1] + SNAKE_SIZE // 2 - self.height // 2)
+
+    def follow(self, point):
+        """Scroll just enough to keep a cell out of the margins, returns True if the view moved"""
+        x, y = self.x, self.y
+        if point[0] < x + self.margin_x:
+            x = point[0] - self.margin_x
+        elif point[0] + SNAKE_SIZE > x + self.width - self.margin_x:
+            x = point[0] + SNAKE_SIZE + self.margin_x - self.width
+        if point[1] < y + self.margin_y:
+            y = point[1] - self.margin_y
+        elif point[1] + SNAKE_SIZE > y + self.height - self.margin_y:
+            y = point[1] + SNAKE_SIZE + self.margin_y - self.height
+        return self._clamp(x, y)
+
+    def __contains__(self, cell):
+        return (self.x <= cell[0] < self.x + self.width
+                and self.y <= cell[1] < self.y + self.height)
+
+
+class ChunkCache:
+    """
+    Board background (black with grid lines) as square chunks of
+    chunk_cells cells, rendered the first time they come into view. Chunks
+    more than keep_distance chunks away from the view are dropped, so memory
+    stays at a few screens however large the board is.
+    """
+
+    def __init__(self, world_width, world_height, chunk_cells=CHUNK_CELLS,
+                 keep_distance=CHUNK_CACHE_DISTANCE):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.size = chunk_cells * SNAKE_SIZE  # Chunk side in pixels
+        self.keep_distance = keep_distance
+        self.chunks = {}  # (chunk column, chunk row) -> Surface
+        self.rendered = 0  # Chunks rendered so far, including re-renders after eviction
+
+    def _render(self, column, row):
+        left, top = column * self.size, row * self.size
+        width = min(self.size, self.world_width - left)
+        height = min(self.size, self.world_height - top)
+        chunk = pygame.Surface((width, height))
+        chunk.fill(BLACK)
+
+        # Chunks start on a cell boundary, so the grid lines up across chunks
+        for x in range(0, width, SNAKE_SIZE):
+            pygame.draw.line(chunk, (30, 30, 30), (x, 0), (x, height))
+        for y in range(0, height, SNAKE_SIZE):
+            pygame.draw.line(chunk, (30, 30, 30), (0, y), (width, y))
+
+        self.rendered += 1
+        return chunk
+
+    def chunk(self, column, row):
+        chunk = self.chunks.get((column, row))
+        if chunk is None:
+            chunk = self.chunks[(column, row)] = self._render(column, row)
+        return chunk
+
+    def blit(self, surface, area, dest):
+        """Draw the background of a board-pixel area with its top left at dest"""
+        left, top = area.topleft
+        area = area.clip(pygame.Rect(0, 0, self.world_width, self.world_height))
+        if not area.width or not area.height:
+            return
+        for row in range(area.top // self.size, (area.bottom - 1) // self.size + 1):
+            for column in range(area.left // self.size, (area.right - 1) // self.size + 1):
+                chunk_rect = pygame.Rect(column * self.size, row * self.size, self.size, self.size)
+                part = chunk_rect.clip(area)
+                surface.blit(
+                    self.chunk(column, row),
+                    (dest[0] + part.x - left, dest[1] + part.y - top),
+                    part.move(-chunk_rect.x, -chunk_rect.y)
+                )
+
+    def evict(self, view):
+        """Drop chunks farther than keep_distance chunks from a board-pixel view rect"""
+        first_column, first_row = view.left // self.size, view.top // self.size
+        last_column, last_row = (view.right - 1) // self.size, (view.bottom - 1) // self.size
+        distance = self.keep_distance
+        for column, row in list(self.chunks):
+            if (column < first_column - distance or column > last_column + distance
+                    or row < first_row - distance or row > last_row + distance):
+                del self.chunks[(column, row)]
@@ -0,0 +1,12 @@
+"""
+Shared helpers for the unit tests
+"""
+
+
+class FakeClock:
+    """Manually advanced clock"""
+    def __init__(self, now=0.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
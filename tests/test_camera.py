@@ -0,0 +1,83 @@
+"""
+Unit tests for Camera Stream
+"""
+
+import unittest
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.camera import CameraStream
+
+
+class StubCapture:
+    """Capture stub that returns increasing integers as frames"""
+    def __init__(self, frames):
+        self.frames = list(frames)
+    
+    def read(self):
+        if not self.frames:
+            return False, None
+        return True, self.frames.pop(0)
+
+
+class SlowCapture:
+    """Capture stub whose reads take a while, and that notices a release during a read"""
+    def __init__(self):
+        self.reading = False
+        self.released = False
+        self.released_during_read = False
+    
+    def read(self):
+        self.reading = True
+        time.sleep(0.05)
+        self.reading = False
+        return True, 0
+    
+    def release(self):
+        self.released_during_read = self.reading
+        self.released = True
+
+
+class TestCameraStream(unittest.TestCase):
+    """Test latest-frame slot behaviour"""
+    
+    def test_keeps_only_newest_frame(self):
+        """Test older unread frames are dropped"""
+        stream = CameraStream(StubCapture(range(1, 6))).start()
+        time.sleep(0.1)
+        stream.stop()
+        
+        frame_id, timestamp, frame = stream.read_latest()
+        self.assertEqual(frame, 5)
+        self.assertEqual(frame_id, 5)
+        self.assertEqual(stream.dropped_frames, 4)
+    
+    def test_frame_read_only_once(self):
+        """Test the same frame is not returned twice"""
+        stream = CameraStream(StubCapture([1])).start()
+        time.sleep(0.05)
+        stream.stop()
+        
+        self.assertIsNotNone(stream.read_latest())
+        self.assertIsNone(stream.read_latest())
+    
+    def test_release_waits_for_read(self):
+        """Test the capture is released on the capture thread, never mid-read"""
+        cap = SlowCapture()
+        stream = CameraStream(cap).start()
+        time.sleep(0.07)
+        stream.stop(release=True)
+        
+        deadline = time.perf_counter() + 2.0
+        while not cap.released and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(cap.released)
+        self.assertFalse(cap.released_during_read)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
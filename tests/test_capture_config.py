@@ -0,0 +1,165 @@
+"""
+Unit tests for Capture Configuration
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+import cv2
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.capture_config import (
+    CaptureMode, apply_mode, probe_modes, choose_mode, configure_capture,
+    fourcc_code, fourcc_name
+)
+
+
+class StubCapture:
+    """
+    Capture object that behaves like a V4L2 camera: unsupported requests
+    snap to the closest mode the device has
+    modes: {(width, height, fourcc): max fps}
+    """
+    def __init__(self, modes):
+        self.modes = modes
+        self.fourcc = next(iter(modes))[2]
+        self.width, self.height = 640, 480
+        self.fps = 30
+        self.buffer_size = 4
+        self.set_calls = 0
+    
+    def getBackendName(self):
+        return "STUB"
+    
+    def set(self, prop, value):
+        self.set_calls += 1
+        if prop == cv2.CAP_PROP_FOURCC:
+            name = fourcc_name(value)
+            if any(fourcc == name for _, _, fourcc in self.modes):
+                self.fourcc = name
+        elif prop == cv2.CAP_PROP_FRAME_WIDTH:
+            self.width = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            self.height = int(value)
+        elif prop == cv2.CAP_PROP_FPS:
+            self.fps = value
+        elif prop == cv2.CAP_PROP_BUFFERSIZE:
+            self.buffer_size = int(value)
+        self._snap()
+        return True
+    
+    def _snap(self):
+        sizes = [(w, h) for w, h, fourcc in self.modes if fourcc == self.fourcc]
+        self.width, self.height = min(
+            sizes, key=lambda size: abs(size[0] - self.width) + abs(size[1] - self.height)
+        )
+        self.fps = min(self.fps, self.modes[(self.width, self.height, self.fourcc)])
+    
+    def get(self, prop):
+        return {
+            cv2.CAP_PROP_FOURCC: float(fourcc_code(self.fourcc)),
+            cv2.CAP_PROP_FRAME_WIDTH: float(self.width),
+            cv2.CAP_PROP_FRAME_HEIGHT: float(self.height),
+            cv2.CAP_PROP_FPS: float(self.fps),
+            cv2.CAP_PROP_BUFFERSIZE: float(self.buffer_size),
+        }.get(prop, 0.0)
+
+
+# A typical USB2 webcam: YUYV is bandwidth-limited above 640x480
+WEBCAM_MODES = {
+    (320, 240, "YUYV"): 30,
+    (640, 480, "YUYV"): 30,
+    (1280, 720, "YUYV"): 10,
+    (640, 480, "MJPG"): 30,
+    (1280, 720, "MJPG"): 30,
+    (1920, 1080, "MJPG"): 30,
+}
+
+
+class TestCaptureModes(unittest.TestCase):
+    """Test probing and choosing native capture modes"""
+    
+    def test_fourcc_round_trip(self):
+        """Test FOURCC codes convert both ways"""
+        self.assertEqual(fourcc_name(fourcc_code("MJPG")), "MJPG")
+    
+    def test_apply_mode_sets_buffer_size(self):
+        """Test the driver queue is limited to one frame"""
+        cap = StubCapture(WEBCAM_MODES)
+        actual = apply_mode(cap, CaptureMode(1280, 720, "MJPG", 30))
+        self.assertEqual(actual, CaptureMode(1280, 720, "MJPG", 30))
+        self.assertEqual(cap.buffer_size, 1)
+    
+    def test_probe_finds_native_modes(self):
+        """Test probing keeps only modes the device reports back unchanged"""
+        modes = probe_modes(StubCapture(WEBCAM_MODES))
+        self.assertEqual(len(modes), len(WEBCAM_MODES))
+        self.assertIn(CaptureMode(1280, 720, "YUYV", 10), modes)
+        self.assertNotIn(CaptureMode(640, 720, "YUYV", 30), modes)
+    
+    def test_choose_smallest_sufficient_mode(self):
+        """Test the cheapest mode covering the minimum size wins, uncompressed first"""
+        modes = probe_modes(StubCapture(WEBCAM_MODES))
+        self.assertEqual(choose_mode(modes, 640, 480, 30), CaptureMode(640, 480, "YUYV", 30))
+    
+    def test_choose_prefers_target_fps(self):
+        """Test a mode that cannot reach the frame rate loses to one that can"""
+        modes = probe_modes(StubCapture(WEBCAM_MODES))
+        self.assertEqual(choose_mode(modes, 1280, 720, 30), CaptureMode(1280, 720, "MJPG", 30))
+    
+    def test_choose_falls_back_to_largest(self):
+        """Test too-small devices still get their best mode"""
+        modes = [CaptureMode(320, 240, "YUYV", 30), CaptureMode(640, 360, "MJPG", 30)]
+        self.assertEqual(choose_mode(modes, 640, 480, 30), CaptureMode(640, 360, "MJPG", 30))
+        self.assertIsNone(choose_mode([], 640, 480, 30))
+
+
+class TestCaptureCache(unittest.TestCase):
+    """Test caching of the chosen mode per device"""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.directory.name, "modes", "capture.json")
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    def test_second_launch_skips_probing(self):
+        """Test a cached mode is applied without probing"""
+        first = StubCapture(WEBCAM_MODES)
+        mode = configure_capture(first, 0, self.cache_path, 640, 480, 30)
+        
+        second = StubCapture(WEBCAM_MODES)
+        self.assertEqual(configure_capture(second, 0, self.cache_path, 640, 480, 30), mode)
+        self.assertLess(second.set_calls, first.set_calls / 5)
+        
+        with open(self.cache_path) as f:
+            self.assertIn("STUB:0", json.load(f))
+    
+    def test_stale_cache_is_reprobed(self):
+        """Test a cached mode the device no longer accepts triggers probing"""
+        configure_capture(StubCapture(WEBCAM_MODES), 0, self.cache_path, 640, 480, 30)
+        
+        # Same device key, but only MJPG now
+        mjpg_only = {key: fps for key, fps in WEBCAM_MODES.items() if key[2] == "MJPG"}
+        mode = configure_capture(StubCapture(mjpg_only), 0, self.cache_path, 640, 480, 30)
+        self.assertEqual(mode, CaptureMode(640, 480, "MJPG", 30))
+    
+    def test_changed_requirements_reprobe(self):
+        """Test cached modes only apply to the requirements they were chosen for"""
+        configure_capture(StubCapture(WEBCAM_MODES), 0, self.cache_path, 640, 480, 30)
+        mode = configure_capture(StubCapture(WEBCAM_MODES), 0, self.cache_path, 1280, 720, 30)
+        self.assertEqual(mode, CaptureMode(1280, 720, "MJPG", 30))
+    
+    def test_no_cache(self):
+        """Test caching can be disabled"""
+        configure_capture(StubCapture(WEBCAM_MODES), 0, None, 640, 480, 30)
+        self.assertFalse(os.path.exists(self.cache_path))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
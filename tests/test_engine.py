@@ -0,0 +1,189 @@
+"""
+Unit tests for the headless Snake Engine
+"""
+
+import unittest
+import subprocess
+import sys
+import os
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.engine import SnakeEngine, BatchSnakeEngine, DIRECTION_CODES
+from src.config import *
+
+
+class TestSnakeEngine(unittest.TestCase):
+    """Test single-game engine"""
+    
+    def play(self, seed):
+        engine = SnakeEngine(200, 200, seed=seed)
+        moves = [UP, LEFT, DOWN, RIGHT, None]
+        history = []
+        for i in range(200):
+            if engine.game_over:
+                engine.reset()
+            engine.update(moves[i * 7 % 5])
+            history.append((tuple(engine.snake.body), engine.food.position, engine.score))
+        return history
+    
+    def test_same_seed_same_game(self):
+        """Test seeded games are reproducible"""
+        self.assertEqual(self.play(3), self.play(3))
+    
+    def test_does_not_import_pygame(self):
+        """Test the engine works without pygame"""
+        src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+        code = "import sys, engine; engine.SnakeEngine(100, 100, 1).update(); print('pygame' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], cwd=src, capture_output=True, text=True)
+        self.assertEqual(output.stdout.strip(), "False")
+    
+    def test_eating_grows_and_scores(self):
+        """Test eating food increases score and length"""
+        engine = SnakeEngine(200, 200, seed=1)
+        head_x, head_y = engine.snake.body[0]
+        engine.food.position = (head_x + SNAKE_SIZE, head_y)
+        engine.update(RIGHT)
+        engine.update(RIGHT)
+        self.assertEqual(engine.score, 10)
+        self.assertEqual(len(engine.snake.body), 2)
+
+
+class TestMultiplayerEngine(unittest.TestCase):
+    """Test several snakes on one board"""
+    
+    def setUp(self):
+        self.engine = SnakeEngine(400, 300, seed=0, players=2)
+        self.engine.food.position = None  # Keep food out of the way
+    
+    def place(self, player, body, direction):
+        snake = self.engine.snakes[player]
+        snake.body = [(x * SNAKE_SIZE, y * SNAKE_SIZE) for x, y in body]
+        snake.direction = direction
+    
+    def test_start_apart(self):
+        """Test snakes start on separate rows heading in opposite directions"""
+        first, second = self.engine.snakes
+        self.assertIs(self.engine.snake, first)
+        self.assertNotEqual(first.body[0][1], second.body[0][1])
+        self.assertEqual((first.direction, second.direction), (RIGHT, LEFT))
+    
+    def test_directions_per_player(self):
+        """Test each direction drives its own snake"""
+        self.engine.update(UP, DOWN)
+        self.assertEqual([snake.direction for snake in self.engine.snakes], [UP, DOWN])
+        self.engine.update(None, RIGHT)
+        self.assertEqual([snake.direction for snake in self.engine.snakes], [UP, RIGHT])
+    
+    def test_shared_free_cells(self):
+        """Test food never spawns on either snake"""
+        self.place(0, [(2, 2), (1, 2), (0, 2)], RIGHT)
+        self.place(1, [(10, 8), (11, 8)], LEFT)
+        free = self.engine.food.free_cells
+        self.assertEqual(len(free), 20 * 15 - 5)
+        self.assertNotIn((10 * SNAKE_SIZE, 8 * SNAKE_SIZE), free)
+    
+    def test_running_into_other_snake(self):
+        """Test hitting another snake's body ends the game for that snake"""
+        self.place(0, [(5, 5), (4, 5)], RIGHT)
+        self.place(1, [(6, 4), (6, 5), (6, 6), (6, 7)], UP)
+        self.engine.update()
+        self.assertTrue(self.engine.game_over)
+        self.assertEqual(self.engine.winner, 1)
+    
+    def test_head_on_is_a_draw(self):
+        """Test heads meeting on one cell is a draw"""
+        self.place(0, [(4, 5), (3, 5)], RIGHT)
+        self.place(1, [(6, 5), (7, 5)], LEFT)
+        self.engine.update()
+        self.assertTrue(self.engine.game_over)
+        self.assertIsNone(self.engine.winner)
+    
+    def test_following_a_tail(self):
+        """Test moving into the cell another tail just left is safe"""
+        self.place(0, [(6, 6), (6, 7)], UP)
+        self.place(1, [(8, 5), (7, 5), (6, 5)], RIGHT)
+        self.engine.update()
+        self.assertFalse(self.engine.game_over)
+        self.assertEqual(self.engine.snakes[0].body[0], (6 * SNAKE_SIZE, 5 * SNAKE_SIZE))
+    
+    def test_free_cells_when_following_a_tail(self):
+        """Test the shared free-cell index matches the bodies every tick"""
+        self.place(0, [(11, 5), (12, 5)], LEFT)
+        self.place(1, [(8, 5), (9, 5), (10, 5)], LEFT)
+        free = self.engine.food.free_cells
+        cells = {(x * SNAKE_SIZE, y * SNAKE_SIZE) for x in range(20) for y in range(15)}
+        
+        for _ in range(5):
+            self.engine.update()
+            self.assertFalse(self.engine.game_over)
+            taken = {cell for snake in self.engine.snakes for cell in snake.body}
+            self.assertEqual({cell for cell in cells if cell in free}, cells - taken)
+            self.assertEqual(len(free), len(cells) - len(taken))
+    
+    def test_scores_per_player(self):
+        """Test food scores for the snake that ate it"""
+        self.place(1, [(10, 10), (11, 10)], LEFT)
+        self.engine.food.position = (9 * SNAKE_SIZE, 10 * SNAKE_SIZE)
+        self.engine.update()
+        self.assertEqual(self.engine.scores, [0, 10])
+        self.assertEqual(self.engine.score, 10)
+
+
+class TestBatchSnakeEngine(unittest.TestCase):
+    """Test vectorized multi-game engine"""
+    
+    def test_wall_death_and_auto_reset(self):
+        """Test games hitting the wall end and restart"""
+        engine = BatchSnakeEngine(4, 6, 6, seed=0)
+        engine.food[:] = (0, 0)
+        for _ in range(2):
+            scores, done, observations = engine.step()
+            self.assertFalse(done.any())
+        scores, done, observations = engine.step()
+        self.assertTrue(done.all())
+        self.assertTrue((observations[:, 0] == 3).all())
+    
+    def test_eating(self):
+        """Test eating grows the snake and keeps the tail for a tick"""
+        engine = BatchSnakeEngine(2, 8, 8, seed=0)
+        engine.food[:] = (5, 4)
+        engine.food[1] = (0, 0)
+        scores, done, _ = engine.step()
+        self.assertEqual(list(scores), [10, 0])
+        self.assertEqual(list(engine.lengths), [2, 1])
+        
+        engine.step()
+        boards = engine.grid_observations()
+        self.assertEqual(boards[0, 4, 6], 2)
+        self.assertEqual(boards[0, 4, 5], 1)
+        self.assertEqual(boards[0, 4, 4], 0)
+    
+    def test_reverse_direction_ignored(self):
+        """Test a snake cannot turn back on itself"""
+        engine = BatchSnakeEngine(1, 8, 8, seed=0)
+        engine.step([DIRECTION_CODES[LEFT]])
+        self.assertEqual(engine.directions[0], DIRECTION_CODES[RIGHT])
+    
+    def test_self_collision(self):
+        """Test running into the body ends the game"""
+        engine = BatchSnakeEngine(1, 8, 8, seed=0)
+        engine.food[:] = (0, 0)
+        engine.lengths[0] = 5
+        
+        # Length 5 snake circling a 2x2 square runs into its own body
+        moves = (RIGHT, DOWN, LEFT, UP, RIGHT)
+        results = [bool(engine.step([DIRECTION_CODES[d]])[1][0]) for d in moves]
+        self.assertEqual(results, [False, False, False, False, True])
+    
+    def test_seeded_batches_match(self):
+        """Test the same seed gives the same food placement"""
+        a = BatchSnakeEngine(16, 10, 10, seed=5)
+        b = BatchSnakeEngine(16, 10, 10, seed=5)
+        np.testing.assert_array_equal(a.food, b.food)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
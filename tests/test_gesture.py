@@ -6,11 +6,18 @@ import unittest
 import sys
 import os
 import numpy as np
+import cv2
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.config import *
+from src.engine import DIRECTION_CODES, NO_DIRECTION
+from src.gesture_controller import (
+    hand_roi, map_landmarks_to_frame, DirectionPredictor, classify_offsets,
+    classify_directions, direction_from_offset, landmarks_to_array, landmarks_from_points,
+    PlayerAssigner, HandDetector, GestureController
+)
 
 
 class MockHandLandmark:
@@ -115,6 +122,279 @@ class TestGestureDetection(unittest.TestCase):
         self.assertEqual(direction, NONE)
 
 
+class MockLandmarkList:
+    """Mock landmark list with any number of points"""
+    def __init__(self, points):
+        self.landmark = [MockHandLandmark(x, y) for x, y in points]
+
+
+class TestHandRoi(unittest.TestCase):
+    """Test region-of-interest helpers"""
+    
+    def test_roi_contains_hand(self):
+        """Test crop covers all landmarks with margin"""
+        hand = MockLandmarkList([(0.4, 0.4), (0.6, 0.5)])
+        x0, y0, x1, y1 = hand_roi(hand, 640, 720, 0.5)
+        self.assertLess(x0, 0.4 * 640)
+        self.assertGreater(x1, 0.6 * 640)
+        self.assertLess(y0, 0.4 * 720)
+        self.assertGreater(y1, 0.5 * 720)
+    
+    def test_roi_clamped_to_frame(self):
+        """Test crop never leaves the frame"""
+        hand = MockLandmarkList([(0.0, 0.0), (0.05, 0.05)])
+        x0, y0, x1, y1 = hand_roi(hand, 640, 720, 0.5)
+        self.assertEqual((x0, y0), (0, 0))
+        self.assertLessEqual(x1, 640)
+        self.assertLessEqual(y1, 720)
+    
+    def test_map_landmarks_to_frame(self):
+        """Test crop coordinates map back to full-frame coordinates"""
+        hand = MockLandmarkList([(0.5, 0.5), (0.0, 1.0)])
+        map_landmarks_to_frame(hand, (100, 200, 300, 400), 640, 720)
+        self.assertAlmostEqual(hand.landmark[0].x, 200 / 640)
+        self.assertAlmostEqual(hand.landmark[0].y, 300 / 720)
+        self.assertAlmostEqual(hand.landmark[1].x, 100 / 640)
+        self.assertAlmostEqual(hand.landmark[1].y, 400 / 720)
+
+
+class TestBatchClassification(unittest.TestCase):
+    """Test vectorized landmark extraction and direction classification"""
+    
+    def test_landmarks_to_array(self):
+        """Test landmark lists become one (hands, 21, 3) array"""
+        points = np.random.default_rng(0).random((21, 3))
+        hands = [landmarks_from_points(points), landmarks_from_points(points[::-1])]
+        array = landmarks_to_array(hands)
+        
+        self.assertEqual(array.shape, (2, 21, 3))
+        np.testing.assert_allclose(array[0], points, atol=1e-6)
+        np.testing.assert_allclose(array[1], points[::-1], atol=1e-6)
+    
+    def test_landmarks_to_array_without_hands(self):
+        """Test no hands gives an empty batch"""
+        self.assertEqual(landmarks_to_array(None).shape, (0, 21, 3))
+        self.assertEqual(landmarks_to_array([]).shape, (0, 21, 3))
+    
+    def test_classify_offsets(self):
+        """Test batch codes follow the single-hand rules"""
+        offsets = [(-0.3, 0.0), (0.3, 0.0), (0.0, -0.3), (0.0, 0.3), (0.05, 0.05), (0.14, 0.0)]
+        codes = classify_offsets(offsets, 0.15)
+        expected = [DIRECTION_CODES[LEFT], DIRECTION_CODES[RIGHT], DIRECTION_CODES[UP],
+                    DIRECTION_CODES[DOWN], NO_DIRECTION, NO_DIRECTION]
+        self.assertEqual(codes.tolist(), expected)
+    
+    def test_horizontal_priority(self):
+        """Test diagonal offsets resolve to the larger axis"""
+        self.assertEqual(direction_from_offset(0.3, 0.2, 0.15), RIGHT)
+        self.assertEqual(direction_from_offset(0.2, -0.3, 0.15), UP)
+    
+    def test_classify_directions(self):
+        """Test frames are classified by their wrist, masked by presence"""
+        landmarks = np.full((4, 21, 3), 0.5, dtype=np.float32)
+        landmarks[0, 0, 0] = 0.1   # Wrist left
+        landmarks[1, 0, 1] = 0.9   # Wrist down
+        landmarks[2, 1:, 0] = 0.9  # Other landmarks do not count
+        landmarks[3, 0, 0] = 0.9   # Right, but no hand in this frame
+        
+        codes = classify_directions(landmarks, 0.15, present=[True, True, True, False])
+        self.assertEqual(codes.tolist(), [DIRECTION_CODES[LEFT], DIRECTION_CODES[DOWN],
+                                          NO_DIRECTION, NO_DIRECTION])
+    
+    def test_single_frame_matches_batch(self):
+        """Test the single-frame path is the batch path for one frame"""
+        rng = np.random.default_rng(1)
+        landmarks = rng.random((200, 21, 3))
+        codes = classify_directions(landmarks, 0.15)
+        for frame, code in zip(landmarks, codes):
+            direction = direction_from_offset(frame[0, 0] - 0.5, frame[0, 1] - 0.5, 0.15)
+            expected = DIRECTION_CODES.get(direction, NO_DIRECTION)
+            self.assertEqual(code, expected)
+
+
+class TestDirectionPredictor(unittest.TestCase):
+    """Test latency-compensating direction prediction"""
+    
+    def feed(self, predictor, xs, latency=0.1, fps=30):
+        return [predictor.update(x, 0.0, i / fps, latency) for i, x in enumerate(xs)]
+    
+    def test_commits_before_crossing(self):
+        """Test steady movement towards a zone commits the direction early"""
+        predictor = DirectionPredictor(0.15)
+        xs = [0.03 * i for i in range(5)]  # 0.9 frame widths per second
+        directions = self.feed(predictor, xs)
+        
+        self.assertEqual(directions[-1], RIGHT)
+        self.assertLess(xs[-1], 0.15)
+        self.assertEqual(predictor.early_directions, 1)
+    
+    def test_needs_agreeing_frames(self):
+        """Test a single predicted frame is not enough"""
+        predictor = DirectionPredictor(0.15, confirm_frames=2)
+        directions = self.feed(predictor, [0.0, 0.03, 0.06, 0.09])
+        self.assertEqual(directions[-1], NONE)
+    
+    def test_no_latency_no_prediction(self):
+        """Test without latency only crossed thresholds count"""
+        predictor = DirectionPredictor(0.15)
+        directions = self.feed(predictor, [0.03 * i for i in range(5)], latency=0.0)
+        self.assertEqual(directions, [NONE] * 5)
+    
+    def test_jitter_is_ignored(self):
+        """Test noise near the threshold does not trigger a direction"""
+        predictor = DirectionPredictor(0.15)
+        rng = np.random.default_rng(0)
+        xs = 0.12 + rng.normal(0, 0.004, 60)
+        self.assertEqual(set(self.feed(predictor, xs)), {NONE})
+    
+    def test_measured_direction_wins(self):
+        """Test a hand already in a zone reports that zone"""
+        predictor = DirectionPredictor(0.15)
+        self.assertEqual(predictor.update(0.0, -0.3, 0.0, 0.1), UP)
+    
+    def test_moving_away_is_not_predicted(self):
+        """Test a hand heading back to the center is not extrapolated into a zone"""
+        predictor = DirectionPredictor(0.15, confirm_frames=1)
+        directions = self.feed(predictor, [0.14 - 0.03 * i for i in range(5)])
+        self.assertEqual(set(directions), {NONE})
+    
+    def test_reset_forgets_motion(self):
+        """Test reset drops history so predictions start over"""
+        predictor = DirectionPredictor(0.15, confirm_frames=1)
+        self.feed(predictor, [0.0, 0.03, 0.06])
+        predictor.reset()
+        self.assertEqual(predictor.update(0.09, 0.0, 1.0, 0.1), NONE)
+
+
+class TestPlayerAssigner(unittest.TestCase):
+    """Test keeping players on the same hand"""
+    
+    def setUp(self):
+        self.assigner = PlayerAssigner(2, handedness_penalty=0.3, memory=3)
+    
+    def test_initial_left_to_right(self):
+        players = self.assigner.assign(np.array([[0.8, 0.5], [0.2, 0.5]]))
+        self.assertEqual(players, [1, 0])
+    
+    def test_follows_crossing_hands(self):
+        """Hands that pass each other keep their players"""
+        self.assigner.assign(np.array([[0.3, 0.5], [0.7, 0.5]]))
+        for step in range(1, 9):
+            offset = 0.05 * step
+            players = self.assigner.assign(np.array([[0.7 - offset, 0.4], [0.3 + offset, 0.6]]))
+            self.assertEqual(players, [1, 0])
+    
+    def test_handedness_breaks_ties(self):
+        self.assigner.assign(np.array([[0.45, 0.5], [0.55, 0.5]]), ["Right", "Left"])
+        
+        # Both hands now equally far from both players
+        players = self.assigner.assign(np.array([[0.5, 0.45], [0.5, 0.55]]), ["Left", "Right"])
+        self.assertEqual(players, [1, 0])
+    
+    def test_more_hands_than_players(self):
+        players = self.assigner.assign(np.array([[0.2, 0.5], [0.5, 0.5], [0.8, 0.5]]))
+        self.assertEqual(sorted(p for p in players if p is not None), [0, 1])
+        self.assertEqual(players.count(None), 1)
+    
+    def test_single_hand_keeps_other_player(self):
+        self.assigner.assign(np.array([[0.2, 0.5], [0.8, 0.5]]))
+        self.assertEqual(self.assigner.assign(np.array([[0.75, 0.5]])), [1])
+        self.assertEqual(self.assigner.assign(np.empty((0, 2))), [])
+    
+    def test_memory_expires(self):
+        """A player unseen for too long is placed by frame position again"""
+        self.assigner.assign(np.array([[0.2, 0.5], [0.8, 0.5]]))
+        for _ in range(4):
+            self.assigner.assign(np.array([[0.2, 0.5]]))
+        self.assertIsNone(self.assigner.positions[1])
+        
+        # Player 0 keeps their hand, player 1 is free again
+        players = self.assigner.assign(np.array([[0.25, 0.5], [0.3, 0.5]]))
+        self.assertEqual(players, [0, 1])
+
+
+class TestModelRebuild(unittest.TestCase):
+    """Test switching the hand model without stalling detection"""
+    
+    def test_background_rebuild(self):
+        detector = HandDetector(model_complexity=1, background_rebuild=True)
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        try:
+            detector.set_quality(0.5, 0)
+            self.assertEqual(detector.model_complexity, 1)  # Still the old model
+            detector.process(frame)
+            
+            # Swapped in by the first frame after the build finished
+            self.assertTrue(detector._rebuild.join(timeout=30.0))
+            detector.process(frame)
+            self.assertEqual(detector.model_complexity, 0)
+            self.assertIsNone(detector._rebuild)
+        finally:
+            detector.close()
+    
+    def test_inline_rebuild(self):
+        detector = HandDetector(model_complexity=1)
+        try:
+            detector.set_quality(1.0, 0)
+            self.assertEqual(detector.model_complexity, 0)
+        finally:
+            detector.close()
+
+
+def blend_zones(frame, threshold):
+    """The zone overlay as it used to be drawn every frame: crosshair, then a blended copy, then labels"""
+    height, width = frame.shape[:2]
+    zone_size = int(width * threshold)
+    center_x, center_y = width // 2, height // 2
+    cv2.line(frame, (center_x - 20, center_y), (center_x + 20, center_y), (255, 255, 255), 2)
+    cv2.line(frame, (center_x, center_y - 20), (center_x, center_y + 20), (255, 255, 255), 2)
+    
+    overlay = frame.copy()
+    cv2.rectangle(overlay, (0, 0), (center_x - zone_size, height), (255, 0, 0), -1)
+    cv2.rectangle(overlay, (center_x + zone_size, 0), (width, height), (255, 0, 0), -1)
+    cv2.rectangle(overlay, (0, 0), (width, center_y - zone_size), (0, 255, 0), -1)
+    cv2.rectangle(overlay, (0, center_y + zone_size), (width, height), (0, 255, 0), -1)
+    cv2.addWeighted(overlay, 0.3, frame, 0.7, 0, frame)
+    
+    for text, origin in (("LEFT", (20, center_y)), ("RIGHT", (width - 100, center_y)),
+                         ("UP", (center_x - 20, 30)), ("DOWN", (center_x - 40, height - 20))):
+        cv2.putText(frame, text, origin, cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+
+class TestZoneOverlay(unittest.TestCase):
+    """Test the cached zone overlay draws what the per-frame blend did"""
+    
+    def setUp(self):
+        self.controller = GestureController(source=None, backend="blob")
+        self.rng = np.random.default_rng(0)
+    
+    def tearDown(self):
+        self.controller.release()
+    
+    def assert_matches_blend(self, width, height, threshold):
+        self.controller.gesture_threshold = threshold
+        frame = self.rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        expected = frame.copy()
+        blend_zones(expected, threshold)
+        self.controller._draw_zones(frame)
+        np.testing.assert_array_equal(frame, expected)
+    
+    def test_matches_per_frame_blend(self):
+        """Test zones, overlapping corners, the center square and labels"""
+        self.assert_matches_blend(320, 240, 0.15)
+        self.assert_matches_blend(320, 240, 0.15)  # From the cache
+    
+    def test_crosshair_reaching_into_zones(self):
+        """Test a crosshair wider than the center square is tinted like before"""
+        self.assert_matches_blend(160, 120, 0.1)
+    
+    def test_rebuilt_on_changes(self):
+        """Test a new threshold or frame size rebuilds the overlay"""
+        self.assert_matches_blend(320, 240, 0.15)
+        self.assert_matches_blend(320, 240, 0.25)
+        self.assert_matches_blend(200, 160, 0.25)
+
+
 class TestConfigValues(unittest.TestCase):
     """Test configuration values"""
     
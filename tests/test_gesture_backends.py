@@ -0,0 +1,136 @@
+"""
+Unit tests for the gesture backends
+"""
+
+import unittest
+import sys
+import os
+import subprocess
+import numpy as np
+import cv2
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import *
+from src.gesture_backends import BlobBackend, detections_from_landmarks, no_hands
+from src.gesture_controller import GestureController, create_backend
+from src.profiler import FrameProfiler
+
+SKIN = (120, 150, 220)  # BGR, inside the default YCrCb skin range
+WIDTH, HEIGHT = 320, 240
+
+
+def frame_with(*blobs):
+    """Dark frame with skin-coloured ellipses at normalized (x, y, radius)"""
+    frame = np.full((HEIGHT, WIDTH, 3), 30, dtype=np.uint8)
+    for x, y, radius in blobs:
+        center = (int(x * WIDTH), int(y * HEIGHT))
+        axes = (int(radius * WIDTH), int(radius * WIDTH * 1.3))
+        cv2.ellipse(frame, center, axes, 0, 0, 360, SKIN, -1)
+    return frame
+
+
+class TestBlobBackend(unittest.TestCase):
+    """Test finding hands as skin blobs"""
+
+    def test_finds_blob_centre(self):
+        backend = BlobBackend(motion_mask=False)
+        hands = backend.detect(frame_with((0.7, 0.4, 0.08)), 0.0)
+        self.assertEqual(len(hands.positions), 1)
+        np.testing.assert_allclose(hands.positions[0], (0.7, 0.4), atol=0.02)
+        self.assertIsNone(hands.landmarks)
+        self.assertGreater(hands.confidences[0], 0.5)
+
+    def test_empty_frame(self):
+        hands = BlobBackend(motion_mask=False).detect(frame_with(), 0.0)
+        self.assertEqual(len(hands.positions), 0)
+        self.assertEqual(len(hands.confidences), 0)
+
+    def test_ignores_small_blobs(self):
+        hands = BlobBackend(motion_mask=False).detect(frame_with((0.5, 0.5, 0.01)), 0.0)
+        self.assertEqual(len(hands.positions), 0)
+
+    def test_largest_blobs_first(self):
+        frame = frame_with((0.2, 0.5, 0.06), (0.8, 0.5, 0.1), (0.5, 0.2, 0.04))
+        hands = BlobBackend(max_hands=2, motion_mask=False).detect(frame, 0.0)
+        self.assertEqual(len(hands.positions), 2)
+        np.testing.assert_allclose(hands.positions[0], (0.8, 0.5), atol=0.02)
+        np.testing.assert_allclose(hands.positions[1], (0.2, 0.5), atol=0.02)
+
+    def test_still_blob_fades_into_background(self):
+        backend = BlobBackend()
+        for _ in range(5):
+            backend.detect(frame_with(), 0.0)
+        self.assertEqual(len(backend.detect(frame_with((0.5, 0.5, 0.08)), 0.0).positions), 1)
+
+        for _ in range(BLOB_MOTION_HISTORY * 3):
+            hands = backend.detect(frame_with((0.5, 0.5, 0.08)), 0.0)
+        self.assertEqual(len(hands.positions), 0)
+
+    def test_lower_quality_still_finds_blob(self):
+        backend = BlobBackend(motion_mask=False)
+        backend.set_quality(0.5, 0)
+        hands = backend.detect(frame_with((0.3, 0.6, 0.08)), 0.0)
+        np.testing.assert_allclose(hands.positions[0], (0.3, 0.6), atol=0.03)
+
+
+class TestDetections(unittest.TestCase):
+    """Test the shared detection format"""
+
+    def test_positions_at_wrist(self):
+        landmarks = np.random.default_rng(0).random((2, 21, 3))
+        hands = detections_from_landmarks(landmarks, ["Left", "Right"])
+        np.testing.assert_allclose(hands.positions, landmarks[:, 0, :2], rtol=1e-6)
+        np.testing.assert_array_equal(hands.confidences, [1.0, 1.0])
+
+    def test_no_hands(self):
+        self.assertEqual(no_hands().landmarks.shape, (0, 21, 3))
+        self.assertIsNone(no_hands(landmarks=False).landmarks)
+
+
+class TestControllerWithBlobBackend(unittest.TestCase):
+    """Test steering through GestureController with the blob backend"""
+
+    def test_directions(self):
+        controller = GestureController(source=None, backend="blob")
+        self.assertEqual(controller.inference_mode, "inline")
+        controller.detect_gestures(frame_with(), annotate=False)
+
+        directions, _ = controller.detect_gestures(frame_with((0.85, 0.5, 0.08)))
+        self.assertEqual(directions, [RIGHT])
+        directions, _ = controller.detect_gestures(frame_with((0.5, 0.1, 0.08)))
+        self.assertEqual(directions, [UP])
+        controller.release()
+
+    def test_profiler_attached_after_warm_up(self):
+        controller = GestureController(source=None, backend="blob")
+        controller.warm_up()
+        
+        profiler = FrameProfiler(history=0)
+        controller.set_profiler(profiler)
+        controller.detect_gestures(frame_with((0.85, 0.5, 0.08)), annotate=False)
+        profiler.end_frame()
+        self.assertIn("detect.process", profiler.stage_names)
+        controller.release()
+    
+    def test_does_not_import_mediapipe(self):
+        """Test the blob backend runs without loading MediaPipe"""
+        src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+        code = ("import sys, numpy, gesture_controller; "
+                "c = gesture_controller.GestureController(source=None, backend='blob'); c.warm_up(); "
+                "c.detect_gestures(numpy.zeros((240, 320, 3), numpy.uint8)); print('mediapipe' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", code], cwd=src, capture_output=True, text=True)
+        self.assertEqual(output.stdout.strip(), "False")
+    
+    def test_camera_not_available(self):
+        with self.assertRaisesRegex(RuntimeError, "camera not available"):
+            GestureController(source="/nonexistent/clip.mp4", backend="blob")
+    
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_backend("leap")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,107 @@
+"""
+Unit tests for the out-of-process inference worker
+"""
+
+import unittest
+import sys
+import os
+import time
+from types import SimpleNamespace
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.inference_worker import InferenceWorker
+
+FRAME_SHAPE = (48, 64, 3)
+INFERENCE_TIME = 0.3  # Seconds per stub detection
+
+
+class StubDetector:
+    """Slow stand-in for HandDetector: one hand whose wrist x is the frame's first pixel / 255"""
+
+    def __init__(self, max_hands=1):
+        self.max_hands = max_hands
+
+    def process(self, frame):
+        time.sleep(INFERENCE_TIME)
+        value = float(frame[0, 0, 0]) / 255
+        landmark = [SimpleNamespace(x=value, y=0.5, z=0.0)] * 21
+        return SimpleNamespace(multi_hand_landmarks=[SimpleNamespace(landmark=landmark)],
+                               multi_handedness=None)
+
+    def set_quality(self, scale, model_complexity):
+        pass
+
+    def close(self):
+        pass
+
+
+class BrokenDetector(StubDetector):
+    """Fails like a model that can't start"""
+
+    def __init__(self, max_hands=1):
+        raise RuntimeError("no model")
+
+
+def frame(frame_id):
+    return np.full(FRAME_SHAPE, frame_id, dtype=np.uint8)
+
+
+class TestInferenceWorker(unittest.TestCase):
+    """Test the frame ring and result handling against a stub detector"""
+
+    def wait_for(self, worker, frame_id, timeout=30.0):
+        """Poll until the result of frame_id arrives, returns the results seen on the way"""
+        seen = []
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            result = worker.poll()
+            if result is not None and (not seen or seen[-1] != result[0]):
+                seen.append(result[0])
+                if result[0] == frame_id:
+                    return seen
+            time.sleep(0.01)
+        self.fail(f"No result for frame {frame_id}, got {seen}")
+
+    def test_runs_newest_queued_frame(self):
+        worker = InferenceWorker(FRAME_SHAPE, slots=3, create_detector=StubDetector)
+        try:
+            # Frame 1 once the worker is up
+            self.assertTrue(worker.submit(1, frame(1)))
+            self.wait_for(worker, 1)
+
+            # Frame 2 is being processed while 3 and 4 queue up, 5 finds no free slot
+            self.assertTrue(worker.submit(2, frame(2)))
+            time.sleep(INFERENCE_TIME / 3)
+            self.assertTrue(worker.submit(3, frame(3)))
+            self.assertTrue(worker.submit(4, frame(4)))
+            self.assertFalse(worker.submit(5, frame(5)))
+
+            # 3 is skipped: results never lag more than one detection behind
+            self.assertEqual(self.wait_for(worker, 4), [1, 2, 4])
+            frame_id, landmarks, labels = worker.poll()
+            self.assertAlmostEqual(float(landmarks[0, 0, 0]), 4 / 255, places=5)
+            self.assertEqual(labels, [])
+
+            # Every slot is free again
+            self.assertEqual(worker._in_flight, 0)
+            self.assertEqual(worker.dropped_frames, 1)
+        finally:
+            worker.close()
+
+    def test_dead_worker_is_reported(self):
+        worker = InferenceWorker(FRAME_SHAPE, create_detector=BrokenDetector)
+        try:
+            worker.process.join(timeout=30.0)
+            with self.assertRaises(RuntimeError):
+                worker.poll()
+            with self.assertRaises(RuntimeError):
+                worker.submit(1, frame(1))
+        finally:
+            worker.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,96 @@
+"""
+Unit tests for the Frame Profiler
+"""
+
+import unittest
+import sys
+import os
+import csv
+import json
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.profiler import FrameProfiler, NULL_PROFILER
+
+
+class TestFrameProfiler(unittest.TestCase):
+    """Test stage timing and export"""
+    
+    def setUp(self):
+        self.profiler = FrameProfiler(window=100)
+        for i in range(100):
+            self.profiler.record("stage", float(i))
+            self.profiler.end_frame()
+    
+    def test_percentiles(self):
+        """Test rolling percentiles over recorded samples"""
+        p50, p95, p99 = self.profiler.percentiles("stage")
+        self.assertAlmostEqual(p50, 49.5, places=3)
+        self.assertAlmostEqual(p95, 94.05, places=3)
+        self.assertGreater(p99, p95)
+    
+    def test_window_keeps_latest_samples(self):
+        """Test old samples roll out of the window"""
+        for _ in range(100):
+            self.profiler.record("stage", 1000.0)
+            self.profiler.end_frame()
+        self.assertEqual(self.profiler.percentiles("stage"), (1000.0, 1000.0, 1000.0))
+    
+    def test_stage_context_accumulates(self):
+        """Test a stage entered twice in a frame adds up"""
+        profiler = FrameProfiler()
+        for _ in range(2):
+            with profiler.stage("twice"):
+                pass
+        profiler.end_frame()
+        self.assertIn("twice", profiler.stage_names)
+        self.assertIn("frame", profiler.stage_names)
+    
+    def test_export_csv_and_json(self):
+        """Test per-frame export formats"""
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, "timings.csv")
+            self.profiler.export(csv_path)
+            with open(csv_path) as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0][:2], ["frame", "stage"])
+            self.assertEqual(len(rows), 101)
+            
+            json_path = os.path.join(directory, "timings.json")
+            self.profiler.export(json_path)
+            with open(json_path) as f:
+                data = json.load(f)
+            self.assertEqual(len(data["frames"]), 100)
+            self.assertIn("stage", data["summary"])
+    
+    def test_history_wraps_and_can_be_off(self):
+        """Test only the latest frames are kept, and none without history"""
+        profiler = FrameProfiler(window=10, history=50)
+        for i in range(120):
+            profiler.record("stage", float(i))
+            if i % 2:
+                profiler.record("odd", 1.0)
+            profiler.end_frame()
+        frames = profiler.frames
+        self.assertEqual([index for index, _ in frames], list(range(70, 120)))
+        self.assertEqual(frames[0][1], {"stage": 70.0, "frame": frames[0][1]["frame"]})
+        self.assertIn("odd", frames[1][1])
+        
+        profiler = FrameProfiler(window=10, history=0)
+        for i in range(20):
+            profiler.record("stage", float(i))
+            profiler.end_frame()
+        self.assertEqual(profiler.frames, [])
+        self.assertEqual(profiler.percentiles("stage")[0], 14.5)
+    
+    def test_null_profiler(self):
+        """Test disabled profiler accepts the same calls"""
+        with NULL_PROFILER.stage("anything"):
+            pass
+        NULL_PROFILER.end_frame()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,104 @@
+"""
+Unit tests for the adaptive quality governor
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.quality import QualityGovernor, QUALITY_LEVELS
+
+
+class TestQualityGovernor(unittest.TestCase):
+    """Test stepping between quality levels"""
+
+    def setUp(self):
+        # 25 ms budget, decisions on 10-frame windows
+        self.governor = QualityGovernor(target_fps=40, window=10, up_headroom=0.6, up_frames=20)
+
+    def run_frames(self, frame_ms, frames):
+        """Feed equal frames, returns the number of level changes"""
+        changes = 0
+        for _ in range(frames):
+            changes += self.governor.update(frame_ms)
+        return changes
+
+    def test_steps_down_when_over_budget(self):
+        self.assertEqual(self.run_frames(30, 9), 0)  # Window not full yet
+        self.assertEqual(self.run_frames(30, 1), 1)
+        self.assertEqual(self.governor.level, 1)
+
+        # Each level is judged on a fresh window
+        self.assertEqual(self.run_frames(30, 9), 0)
+        self.assertEqual(self.run_frames(30, 1), 1)
+        self.assertEqual(self.governor.level, 2)
+
+    def test_stops_at_lowest_level(self):
+        self.run_frames(100, 1000)
+        self.assertEqual(self.governor.level, len(QUALITY_LEVELS) - 1)
+        self.assertEqual(self.governor.changes, len(QUALITY_LEVELS) - 1)
+
+    def test_single_spike_is_averaged_out(self):
+        self.run_frames(10, 9)
+        self.governor.update(120)
+        self.assertEqual(self.governor.level, 0)
+
+    def test_steps_up_only_with_headroom(self):
+        self.run_frames(30, 20)
+        self.assertEqual(self.governor.level, 2)
+
+        # Within budget but not much headroom: stays put
+        self.assertEqual(self.run_frames(20, 500), 0)
+
+        # Clear headroom once the window average drops below 15 ms (6 frames), for 20 frames
+        self.run_frames(10, 24)
+        self.assertEqual(self.governor.level, 2)
+        self.run_frames(10, 1)
+        self.assertEqual(self.governor.level, 1)
+
+    def test_alternating_frames_use_the_average(self):
+        """Inference every other frame is fine if the average fits"""
+        for _ in range(200):
+            self.governor.update(40)
+            self.governor.update(5)
+        self.assertEqual(self.governor.level, 0)
+
+    def test_settles_within_budget(self):
+        """Level 1 is too slow for the budget, level 2 fits without much headroom"""
+        costs = [40, 30, 18, 10, 8, 6]
+        for _ in range(20000):
+            self.governor.update(costs[self.governor.level])
+        self.assertEqual(self.governor.level, 2)
+        self.assertEqual(self.governor.changes, 2)
+
+    def test_failed_step_up_backs_off(self):
+        """Level 1 looks affordable from level 2 but isn't, each retry waits twice as long"""
+        costs = [40, 30, 14, 10, 8, 6]
+        up_frames = []
+        level = self.governor.level
+        for _ in range(5000):
+            self.governor.update(costs[self.governor.level])
+            if self.governor.level < level:
+                up_frames.append(self.governor.up_frames)
+            level = self.governor.level
+        self.assertEqual(up_frames[:3], [20, 40, 80])
+        self.assertEqual(up_frames, sorted(up_frames))
+        self.assertLess(len(up_frames), 15)  # A retry every 40 frames without the back-off
+
+    def test_levels_are_cumulative(self):
+        for (_, higher), (_, lower) in zip(QUALITY_LEVELS, QUALITY_LEVELS[1:]):
+            self.assertLessEqual(lower.draw_zones, higher.draw_zones)
+            self.assertLessEqual(lower.draw_landmarks, higher.draw_landmarks)
+            self.assertLessEqual(lower.inference_scale, higher.inference_scale)
+            self.assertLessEqual(lower.model_complexity, higher.model_complexity)
+            self.assertGreaterEqual(lower.preview_interval, higher.preview_interval)
+
+    def test_describe(self):
+        self.assertEqual(self.governor.describe(), f"Quality 0/{len(QUALITY_LEVELS) - 1}: full")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,123 @@
+"""
+Unit tests for Landmark Recording and Replay
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.landmark_recording import LandmarkRecorder, LandmarkReplay, load_recording, read_header, record_hands
+from tests.helpers import FakeClock
+
+
+class TestLandmarkRecording(unittest.TestCase):
+    """Test recording format and replay timing"""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.hslm")
+        
+        recorder = LandmarkRecorder(self.path, seed=1234567890123)
+        for i in range(10):
+            landmarks = np.full((1, 21, 3), i / 10) if i % 2 == 0 else None
+            recorder.write(5.0 + i * 0.1, landmarks, tick=i // 3, latency=0.05)
+        recorder.close()
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    def test_round_trip(self):
+        """Test records load back through the memory map"""
+        records = load_recording(self.path)
+        self.assertEqual(len(records), 10)
+        self.assertEqual(records[0]["hands"], 1)
+        self.assertEqual(records[1]["hands"], 0)
+        self.assertAlmostEqual(float(records[2]["landmarks"][0, 0, 0]), 0.2, places=6)
+        self.assertAlmostEqual(float(records[9]["timestamp"]), 5.9)
+    
+    def test_seed_and_ticks(self):
+        """Test the game seed and the tick of every frame are kept"""
+        self.assertEqual(read_header(self.path), (1234567890123, 1))
+        records = load_recording(self.path)
+        self.assertEqual(records["tick"].tolist(), [0, 0, 0, 1, 1, 1, 2, 2, 2, 3])
+        self.assertAlmostEqual(float(records[4]["latency"]), 0.05, places=6)
+    
+    def test_final_tick(self):
+        """Test closing with the final tick adds a last frame without hands"""
+        path = os.path.join(self.directory.name, "ended.hslm")
+        recorder = LandmarkRecorder(path)
+        recorder.write(1.0, np.zeros((1, 21, 3)), tick=3)
+        recorder.close(tick=7)
+        records = load_recording(path)
+        self.assertEqual(records["tick"].tolist(), [3, 7])
+        self.assertEqual(records[1]["hands"], 0)
+    
+    def test_every_hand_with_handedness(self):
+        """Test two-player frames keep both hands and their labels"""
+        path = os.path.join(self.directory.name, "two.hslm")
+        recorder = LandmarkRecorder(path, players=2)
+        both = np.stack([np.full((21, 3), 0.2), np.full((21, 3), 0.8)])
+        recorder.write(1.0, both, ["Right", "Left"])
+        recorder.write(1.1, both[1:], None)
+        recorder.write(1.2, np.zeros((0, 21, 3)), [])
+        recorder.close()
+        
+        self.assertEqual(read_header(path)[1], 2)
+        records = load_recording(path)
+        landmarks, labels = record_hands(records[0])
+        np.testing.assert_allclose(landmarks, both)
+        self.assertEqual(labels, ["Right", "Left"])
+        landmarks, labels = record_hands(records[1])
+        np.testing.assert_allclose(landmarks, both[1:])
+        self.assertIsNone(labels)
+        self.assertEqual(len(record_hands(records[2])[0]), 0)
+    
+    def test_rejects_other_files(self):
+        """Test a file without the header is refused"""
+        other = os.path.join(self.directory.name, "other.bin")
+        with open(other, "wb") as f:
+            f.write(b"\0" * 64)
+        with self.assertRaises(ValueError):
+            load_recording(other)
+    
+    def test_max_speed_replays_every_record(self):
+        """Test speed 0 returns every record in order, in batches of at most limit"""
+        replay = LandmarkReplay(self.path, speed=0)
+        batches = []
+        while not replay.finished:
+            batches.append(replay.next_records(limit=4)["timestamp"].tolist())
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+        timestamps = sum(batches, [])
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertEqual(len(replay.next_records()), 0)
+    
+    def test_recorded_speed(self):
+        """Test real-time replay returns only due records and never skips one"""
+        clock = FakeClock(100.0)
+        replay = LandmarkReplay(self.path, speed=1.0, clock=clock)
+        self.assertEqual(replay.next_records()["timestamp"].tolist(), [5.0])
+        self.assertEqual(len(replay.next_records()), 0)
+        
+        clock.now += 0.35
+        np.testing.assert_allclose(replay.next_records()["timestamp"], [5.1, 5.2, 5.3])
+        
+        clock.now += 10
+        self.assertEqual(len(replay.next_records()), 6)
+        self.assertTrue(replay.finished)
+    
+    def test_faster_than_real_time(self):
+        """Test speed multiplier scales recorded time"""
+        clock = FakeClock(100.0)
+        replay = LandmarkReplay(self.path, speed=4.0, clock=clock)
+        replay.next_records()
+        clock.now += 0.11
+        self.assertAlmostEqual(float(replay.next_records()["timestamp"][-1]), 5.4)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
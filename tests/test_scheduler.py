@@ -0,0 +1,71 @@
+"""
+Unit tests for the game Scheduler
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scheduler import FixedStepScheduler, RateLimiter
+from tests.helpers import FakeClock
+
+
+class TestFixedStepScheduler(unittest.TestCase):
+    """Test fixed-timestep ticks"""
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = FixedStepScheduler(10, max_catch_up=3, clock=self.clock)
+        self.scheduler.advance()
+    
+    def test_ticks_follow_time_not_frames(self):
+        """Test tick count depends only on elapsed time"""
+        total = 0
+        for _ in range(100):
+            self.clock.now += 0.01
+            total += self.scheduler.advance()
+        self.assertEqual(total, 10)
+    
+    def test_catch_up_after_slow_frame(self):
+        """Test a slow frame runs the ticks that became due"""
+        self.clock.now += 0.25
+        self.assertEqual(self.scheduler.advance(), 2)
+        self.assertEqual(self.scheduler.late_ticks, 1)
+    
+    def test_missed_ticks_reported(self):
+        """Test ticks beyond the catch-up limit are dropped and counted"""
+        self.clock.now += 1.0
+        self.assertEqual(self.scheduler.advance(), 3)
+        self.assertEqual(self.scheduler.missed_ticks, 7)
+    
+    def test_reset_discards_time(self):
+        """Test paused time does not produce ticks"""
+        self.clock.now += 5.0
+        self.scheduler.reset()
+        self.assertEqual(self.scheduler.advance(), 0)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test rate limiting"""
+    
+    def test_limits_rate(self):
+        """Test action runs at most rate times per second"""
+        clock = FakeClock()
+        limiter = RateLimiter(30, clock=clock)
+        count = 0
+        for _ in range(1000):
+            clock.now += 0.001
+            count += limiter.ready()
+        self.assertIn(count, (30, 31))
+    
+    def test_zero_rate_always_ready(self):
+        """Test rate 0 disables limiting"""
+        limiter = RateLimiter(0, clock=FakeClock())
+        self.assertTrue(all(limiter.ready() for _ in range(5)))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -6,10 +6,14 @@ import unittest
 import sys
 import os
 
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.snake_game import Snake, Food
+import random
+import pygame
+from src.snake_game import Snake, Food, FreeCells, SnakeGame
 from src.config import *
 
 
@@ -63,6 +67,34 @@ class TestSnake(unittest.TestCase):
         new_length = len(self.snake.body)
         self.assertEqual(new_length, initial_length + 1)
     
+    def test_move_returns_removed_tail(self):
+        """Test move reports the freed tail cell, or None while growing"""
+        self.assertEqual(self.snake.move(), (100, 100))
+        self.snake.grow_snake()
+        self.assertIsNone(self.snake.move())
+    
+    def test_occupancy_follows_body(self):
+        """Test occupancy index is updated on move and growth"""
+        self.snake.grow_snake()
+        self.snake.move()
+        self.snake.move()
+        self.assertEqual(set(self.snake.occupancy), set(self.snake.body))
+        self.assertTrue(self.snake.occupies(self.snake.body[0]))
+        self.assertFalse(self.snake.occupies((100, 100)))
+    
+    def test_occupancy_after_body_assignment(self):
+        """Test assigning a body rebuilds the occupancy index"""
+        self.snake.body = [(40, 0), (20, 0), (0, 0)]
+        self.assertEqual(len(self.snake.body), 3)
+        self.assertTrue(self.snake.occupies((20, 0)))
+    
+    def test_collision_when_head_hits_body(self):
+        """Test self collision is detected through the occupancy index"""
+        self.snake.body = [(100, 100), (80, 100), (80, 120), (100, 120), (120, 120)]
+        self.snake.direction = DOWN
+        self.snake.move()
+        self.assertTrue(self.snake.check_collision(640, 480))
+    
     def test_wall_collision(self):
         """Test collision with wall"""
         # Move snake to left edge
@@ -108,6 +140,152 @@ class TestFood(unittest.TestCase):
         snake_body = [(100, 100), (80, 100), (60, 100)]
         self.food.respawn(snake_body)
         self.assertNotIn(self.food.position, snake_body)
+    
+    def test_respawn_avoids_attached_snake(self):
+        """Test food avoids a snake that keeps the free-cell index updated"""
+        food = Food(3 * SNAKE_SIZE, SNAKE_SIZE)
+        snake = Snake(0, 0, food.free_cells)
+        snake.grow_snake()
+        snake.move()
+        for _ in range(10):
+            self.assertTrue(food.respawn())
+            self.assertEqual(food.position, (2 * SNAKE_SIZE, 0))
+    
+    def test_respawn_on_full_board(self):
+        """Test respawn reports a full board instead of looping"""
+        food = Food(2 * SNAKE_SIZE, SNAKE_SIZE)
+        Snake(0, 0, food.free_cells).body = [(0, 0), (SNAKE_SIZE, 0)]
+        self.assertFalse(food.respawn())
+        self.assertIsNone(food.position)
+
+
+class TestFreeCells(unittest.TestCase):
+    """Test free-cell index"""
+    
+    def test_matches_reference_set(self):
+        """Test random add/remove sequences against a plain set"""
+        rng = random.Random(7)
+        free_cells = FreeCells(6, 5)
+        cells = [(x * SNAKE_SIZE, y * SNAKE_SIZE) for y in range(5) for x in range(6)]
+        reference = set(cells)
+        
+        for _ in range(2000):
+            cell = rng.choice(cells)
+            if rng.random() < 0.5:
+                free_cells.remove(cell)
+                reference.discard(cell)
+            else:
+                free_cells.add(cell)
+                reference.add(cell)
+            
+            self.assertEqual(len(free_cells), len(reference))
+            self.assertEqual({c for c in cells if c in free_cells}, reference)
+            if reference:
+                self.assertIn(free_cells.choice(rng), reference)
+    
+    def test_compact_depends_only_on_taken_cells(self):
+        """Test compacting keeps the set and rebuilds the same order from any history"""
+        rng = random.Random(3)
+        cells = [(x * SNAKE_SIZE, y * SNAKE_SIZE) for y in range(8) for x in range(9)]
+        churned = FreeCells(9, 8)
+        for _ in range(3000):
+            cell = rng.choice(cells)
+            if rng.random() < 0.6:
+                churned.remove(cell)
+            else:
+                churned.add(cell)
+        free = {cell for cell in cells if cell in churned}
+        
+        churned.compact()
+        self.assertEqual({cell for cell in cells if cell in churned}, free)
+        self.assertLessEqual(len(churned._slots), 2 * (len(cells) - len(free)))
+        
+        # Same taken cells, removed in another order
+        rebuilt = FreeCells(9, 8)
+        for cell in reversed(cells):
+            if cell not in free:
+                rebuilt.remove(cell)
+        rebuilt.compact()
+        self.assertEqual(rebuilt._slots, churned._slots)
+        self.assertEqual([rebuilt.choice(random.Random(i)) for i in range(20)],
+                         [churned.choice(random.Random(i)) for i in range(20)])
+    
+    def test_off_board_cells_ignored(self):
+        """Test cells outside the board are ignored"""
+        free_cells = FreeCells(2, 2)
+        free_cells.remove((-SNAKE_SIZE, 0))
+        free_cells.remove((0, 2 * SNAKE_SIZE))
+        self.assertEqual(len(free_cells), 4)
+
+
+
+class TestDirtyDrawing(unittest.TestCase):
+    """Test drawing only what changed looks the same as a full draw"""
+    
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+    
+    @classmethod
+    def tearDownClass(cls):
+        pygame.quit()
+    
+    def steer(self, game):
+        """
+        Head for the food, then to the left edge and along a row under the
+        score text into the right wall
+        """
+        snake = game.snake
+        head_x, head_y = snake.body[0]
+        if (head_x, head_y) == (0, 2 * SNAKE_SIZE) and game.score >= 50:
+            self.to_wall = True
+        if self.to_wall:
+            target_x, target_y = game.width, 2 * SNAKE_SIZE
+        elif game.score < 50:
+            target_x, target_y = game.food.position
+        else:
+            target_x, target_y = 0, 2 * SNAKE_SIZE
+        
+        steps = {UP: (0, -SNAKE_SIZE), DOWN: (0, SNAKE_SIZE), LEFT: (-SNAKE_SIZE, 0), RIGHT: (SNAKE_SIZE, 0)}
+        reverse = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}[snake.direction]
+        wanted = []
+        if target_y != head_y:
+            wanted.append(DOWN if target_y > head_y else UP)
+        if target_x != head_x:
+            wanted.append(RIGHT if target_x > head_x else LEFT)
+        
+        # Closest to the target first, but never into the body or a wall
+        # before the end
+        for direction in wanted + [UP, DOWN, LEFT, RIGHT]:
+            x, y = head_x + steps[direction][0], head_y + steps[direction][1]
+            on_board = 0 <= x < game.width and 0 <= y < game.height
+            if direction != reverse and not snake.occupies((x, y)) and (on_board or self.to_wall):
+                return direction
+        return None
+    
+    def test_matches_full_draw(self):
+        """Test every frame through eating, turning and game over"""
+        for seed in (1, 2):
+            game = SnakeGame(GAME_WIDTH, SCREEN_HEIGHT, seed=seed)
+            screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            full = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            game.draw_dirty(screen, CAMERA_WIDTH)
+            self.to_wall = False
+            
+            directions = set()
+            for tick in range(2000):
+                game.update(self.steer(game))
+                directions.add(game.snake.direction)
+                game.draw_dirty(screen, CAMERA_WIDTH)
+                game.draw(full, CAMERA_WIDTH)
+                same = pygame.image.tostring(screen, "RGB") == pygame.image.tostring(full, "RGB")
+                self.assertTrue(same, f"seed {seed}, frame {tick}")
+                if game.game_over:
+                    break
+            
+            self.assertTrue(game.game_over)
+            self.assertGreaterEqual(game.score, 50)
+            self.assertEqual(directions, {UP, DOWN, LEFT, RIGHT})
 
 
 if __name__ == '__main__':
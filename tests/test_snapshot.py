@@ -0,0 +1,233 @@
+"""
+Unit tests for game snapshots and the rewind history
+"""
+
+import unittest
+import sys
+import os
+import random
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import *
+from src.engine import SnakeEngine
+from src.snapshot import RewindHistory, encode_snapshot, decode_snapshot, save_snapshot, load_snapshot, \
+    SNAPSHOT_HEADER, SNAPSHOT_SNAKE, RNG_STATE
+
+
+def state_of(game):
+    """Everything a rewind has to put back"""
+    return (
+        game.tick, [list(snake.body) for snake in game.snakes], [snake.direction for snake in game.snakes],
+        [snake.grow for snake in game.snakes], list(game.scores), game.food.position,
+        game.game_over, game.winner, len(game.food.free_cells)
+    )
+
+
+def play(game, rng):
+    """One tick with a random turn now and then"""
+    directions = [rng.choice([UP, DOWN, LEFT, RIGHT]) if rng.random() < 0.3 else None
+                  for _ in range(game.players)]
+    game.update(*directions)
+
+
+def chase(game, player=0):
+    """Head for the food without crashing, keeps long games alive"""
+    opposite = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+    snake = game.snakes[player]
+    x, y = snake.body[0]
+    options = [UP, DOWN, LEFT, RIGHT]
+    if game.food.position is not None:
+        food_x, food_y = game.food.position
+        options = [RIGHT if food_x > x else LEFT, DOWN if food_y > y else UP] + options
+    steps = {UP: (0, -SNAKE_SIZE), DOWN: (0, SNAKE_SIZE), LEFT: (-SNAKE_SIZE, 0), RIGHT: (SNAKE_SIZE, 0)}
+    for direction in options:
+        cell = (x + steps[direction][0], y + steps[direction][1])
+        if (direction != opposite[snake.direction] and 0 <= cell[0] < game.width
+                and 0 <= cell[1] < game.height and not any(other.occupies(cell) for other in game.snakes)):
+            return direction
+    return None
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test full-state snapshots"""
+
+    def test_round_trip(self):
+        for players in (1, 2):
+            rng = random.Random(players)
+            game = SnakeEngine(300, 200, seed=players, players=players)
+            for _ in range(40):
+                if game.game_over:
+                    break
+                play(game, rng)
+
+            restored = SnakeEngine(100, 100, seed=99)
+            restored.restore(decode_snapshot(encode_snapshot(game)))
+            self.assertEqual(state_of(restored), state_of(game))
+            self.assertEqual(restored.rng.getstate(), game.rng.getstate())
+
+    def test_restored_game_continues_identically(self):
+        """Same food spawns after a restore as in the original game"""
+        game = SnakeEngine(300, 300, seed=4)
+        for _ in range(100):
+            game.update(chase(game))
+        self.assertGreater(game.score, 0)
+
+        restored = SnakeEngine(300, 300, seed=99)
+        restored.restore(decode_snapshot(encode_snapshot(game)))
+        for _ in range(200):
+            game.update(chase(game))
+            restored.update(chase(restored))
+            self.assertEqual(state_of(restored), state_of(game))
+
+    def test_encoding_does_not_change_the_game(self):
+        """Same food spawns whether or not snapshots are taken along the way"""
+        for players in (1, 2):
+            game = SnakeEngine(300, 300, seed=6, players=players)
+            recorded = SnakeEngine(300, 300, seed=6, players=players)
+            for tick in range(300):
+                game.update(*[chase(game, player) for player in range(players)])
+                recorded.update(*[chase(recorded, player) for player in range(players)])
+                if tick % 7 == 0:
+                    encode_snapshot(recorded)
+                self.assertEqual(state_of(recorded), state_of(game))
+            self.assertGreater(game.score, 30)
+
+    def test_size_does_not_grow_with_ticks(self):
+        """Snapshots hold the board and RNG, not the free-cell history"""
+        game = SnakeEngine(1000, 1000, seed=5)
+        for _ in range(3000):
+            game.update(chase(game))
+        data = encode_snapshot(game)
+        expected = (SNAPSHOT_HEADER.size + SNAPSHOT_SNAKE.size + 4 * len(game.snake.body)
+                    + RNG_STATE.size)
+        self.assertEqual(len(data), expected)
+
+    def test_crashed_game(self):
+        game = SnakeEngine(200, 200, seed=1)
+        while not game.game_over:
+            game.update()
+        state = decode_snapshot(encode_snapshot(game))
+        self.assertTrue(state.game_over)
+        self.assertEqual(state.snakes[0].body[0], game.snake.body[0])  # Off the board
+
+    def test_save_and_load(self):
+        game = SnakeEngine(200, 200, seed=2, players=2)
+        game.update()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "saves", "game.hsgs")
+            save_snapshot(path, game)
+            restored = SnakeEngine(200, 200)
+            restored.restore(load_snapshot(path))
+        self.assertEqual(state_of(restored), state_of(game))
+
+    def test_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            decode_snapshot(b"PNG" + bytes(100))
+
+
+class TestRewindHistory(unittest.TestCase):
+    """Test stepping and seeking through recorded ticks"""
+
+    def record_game(self, ticks, players=1, capacity=1000, interval=25):
+        game = SnakeEngine(400, 400, seed=players, players=players)
+        history = RewindHistory(capacity, interval)
+        history.record(game)
+        states = {game.tick: state_of(game)}
+        for _ in range(ticks):
+            game.update(*[chase(game, player) for player in range(players)])
+            history.record(game)
+            states[game.tick] = state_of(game)
+        return game, history, states
+
+    def test_step_back_and_forward(self):
+        for players in (1, 2):
+            game, history, states = self.record_game(150, players)
+            last = game.tick
+            while history.step_back(game):
+                self.assertEqual(state_of(game), states[game.tick])
+            self.assertEqual(game.tick, 0)
+
+            while history.step_forward(game):
+                self.assertEqual(state_of(game), states[game.tick])
+            self.assertEqual(game.tick, last)
+
+    def test_undo_death(self):
+        game, history, states = self.record_game(50, players=2)
+        while not game.game_over:
+            game.update()
+            history.record(game)
+        crash = game.tick
+
+        history.step_back(game)
+        self.assertFalse(game.game_over)
+        self.assertEqual(game.tick, crash - 1)
+        game.update(*[chase(game, player) for player in range(2)])
+        history.record(game)
+        self.assertEqual(history.last_tick, crash)
+
+    def test_seek(self):
+        game, history, states = self.record_game(150)
+        rng = random.Random(0)
+        for tick in [0, 149, 75, 3] + [rng.randrange(150) for _ in range(20)]:
+            tick = min(tick, history.last_tick)
+            self.assertTrue(history.seek(game, tick))
+            self.assertEqual(state_of(game), states[tick])
+        self.assertFalse(history.seek(game, history.last_tick + 1))
+
+    def test_memory_is_bounded(self):
+        game = SnakeEngine(2000, 2000, seed=0)
+        history = RewindHistory(capacity=30, snapshot_interval=10)
+        for _ in range(90):
+            game.update(chase(game))
+            history.record(game)
+        self.assertEqual(len(history._history), 30)
+        self.assertLessEqual(len(history._snapshots), 4)
+        self.assertEqual((history.first_tick, history.last_tick), (60, 90))
+        self.assertFalse(history.seek(game, 59))
+        self.assertTrue(history.seek(game, 60))
+        self.assertFalse(history.step_back(game))
+
+    def test_new_moves_drop_redo(self):
+        game, history, states = self.record_game(100)
+        history.seek(game, 50)
+        game.update(UP if game.snake.direction in (LEFT, RIGHT) else LEFT)
+        history.record(game)
+        self.assertEqual(history.last_tick, 51)
+        self.assertFalse(history.step_forward(game))
+
+        # The new branch rewinds like the old one did
+        branch = state_of(game)
+        history.step_back(game)
+        self.assertEqual(state_of(game), states[50])
+        history.step_forward(game)
+        self.assertEqual(state_of(game), branch)
+
+    def test_restart_clears(self):
+        game, history, states = self.record_game(100)
+        game.reset()
+        history.record(game, restart=True)
+        self.assertEqual((history.first_tick, history.last_tick), (0, 0))
+
+    def test_save_and_load(self):
+        game, history, states = self.record_game(100)
+        history.seek(game, 80)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "autosave.hsrw")
+            history.save(path, game)
+            restored = SnakeEngine(400, 400)
+            loaded = RewindHistory.load(path, restored)
+
+        self.assertEqual(state_of(restored), state_of(game))
+        self.assertEqual(restored.rng.getstate(), game.rng.getstate())
+        self.assertEqual((loaded.first_tick, loaded.last_tick), (history.first_tick, history.last_tick))
+        loaded.seek(restored, 10)
+        self.assertEqual(state_of(restored), states[10])
+        loaded.seek(restored, history.last_tick)
+        self.assertEqual(state_of(restored), states[history.last_tick])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
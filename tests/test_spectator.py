@@ -0,0 +1,285 @@
+"""
+Unit tests for spectator streaming
+"""
+
+import unittest
+import sys
+import os
+import asyncio
+import random
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import *
+from src.engine import SnakeEngine
+from src.spectator import (
+    BoardState, SpectatorHub, SpectatorServer, SpectatorClient, encode_keyframe, encode_delta,
+    HEADER, KEYFRAME, DELTA, _Spectator
+)
+
+
+def decode(message):
+    """Split an encoded message into (type, tick, payload)"""
+    kind, tick, length = HEADER.unpack_from(message)
+    return kind, tick, message[HEADER.size:HEADER.size + length]
+
+
+def board_of(game):
+    """Snake cells of an engine as (column, row), head first"""
+    return [[(x // SNAKE_SIZE, y // SNAKE_SIZE) for x, y in snake.body] for snake in game.snakes]
+
+
+def food_of(game):
+    x, y = game.food.position
+    return (x // SNAKE_SIZE, y // SNAKE_SIZE)
+
+
+def play(game, rng):
+    """One tick with a random turn now and then"""
+    directions = [rng.choice([UP, DOWN, LEFT, RIGHT]) if rng.random() < 0.3 else None
+                  for _ in range(game.players)]
+    game.update(*directions)
+
+
+class FakeTransport:
+    def __init__(self):
+        self.buffered = 0
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+
+class FakeWriter:
+    """Collects written bytes, with an adjustable send backlog"""
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+
+    def is_closing(self):
+        return False
+
+
+class FakeQueue:
+    def __init__(self):
+        self.items = []
+
+    def put(self, item):
+        self.items.append(item)
+
+
+class TestEncoding(unittest.TestCase):
+    """Test rebuilding the board from keyframes and deltas"""
+
+    def assertBoardMatches(self, board, game):
+        self.assertTrue(board.synced)
+        self.assertEqual(board.tick, game.tick)
+        self.assertEqual([list(body) for body in board.snakes], board_of(game))
+        self.assertEqual(board.food, food_of(game))
+        self.assertEqual(board.scores, game.scores)
+        self.assertEqual(board.directions, [snake.direction for snake in game.snakes])
+        self.assertEqual(board.game_over, game.game_over)
+        self.assertEqual(board.winner, game.winner)
+
+    def test_keyframe(self):
+        game = SnakeEngine(400, 300, seed=1)
+        game.snake.body = [(100, 100), (80, 100), (60, 100), (60, 80)]
+        game.scores[0] = 30
+
+        board = BoardState()
+        self.assertTrue(board.apply(*decode(encode_keyframe(game))))
+        self.assertEqual((board.columns, board.rows), (20, 15))
+        self.assertBoardMatches(board, game)
+
+    def test_deltas_follow_game(self):
+        """Deltas alone keep the board identical through growth and crashes"""
+        for players in (1, 2):
+            rng = random.Random(players)
+            game = SnakeEngine(200, 200, seed=players, players=players)
+            board = BoardState()
+            board.apply(*decode(encode_keyframe(game)))
+
+            ticks = 0
+            while ticks < 500:
+                if game.game_over:
+                    game.reset()
+                    board.apply(*decode(encode_keyframe(game)))
+                play(game, rng)
+                self.assertTrue(board.apply(*decode(encode_delta(game))))
+                self.assertBoardMatches(board, game)
+                ticks += 1
+
+    def test_delta_is_small(self):
+        game = SnakeEngine(400, 300, seed=1)
+        game.update()
+        self.assertLessEqual(len(encode_delta(game)), 32)
+
+    def test_missed_delta_waits_for_keyframe(self):
+        game = SnakeEngine(400, 300, seed=1)
+        board = BoardState()
+        self.assertFalse(board.apply(*decode(encode_delta(game))))
+
+        board.apply(*decode(encode_keyframe(game)))
+        game.update()
+        game.update()
+        self.assertFalse(board.apply(*decode(encode_delta(game))))
+        self.assertFalse(board.synced)
+
+        game.update()
+        self.assertFalse(board.apply(*decode(encode_delta(game))))
+        board.apply(*decode(encode_keyframe(game)))
+        self.assertBoardMatches(board, game)
+
+
+class TestSlowSpectators(unittest.TestCase):
+    """Test skipping a lagging viewer ahead to the latest keyframe"""
+
+    def setUp(self):
+        self.hub = SpectatorHub(max_buffer=1000)
+        self.game = SnakeEngine(2000, 300, seed=3)  # Room for 50 ticks straight ahead
+        self.writer = FakeWriter()
+
+        # Connected before the first keyframe
+        self.client = _Spectator(self.writer, None, synced=False)
+        self.hub.clients.add(self.client)
+
+    def tick(self):
+        """Publish one tick straight into the broadcast (no server thread)"""
+        self.game.update()
+        tick = self.game.tick
+        keyframe = tick % 10 == 0
+        message = encode_keyframe(self.game) if keyframe else encode_delta(self.game)
+        self.hub.broadcast(message, keyframe)
+
+    def received(self):
+        """Messages written to the viewer so far"""
+        messages, data, offset = [], bytes(self.writer.data), 0
+        while offset < len(data):
+            kind, tick, length = HEADER.unpack_from(data, offset)
+            messages.append((kind, tick))
+            offset += HEADER.size + length
+        return messages
+
+    def test_fast_viewer_gets_everything(self):
+        for _ in range(25):
+            self.tick()
+        self.assertEqual([tick for _, tick in self.received()], list(range(10, 26)))
+
+    def test_lagging_viewer_skips_to_keyframe(self):
+        for _ in range(12):
+            self.tick()
+        self.writer.transport.buffered = 5000
+        for _ in range(10):
+            self.tick()
+        self.assertFalse(self.client.synced)
+        sent = len(self.received())
+
+        # Still backed up, nothing more is queued
+        self.tick()
+        self.assertEqual(len(self.received()), sent)
+
+        # Drained: latest keyframe (tick 20) and the deltas after it
+        self.writer.transport.buffered = 0
+        self.tick()
+        self.assertTrue(self.client.synced)
+        self.assertEqual(self.received()[sent:], [(KEYFRAME, 20), (DELTA, 21), (DELTA, 22), (DELTA, 23), (DELTA, 24)])
+        self.assertEqual(self.hub.resyncs, 2)  # First keyframe, then the skip
+
+        board = BoardState()
+        data = bytes(self.writer.data)
+        offset = 0
+        while offset < len(data):
+            kind, tick, length = HEADER.unpack_from(data, offset)
+            board.apply(kind, tick, data[offset + HEADER.size:offset + HEADER.size + length])
+            offset += HEADER.size + length
+        self.assertEqual(board.tick, self.game.tick)
+        self.assertEqual([list(body) for body in board.snakes], board_of(self.game))
+
+    def test_publish_sends_keyframe_after_gap(self):
+        server = SpectatorServer()
+        server.messages = FakeQueue()
+        server.publish(self.game)
+        self.game.update()
+        server.publish(self.game)
+        server.publish(self.game)
+        self.game.update()
+        self.game.update()
+        server.publish(self.game)
+        self.assertEqual([message[0] for message in server.messages.items], [KEYFRAME, DELTA, KEYFRAME])
+
+
+class TestLoopback(unittest.TestCase):
+    """Test viewers over a real local connection"""
+
+    def setUp(self):
+        self.server = SpectatorServer(host="127.0.0.1", port=0, keyframe_interval=20).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def wait_for_tick(self, client, tick):
+        while not (client.board.synced and client.board.tick == tick):
+            await asyncio.wait_for(client.receive(), timeout=5)
+
+    def test_many_viewers_follow_game(self):
+        async def scenario():
+            clients = [await SpectatorClient().connect("127.0.0.1", self.server.port)
+                       for _ in range(50)]
+
+            rng = random.Random(0)
+            game = SnakeEngine(400, 300, seed=0, players=2)
+            self.server.publish(game, keyframe=True)
+            for _ in range(100):
+                if game.game_over:
+                    game.reset()
+                    self.server.publish(game, keyframe=True)
+                play(game, rng)
+                self.server.publish(game)
+
+            for client in clients:
+                await self.wait_for_tick(client, game.tick)
+                self.assertEqual([list(body) for body in client.board.snakes], board_of(game))
+                self.assertEqual(client.board.scores, game.scores)
+                await client.close()
+
+        asyncio.run(scenario())
+
+    def test_late_viewer_catches_up(self):
+        game = SnakeEngine(400, 300, seed=5)
+        self.server.publish(game, keyframe=True)
+        for _ in range(30):
+            game.update()
+            self.server.publish(game)
+
+        async def scenario():
+            client = await SpectatorClient().connect("127.0.0.1", self.server.port)
+            await self.wait_for_tick(client, game.tick)
+            self.assertEqual([list(body) for body in client.board.snakes], board_of(game))
+            await client.close()
+
+        asyncio.run(scenario())
+
+    def test_port_in_use(self):
+        with self.assertRaises(OSError):
+            SpectatorServer(host="127.0.0.1", port=self.server.port).start()
+
+    def test_rejects_other_servers(self):
+        async def scenario():
+            server = await asyncio.start_server(
+                lambda reader, writer: writer.write(b"HTTP/1.1 400 Bad Request\r\n\r\n"),
+                "127.0.0.1", 0
+            )
+            port = server.sockets[0].getsockname()[1]
+            with self.assertRaises(ValueError):
+                await SpectatorClient().connect("127.0.0.1", port)
+            server.close()
+            await server.wait_closed()
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+"""
+Unit tests for Startup helpers
+"""
+
+import unittest
+import sys
+import os
+import threading
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.startup import StartupTimer, BackgroundLoader, NULL_STARTUP_TIMER
+from tests.helpers import FakeClock
+
+
+class TestStartupTimer(unittest.TestCase):
+    """Test startup phase recording"""
+    
+    def test_phases_relative_to_start(self):
+        """Test phases are recorded relative to the start time"""
+        clock = FakeClock(10.0)
+        timer = StartupTimer(start=9.5, clock=clock)
+        with timer.phase("window"):
+            clock.now += 0.25
+        timer.mark("ready")
+        
+        self.assertEqual(timer.phases, [("window", 0.5, 0.75), ("ready", 0.75, 0.75)])
+    
+    def test_report_ordered_by_start(self):
+        """Test the report lists phases in start order"""
+        clock = FakeClock(10.0)
+        timer = StartupTimer(clock=clock)
+        timer.record("late", 11.0, 12.0)
+        timer.record("early", 10.0, 10.5)
+        
+        report = timer.report().splitlines()
+        self.assertIn("early", report[1])
+        self.assertIn("late", report[2])
+    
+    def test_phase_recorded_on_error(self):
+        """Test a failing phase still records its time"""
+        timer = StartupTimer()
+        with self.assertRaises(RuntimeError):
+            with timer.phase("camera.open"):
+                raise RuntimeError("no camera")
+        self.assertEqual(timer.phases[0][0], "camera.open")
+    
+    def test_null_timer(self):
+        """Test the null timer accepts the same calls"""
+        with NULL_STARTUP_TIMER.phase("anything"):
+            pass
+        NULL_STARTUP_TIMER.mark("anything")
+
+
+class TestBackgroundLoader(unittest.TestCase):
+    """Test background loading"""
+    
+    def test_result_available_when_done(self):
+        """Test the build runs off the calling thread and returns its result"""
+        release = threading.Event()
+        threads = []
+        
+        def build():
+            threads.append(threading.current_thread())
+            release.wait(5)
+            return "controller"
+        
+        loader = BackgroundLoader(build).start()
+        self.assertFalse(loader.done)
+        
+        release.set()
+        self.assertTrue(loader.join(5))
+        self.assertEqual(loader.result, "controller")
+        self.assertIsNone(loader.error)
+        self.assertIsNot(threads[0], threading.current_thread())
+    
+    def test_error_is_kept(self):
+        """Test a failing build reports its exception instead of raising"""
+        def build():
+            raise OSError("camera busy")
+        
+        loader = BackgroundLoader(build).start()
+        loader.join(5)
+        self.assertTrue(loader.done)
+        self.assertIsNone(loader.result)
+        self.assertIsInstance(loader.error, OSError)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,67 @@
+"""
+Unit tests for Text Cache
+"""
+
+import unittest
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from src.text_cache import TextCache
+from src.config import *
+
+
+class TestTextCache(unittest.TestCase):
+    """Test cached text rendering"""
+    
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+    
+    def test_same_key_returns_cached_surface(self):
+        """Test repeated renders reuse the surface"""
+        cache = TextCache(8)
+        first = cache.render("Score: 10", 24, WHITE)
+        second = cache.render("Score: 10", 24, WHITE)
+        self.assertIs(first, second)
+        self.assertEqual(cache.hits, 1)
+    
+    def test_colour_is_part_of_key(self):
+        """Test different colours are cached separately"""
+        cache = TextCache(8)
+        self.assertIsNot(cache.render("A", 24, WHITE), cache.render("A", 24, RED))
+    
+    def test_lru_eviction(self):
+        """Test least recently used surface is evicted first"""
+        cache = TextCache(2)
+        a = cache.render("a", 24, WHITE)
+        cache.render("b", 24, WHITE)
+        cache.render("a", 24, WHITE)
+        cache.render("c", 24, WHITE)
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.render("a", 24, WHITE), a)
+        misses = cache.misses
+        cache.render("b", 24, WHITE)
+        self.assertEqual(cache.misses, misses + 1)
+    
+    def test_shadowed_surface_includes_offset(self):
+        """Test baked shadow grows the surface by the offset"""
+        cache = TextCache(8)
+        plain = cache.render("Hello", 24, WHITE)
+        shadowed = cache.render_shadowed("Hello", 24, WHITE, offset=(2, 2))
+        self.assertEqual(shadowed.get_width(), plain.get_width() + 2)
+        self.assertEqual(shadowed.get_height(), plain.get_height() + 2)
+    
+    def test_fonts_are_loaded_once(self):
+        """Test font objects are reused"""
+        cache = TextCache(8)
+        self.assertIs(cache.font(24), cache.font(24))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,187 @@
+"""
+Unit tests for Hand Tracker
+"""
+
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.hand_tracker import ConstantVelocityFilter, HandTracker, FLOW_LANDMARKS
+
+WIDTH = 320
+HEIGHT = 240
+
+
+class MockLandmark:
+    def __init__(self, x, y, z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class MockHand:
+    def __init__(self, points):
+        self.landmark = [MockLandmark(x, y, z) for x, y, z in points]
+
+
+class MockClassification:
+    def __init__(self, score):
+        self.score = score
+
+
+class MockHandedness:
+    def __init__(self, score):
+        self.classification = [MockClassification(score)]
+
+
+class MockResults:
+    def __init__(self, points=None, score=0.95):
+        self.multi_hand_landmarks = [MockHand(points)] if points is not None else None
+        self.multi_handedness = [MockHandedness(score)] if points is not None else None
+
+
+class MockDetector:
+    """Reports a hand at a position that moves by `velocity` per call"""
+    def __init__(self, start=(0.3, 0.5), velocity=(0.0, 0.0), score=0.95, present=True):
+        self.position = np.array(start)
+        self.velocity = np.array(velocity)
+        self.score = score
+        self.present = present
+        self.calls = 0
+    
+    def process(self, frame):
+        self.calls += 1
+        if not self.present:
+            return MockResults()
+        points = np.zeros((21, 3))
+        points[:, :2] = self.position
+        self.position = self.position + self.velocity
+        return MockResults(points, self.score)
+
+
+def textured_frame(offset_x, seed=0):
+    """Blank frame with a random-texture patch whose left edge is at offset_x"""
+    frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    patch = np.random.default_rng(seed).integers(0, 255, (80, 80, 1), dtype=np.uint8)
+    frame[80:160, offset_x:offset_x + 80] = patch
+    return frame
+
+
+class TestConstantVelocityFilter(unittest.TestCase):
+    """Test the shared-covariance Kalman filter"""
+    
+    def test_learns_velocity(self):
+        """Test steady motion is predicted after a few measurements"""
+        kalman = ConstantVelocityFilter()
+        kalman.reset(np.array([[0.0, 0.0]]))
+        for step in range(1, 30):
+            kalman.predict(0.1)
+            kalman.correct(np.array([[0.01 * step, -0.02 * step]]))
+        
+        predicted = kalman.predict(0.1)
+        np.testing.assert_allclose(predicted, [[0.30, -0.60]], atol=0.005)
+    
+    def test_noisier_measurements_move_less(self):
+        """Test measurement noise controls how far a correction pulls"""
+        precise = ConstantVelocityFilter()
+        noisy = ConstantVelocityFilter()
+        for kalman in (precise, noisy):
+            kalman.reset(np.array([[0.5]]))
+            kalman.predict(1 / 30)
+        
+        precise.correct(np.array([[0.6]]))
+        noisy.correct(np.array([[0.6]]), measurement_noise=1.0)
+        self.assertGreater(precise.position[0, 0], noisy.position[0, 0])
+
+
+class TestHandTracker(unittest.TestCase):
+    """Test skip-frame detection and tracking between detections"""
+    
+    def run_frames(self, tracker, count, frame=None):
+        if frame is None:
+            frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+        return [tracker.process(frame, i / 30) for i in range(count)]
+    
+    def test_detects_every_interval(self):
+        """Test the model only runs every `interval` frames"""
+        detector = MockDetector()
+        tracker = HandTracker(detector, interval=3, optical_flow=False)
+        detected = [d for _, d in self.run_frames(tracker, 9)]
+        
+        self.assertEqual(detected, [True, False, False] * 3)
+        self.assertEqual(detector.calls, 3)
+        self.assertEqual(tracker.tracked_frames, 6)
+    
+    def test_interval_one_always_detects(self):
+        """Test interval 1 matches running the model on every frame"""
+        detector = MockDetector()
+        tracker = HandTracker(detector, interval=1, optical_flow=False)
+        self.run_frames(tracker, 5)
+        self.assertEqual(detector.calls, 5)
+    
+    def test_low_confidence_redetects(self):
+        """Test low-confidence detections are not tracked from"""
+        detector = MockDetector(score=0.5)
+        tracker = HandTracker(detector, interval=5, min_score=0.8, optical_flow=False)
+        self.run_frames(tracker, 4)
+        self.assertEqual(detector.calls, 4)
+    
+    def test_no_hand_keeps_searching(self):
+        """Test missing hands are searched for on every frame"""
+        detector = MockDetector(present=False)
+        tracker = HandTracker(detector, interval=5, optical_flow=False)
+        results = self.run_frames(tracker, 4)
+        
+        self.assertEqual(detector.calls, 4)
+        self.assertTrue(all(points is None for points, _ in results))
+    
+    def test_predicts_motion_between_detections(self):
+        """Test tracked frames continue the detected movement"""
+        detector = MockDetector(start=(0.2, 0.5), velocity=(0.02, 0.0))
+        tracker = HandTracker(detector, interval=2, optical_flow=False)
+        results = self.run_frames(tracker, 12)
+        
+        # Detections every other frame move 0.02, so frame 11 (tracked)
+        # should be near 0.2 + 11 * 0.01
+        points, detected = results[-1]
+        self.assertFalse(detected)
+        self.assertAlmostEqual(points[0, 0], 0.31, delta=0.005)
+    
+    def test_leaving_frame_redetects(self):
+        """Test a prediction outside the frame falls back to detection"""
+        detector = MockDetector(start=(0.85, 0.5), velocity=(0.06, 0.0))
+        tracker = HandTracker(detector, interval=3, optical_flow=False)
+        self.run_frames(tracker, 12)
+        
+        # Without the fallback 12 frames would take 4 detections
+        self.assertGreater(detector.calls, 4)
+    
+    def test_optical_flow_follows_hand(self):
+        """Test optical flow moves the tracked hand with the image"""
+        # Landmarks sit on a textured patch that moves 4 pixels per frame
+        detector = MockDetector(start=(100 / WIDTH, 120 / HEIGHT))
+        tracker = HandTracker(detector, interval=10, optical_flow=True)
+        
+        for i in range(6):
+            points, detected = tracker.process(textured_frame(60 + 4 * i), i / 30)
+        
+        self.assertEqual(detector.calls, 1)
+        self.assertAlmostEqual(points[FLOW_LANDMARKS[0], 0] * WIDTH, 120, delta=3)
+    
+    def test_lost_flow_redetects(self):
+        """Test the model runs again when optical flow loses the hand"""
+        detector = MockDetector(start=(100 / WIDTH, 120 / HEIGHT))
+        tracker = HandTracker(detector, interval=10, optical_flow=True)
+        
+        tracker.process(textured_frame(60), 0.0)
+        blank = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+        _, detected = tracker.process(blank, 1 / 30)
+        self.assertTrue(detected)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,156 @@
+"""
+Unit tests for the scrolling viewport and background chunks
+"""
+
+import unittest
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from src.config import *
+from src.viewport import Viewport, ChunkCache
+from src.snake_game import SnakeGame
+
+
+def grid(width, height):
+    """The whole board background drawn in one piece"""
+    surface = pygame.Surface((width, height))
+    surface.fill(BLACK)
+    for x in range(0, width, SNAKE_SIZE):
+        pygame.draw.line(surface, (30, 30, 30), (x, 0), (x, height))
+    for y in range(0, height, SNAKE_SIZE):
+        pygame.draw.line(surface, (30, 30, 30), (0, y), (width, y))
+    return surface
+
+
+class TestViewport(unittest.TestCase):
+    """Test following a point around the board"""
+
+    def setUp(self):
+        # 10 x 8 cell view onto a 100 x 100 cell board, 2 cell margins
+        self.view = Viewport(10 * SNAKE_SIZE, 8 * SNAKE_SIZE, 100 * SNAKE_SIZE, 100 * SNAKE_SIZE, margin=2)
+
+    def test_small_board_never_scrolls(self):
+        view = Viewport(GAME_WIDTH, SCREEN_HEIGHT, 400, 300)
+        self.assertFalse(view.scrolls)
+        self.assertFalse(view.follow((380, 280)))
+        self.assertEqual(view.rect, pygame.Rect(0, 0, 400, 300))
+
+    def test_dead_zone(self):
+        self.view.center((50 * SNAKE_SIZE, 50 * SNAKE_SIZE))
+        x, y = self.view.x, self.view.y
+
+        # Anywhere outside the margins, the view stays put
+        for column in range(x // SNAKE_SIZE + 2, x // SNAKE_SIZE + 8):
+            self.assertFalse(self.view.follow((column * SNAKE_SIZE, y + 3 * SNAKE_SIZE)))
+
+        # Into the right margin: scroll one cell
+        self.assertTrue(self.view.follow((x + 8 * SNAKE_SIZE, y + 3 * SNAKE_SIZE)))
+        self.assertEqual((self.view.x, self.view.y), (x + SNAKE_SIZE, y))
+
+    def test_clamped_to_board(self):
+        self.view.center((0, 0))
+        self.assertEqual((self.view.x, self.view.y), (0, 0))
+        self.view.center((99 * SNAKE_SIZE, 99 * SNAKE_SIZE))
+        self.assertEqual(self.view.rect.bottomright, (100 * SNAKE_SIZE, 100 * SNAKE_SIZE))
+        self.assertFalse(self.view.follow((99 * SNAKE_SIZE, 99 * SNAKE_SIZE)))
+
+    def test_whole_cells(self):
+        view = Viewport(GAME_WIDTH, SCREEN_HEIGHT, 100 * SNAKE_SIZE, 100 * SNAKE_SIZE)
+        view.center((37 * SNAKE_SIZE, 61 * SNAKE_SIZE))
+        self.assertEqual((view.x % SNAKE_SIZE, view.y % SNAKE_SIZE), (0, 0))
+        self.assertIn((37 * SNAKE_SIZE, 61 * SNAKE_SIZE), view)
+
+
+class TestChunkCache(unittest.TestCase):
+    """Test pre-rendered background chunks"""
+
+    def test_matches_full_background(self):
+        width, height = 37 * SNAKE_SIZE, 23 * SNAKE_SIZE  # Not a multiple of the chunk size
+        chunks = ChunkCache(width, height, chunk_cells=8)
+        expected = grid(width, height)
+
+        for area in (pygame.Rect(0, 0, width, height), pygame.Rect(150, 90, 333, 201)):
+            surface = pygame.Surface(area.size)
+            chunks.blit(surface, area, (0, 0))
+            self.assertEqual(pygame.image.tostring(surface, "RGB"),
+                             pygame.image.tostring(expected.subsurface(area), "RGB"))
+
+    def test_renders_only_what_is_seen(self):
+        chunks = ChunkCache(2000 * SNAKE_SIZE, 2000 * SNAKE_SIZE, chunk_cells=16)
+        self.assertEqual(chunks.rendered, 0)
+        surface = pygame.Surface((GAME_WIDTH, SCREEN_HEIGHT))
+        view = pygame.Rect(1008 * SNAKE_SIZE, 1008 * SNAKE_SIZE, GAME_WIDTH, SCREEN_HEIGHT)  # On chunk corners
+        chunks.blit(surface, view, (0, 0))
+        self.assertEqual(chunks.rendered, 2 * 3)
+
+        # Drawing the same view again reuses the chunks
+        chunks.blit(surface, view, (0, 0))
+        self.assertEqual(chunks.rendered, 2 * 3)
+
+    def test_evicts_by_distance(self):
+        chunks = ChunkCache(2000 * SNAKE_SIZE, 2000 * SNAKE_SIZE, chunk_cells=16, keep_distance=1)
+        surface = pygame.Surface((GAME_WIDTH, SCREEN_HEIGHT))
+        view = pygame.Rect(0, 0, GAME_WIDTH, SCREEN_HEIGHT)
+        for _ in range(200):
+            view.x += SNAKE_SIZE * 5
+            chunks.blit(surface, view, (0, 0))
+            chunks.evict(view)
+            self.assertLessEqual(len(chunks.chunks), 5 * 4)
+        self.assertNotIn((0, 0), chunks.chunks)
+
+
+class TestLargeBoard(unittest.TestCase):
+    """Test SnakeGame on a board much larger than the screen"""
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.quit()
+
+    def setUp(self):
+        self.game = SnakeGame(2000 * SNAKE_SIZE, 2000 * SNAKE_SIZE, seed=1, view_size=(GAME_WIDTH, SCREEN_HEIGHT))
+        self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def test_view_follows_head(self):
+        self.assertIn(self.game.snake.body[0], self.game.viewport)
+        for _ in range(300):
+            self.game.update()
+            self.game.draw_dirty(self.screen, CAMERA_WIDTH)
+            self.assertIn(self.game.snake.body[0], self.game.viewport)
+        self.assertLessEqual(len(self.game.chunks.chunks), 5 * 4)
+
+    def test_dirty_drawing_matches_full_draw(self):
+        full = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.game.draw_dirty(self.screen, CAMERA_WIDTH)
+        for tick in range(120):
+            self.game.update([UP, RIGHT, DOWN, RIGHT][tick // 30])
+            self.game.draw_dirty(self.screen, CAMERA_WIDTH)
+            self.game.draw(full, CAMERA_WIDTH)
+            self.assertEqual(pygame.image.tostring(self.screen, "RGB"), pygame.image.tostring(full, "RGB"))
+
+    def test_off_screen_food_marker(self):
+        self.game.food.position = (0, 0)
+        marker = self.game._food_marker()
+        self.assertEqual(marker.topleft, (SNAKE_SIZE // 4, SNAKE_SIZE // 4))
+
+        self.game.food.position = self.game.snake.body[0]
+        self.assertIsNone(self.game._food_marker())
+
+    def test_small_board_is_unchanged(self):
+        game = SnakeGame(GAME_WIDTH, SCREEN_HEIGHT, seed=1)
+        self.assertFalse(game.viewport.scrolls)
+        game.draw(self.screen, CAMERA_WIDTH)
+        self.assertIsNone(game._food_marker())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)